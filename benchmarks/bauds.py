@@ -0,0 +1,79 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+"""Transactions per second at every baud rate the XL430 supports, against the
+simulated bus. examples/dynamixel_baud_benchmark.py measures the same on
+hardware. Wire time and return delays are modelled, so the table shows where
+the bus stops being the limit and the host's per-transaction overhead takes over.
+
+  python benchmarks/bauds.py                  RETURN_DELAY_TIME 0
+  python benchmarks/bauds.py --delay 250      the factory default of 500 us
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dynamixel.devices import XL430_W250_T  # noqa: E402
+from dynamixel.protocol import Protocol2  # noqa: E402
+from dynamixel.sim import SimBus, SimServo  # noqa: E402
+
+SERVOS = 12
+
+
+def bus(baudRate: int, delay: int) -> Protocol2:
+    sim = SimBus(2, baudRate=baudRate)
+    protocol = Protocol2(transport=sim)
+    for ID in range(1, SERVOS + 1):
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": delay}))
+        protocol.timing.setReturnDelayTime(ID, delay)
+    return protocol
+
+
+def rate(call, seconds: float) -> float:
+    """Calls per second over about ``seconds``"""
+    count = 0
+    start = time.monotonic_ns()
+    end = start + int(seconds * 1e9)
+    now = start
+    while now < end:
+        call()
+        count += 1
+        now = time.monotonic_ns()
+    return count * 1e9 / (now - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--seconds", type=float, default=0.5, help="time per figure")
+    parser.add_argument("--delay", type=int, default=0, help="RETURN_DELAY_TIME of the servos")
+    args = parser.parse_args()
+
+    ids = list(range(1, SERVOS + 1))
+    position = XL430_W250_T.CONTROL_TABLE.PRESENT_POSITION
+    goal = XL430_W250_T.CONTROL_TABLE.GOAL_POSITION
+    print(f"baud, ping/s, read/s, syncRead {SERVOS}/s, fastSyncRead {SERVOS}/s, syncWrite/s")
+    for baudRate in sorted(XL430_W250_T.bauds.values()):
+        p = bus(baudRate, args.delay)
+        calls = (
+            lambda: p.ping(1),
+            lambda: p.read(1, position.address, position.length),
+            lambda: p.syncRead(position.address, position.length, ids),
+            lambda: p.fastSyncRead(position.address, position.length, ids),
+            lambda: p.syncWrite(goal.address, goal.length, [(ID, 2048) for ID in ids]),
+        )
+        for call in calls:
+            assert call().ok, f"no reply at {baudRate}"
+        figures = ", ".join(f"{rate(call, args.seconds):.0f}" for call in calls)
+        print(f"{baudRate}, {figures}")
+
+
+if __name__ == "__main__":
+    main()
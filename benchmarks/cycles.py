@@ -0,0 +1,118 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+# End to end bus cycles against the simulated bus. Wire time and return delays
+# are modelled so these follow the baud rate like real hardware would.
+
+from dynamixel.bus import Bus
+from dynamixel.control import ControlLoop
+from dynamixel.devices import XL430_W250_T
+from dynamixel.group import ServoGroup
+from dynamixel.protocol import Protocol2
+from dynamixel.servo import units
+from dynamixel.sim import SimBus, SimServo
+from dynamixel.trajectory import Trajectory, TrajectoryPlayer
+
+SERVOS = 12
+BAUD = 4000000
+
+
+def bus(fast: bool = True) -> Bus:
+    sim = SimBus(2, baudRate=BAUD)
+    protocol = Protocol2(transport=sim)
+    bus = Bus(protocol, fast=fast)
+    for ID in range(1, SERVOS + 1):
+        # RETURN_DELAY_TIME 0, the usual setting when latency matters
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0, "TORQUE_ENABLE": 1}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+        bus.attach(XL430_W250_T(str(ID), ID, protocol=protocol))
+    return bus
+
+
+def pollPerServo():
+    servos = list(bus().servos.values())
+
+    def run():
+        for servo in servos:
+            servo.getPresentPosition()
+            servo.getMoving()
+            servo.getTorqueEnable()
+
+    return run
+
+
+def poll():
+    return bus().poll
+
+
+def pollSync():
+    return bus(fast=False).poll
+
+
+def writeGoalsPerServo():
+    servos = list(bus().servos.values())
+
+    def run():
+        for servo in servos:
+            servo.setGoalPosition(90)
+
+    return run
+
+
+def writeGoalsBatched():
+    b = bus()
+    servos = list(b.servos.values())
+
+    def run():
+        with b.batch():
+            for servo in servos:
+                servo.setGoalPosition(90)
+
+    return run
+
+
+def groupRead():
+    group = ServoGroup(bus().servos.values(), ("PRESENT_VELOCITY", "PRESENT_POSITION"))
+    return group.read
+
+
+def groupWrite():
+    group = ServoGroup(bus().servos.values(), ("PRESENT_POSITION",))
+    goals = [2048.0] * SERVOS
+    return lambda: group.write("GOAL_POSITION", goals)
+
+
+def controlStep(pipeline: bool = True):
+    group = ServoGroup(bus().servos.values(), ("PRESENT_POSITION",))
+    loop = ControlLoop(
+        group, 1000, lambda g: g["PRESENT_POSITION"], unit=units.RAW, pipeline=pipeline
+    )
+    return loop.step
+
+
+def controlStepUnpipelined():
+    return controlStep(pipeline=False)
+
+
+def trajectoryStep():
+    servos = bus().servos.values()
+    trajectory = Trajectory([[(0, 0), (1, 90)]] * len(servos))
+    player = TrajectoryPlayer(servos, trajectory, 1000, unit=units.DEGREE, prefetch=1)
+    player.buildAhead(500)
+    return lambda: player.step(500)
+
+
+BENCHMARKS = {
+    "pollPerServo": pollPerServo,
+    "poll": poll,
+    "pollSync": pollSync,
+    "writeGoalsPerServo": writeGoalsPerServo,
+    "writeGoalsBatched": writeGoalsBatched,
+    "groupRead": groupRead,
+    "groupWrite": groupWrite,
+    "controlStep": controlStep,
+    "controlStepUnpipelined": controlStepUnpipelined,
+    "trajectoryStep": trajectoryStep,
+}
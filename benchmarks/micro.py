@@ -0,0 +1,114 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+# Microbenchmarks of the protocol hot paths. Each function sets up its state and
+# returns the callable that is timed.
+
+from dynamixel.crc import crc16
+from dynamixel.devices import XL430_W250_T
+from dynamixel.parser import StatusParser2
+from dynamixel.protocol import Protocol2
+from dynamixel.servo import units
+from dynamixel.transport import LoopbackTransport
+
+SERVOS = 12
+
+
+def status2(ID: int, params: list) -> bytes:
+    packet = [0xFF, 0xFF, 0xFD, 0x00, ID, len(params) + 4, 0x00, 0x55, 0x00] + params
+    return bytes(packet + list(crc16(packet).to_bytes(2, "little")))
+
+
+def protocol(responder=None) -> Protocol2:
+    # no wire time to wait for so only the Python side is measured
+    p = Protocol2(transport=LoopbackTransport(responder, baudRate=1_000_000_000))
+    p.timing.returnDelay = 0
+    p.timing.margin = 0
+    return p
+
+
+def checksum():
+    packet = [0xFF, 0xFF, 0xFD, 0x00, 0xFE, 0x3D, 0x00, 0x83] + list(range(56))
+    return lambda: Protocol2.checksum(packet)
+
+
+def crc():
+    packet = bytes(range(64))
+    return lambda: crc16(packet)
+
+
+def addStuffing():
+    p = protocol()
+    packet = [0xFF, 0xFF, 0xFD, 0x00, 0x01, 0x00, 0x00, 0x03] + [0xFF, 0xFF, 0xFD, 0x00] * 14
+    return lambda: p.addStuffing(list(packet))
+
+
+def syncWrite():
+    p = protocol()
+    values = [(ID, 2048 + ID) for ID in range(1, SERVOS + 1)]
+    return lambda: p.syncWrite(116, 4, values)
+
+
+def bulkWrite():
+    p = protocol()
+    values = [(ID, 116 if ID % 2 else 112, 4, 2048 + ID) for ID in range(1, SERVOS + 1)]
+    return lambda: p.bulkWrite(values)
+
+
+def parseStatus():
+    data = b"".join(status2(ID, [0x00, 0x08, 0x00, 0x00]) for ID in range(1, SERVOS + 1))
+    parser = StatusParser2()
+
+    def run():
+        parser.reset()
+        parser.feed(data)
+
+    return run
+
+
+def syncRead():
+    reply = b"".join(status2(ID, [0x00, 0x08, 0x00, 0x00]) for ID in range(1, SERVOS + 1))
+    p = protocol(lambda tx: reply)
+    ids = list(range(1, SERVOS + 1))
+    return lambda: p.syncRead(132, 4, ids)
+
+
+def validationErrors():
+    p = protocol()
+    packet = status2(1, [0x00, 0x08, 0x00, 0x00])
+    return lambda: p.validationErrors(packet)
+
+
+def getter():
+    p = protocol(lambda tx: status2(1, [0x00, 0x08, 0x00, 0x00]))
+    m = XL430_W250_T("bench", 1, protocol=p)
+    return m.getPresentPosition
+
+
+def setter():
+    p = protocol(lambda tx: status2(1, []))
+    m = XL430_W250_T("bench", 1, protocol=p)
+    return lambda: m.setGoalPosition(90)
+
+
+def decodeMany():
+    codec = XL430_W250_T.CODECS[XL430_W250_T.CONTROL_TABLE.PRESENT_POSITION]
+    payload = {ID: bytes([0x00, 0x08, 0x00, 0x00]) for ID in range(1, SERVOS + 1)}
+    return lambda: codec.decodeMany(payload, units.DEGREE)
+
+
+BENCHMARKS = {
+    "checksum": checksum,
+    "crc16": crc,
+    "addStuffing": addStuffing,
+    "syncWrite": syncWrite,
+    "bulkWrite": bulkWrite,
+    "parseStatus": parseStatus,
+    "syncRead": syncRead,
+    "validationErrors": validationErrors,
+    "getter": getter,
+    "setter": setter,
+    "decodeMany": decodeMany,
+}
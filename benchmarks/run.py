@@ -0,0 +1,109 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+"""Run the benchmarks and print the results as JSON.
+
+  python benchmarks/run.py                       print results
+  python benchmarks/run.py --save FILE           also write them to FILE
+  python benchmarks/run.py --compare FILE        fail on anything slower than FILE
+
+Baselines live in benchmarks/baselines, one file per machine. Compare against a
+baseline recorded on the same machine, the numbers aren't portable.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import cycles  # noqa: E402
+import micro  # noqa: E402
+
+
+def measure(run, seconds: float, repeats: int) -> dict:
+    """Best of ``repeats`` rounds of about ``seconds`` each, in microseconds per call"""
+    run()
+    count = 1
+    while True:
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            run()
+        elapsed = time.perf_counter_ns() - start
+        if elapsed > seconds * 1e9 / 10:
+            break
+        count *= 2
+    count = max(1, int(count * seconds * 1e9 / elapsed))
+    rounds = []
+    for _ in range(repeats):
+        start = time.perf_counter_ns()
+        for _ in range(count):
+            run()
+        rounds.append((time.perf_counter_ns() - start) / count / 1000)
+    return {"us": round(min(rounds), 3), "calls": count}
+
+
+def runAll(names: list, seconds: float, repeats: int) -> dict:
+    results = {}
+    for group, benchmarks in (("micro", micro.BENCHMARKS), ("cycles", cycles.BENCHMARKS)):
+        for name, setup in benchmarks.items():
+            key = f"{group}.{name}"
+            if names and not any(n in key for n in names):
+                continue
+            results[key] = measure(setup(), seconds, repeats)
+            print(f"{key}: {results[key]['us']} us", file=sys.stderr)
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Names of the benchmarks more than ``tolerance`` slower than the baseline"""
+    slower = []
+    for key, result in results.items():
+        base = baseline["results"].get(key)
+        if base is None:
+            continue
+        ratio = result["us"] / base["us"]
+        result["baseline"] = base["us"]
+        result["ratio"] = round(ratio, 3)
+        if ratio > 1 + tolerance:
+            slower.append(key)
+    return slower
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("names", nargs="*", help="only run benchmarks containing these")
+    parser.add_argument("--seconds", type=float, default=0.2, help="time per round")
+    parser.add_argument("--repeats", type=int, default=5, help="rounds, the best counts")
+    parser.add_argument("--save", help="write the results to this file")
+    parser.add_argument("--compare", help="baseline file to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown")
+    args = parser.parse_args()
+
+    report = {
+        "python": platform.python_implementation() + " " + platform.python_version(),
+        "machine": platform.machine(),
+        "results": runAll(args.names, args.seconds, args.repeats),
+    }
+    slower = []
+    if args.compare:
+        with open(args.compare) as f:
+            slower = compare(report["results"], json.load(f), args.tolerance)
+        report["regressions"] = slower
+    print(json.dumps(report, indent=2, sort_keys=True))
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write("\n")
+    sys.exit(1 if slower else 0)
+
+
+if __name__ == "__main__":
+    main()
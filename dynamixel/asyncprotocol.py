@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import time
+
+from .protocol import Error, Protocol, Response
+
+# shorter waits than this are spun, asyncio.sleep can't hit them reliably and
+# the direction pin has to drop before the servo starts answering
+_SLEEP_NS = 2_000_000
+
+
+async def sleepUntil(deadline: int):
+    """Yield to the event loop until shortly before ``deadline`` then spin the rest"""
+    remaining = deadline - time.monotonic_ns()
+    if remaining > _SLEEP_NS:
+        await asyncio.sleep((remaining - _SLEEP_NS // 2) / 1e9)
+    while time.monotonic_ns() < deadline:
+        pass
+
+
+class AsyncProtocol:
+    """Awaitable front end for a Protocol1 or Protocol2
+
+    Every instruction of the wrapped protocol is available with the same arguments
+    and results, they just have to be awaited::
+
+        proto = AsyncProtocol(Protocol2())
+        res = await proto.read(1, 132, 4)
+        await proto.syncWrite(116, 4, [(1, 2048), (2, 1024)])
+
+    While waiting for a reply the UART is polled and the event loop gets control
+    between polls so other tasks keep running. Transactions are serialised with an
+    asyncio.Lock shared by every AsyncProtocol of the bus and built in a buffer of
+    their own, see Protocol.sibling, and the bus is held with the protocol's lock
+    while they run. Blocking calls on another
+    thread wait their turn, a blocking call from the event loop's thread while a
+    transaction is awaiting its reply raises RuntimeError.
+    """
+
+    def __init__(self, protocol: Protocol):
+        self.protocol = protocol
+        self.channel = protocol.sibling()
+        bus = protocol.lock
+        if bus.asyncLock is None:
+            bus.asyncLock = asyncio.Lock()
+        self.lock = bus.asyncLock
+
+    def __getattr__(self, name):
+        method = self.protocol._generator(name)
+        if method is None:
+            return getattr(self.protocol, name)
+        channel = self.channel
+
+        async def call(*args, **kwargs):
+            return await self._run(method(channel, *args, **kwargs))
+
+        # only build the wrapper once per instruction
+        setattr(self, name, call)
+        return call
+
+    async def _run(self, gen):
+        # the transmit buffer is shared by the tasks so the lock covers building too
+        async with self.lock:
+            protocol = self.channel
+            protocol.stats = self.protocol.stats
+            bus = protocol.lock
+            # a thread lock, waited on without blocking the event loop
+            while not bus.acquire(False):
+                await asyncio.sleep(0)
+            try:
+                gen.send(None)
+                while True:
+                    gen.send(await self._transmit())
+            except StopIteration as e:
+                return e.value
+            finally:
+                bus.release()
+
+    async def _transmit(self) -> Response:
+        protocol = self.channel
+        start = protocol._write()
+        await sleepUntil(start + protocol.timing.wireTimeNs(protocol._wireLength))
+        protocol.tx_enable.value = False
+        measured = protocol.stats is not None
+        sent = time.monotonic_ns()
+        expected = protocol._expected
+        if not expected:
+            protocol.uart.reset_input_buffer()
+            res = Response(None, Error.OK)
+            if measured:
+                protocol.parser.reset()
+                protocol._record(start, sent, sent, 0, res)
+            return res
+        length = protocol._expectedLength
+        deadline = protocol._startReceive(length, protocol._returnDelayNs)
+        packets = protocol.parser.packets
+        parseNs = 0
+        while len(packets) < expected:
+            t = time.monotonic_ns()
+            if protocol._pollReceive(length):
+                if measured:
+                    parseNs += time.monotonic_ns() - t
+            elif t > deadline:
+                break
+            else:
+                await asyncio.sleep(0)
+        t = time.monotonic_ns()
+        res = protocol._receiveResponse(expected)
+        protocol.uart.reset_input_buffer()
+        if measured:
+            end = time.monotonic_ns()
+            protocol._record(start, sent, end, parseNs + end - t, res)
+        return res
@@ -0,0 +1,209 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from .protocol import Protocol2
+
+
+class WriteBatch:
+    """Defer control table writes and send them as few packets as possible
+
+    While the batch is open every setter of the given servos is checked and
+    converted as usual but only queued. On exit each servo's queued items are
+    merged into contiguous spans; servos writing the same span share a sync write
+    and the rest go out as bulk writes on Protocol 2.0 or single writes on 1.0::
+
+        with bus.batch():
+            for servo, goal in zip(servos, pose):
+                servo.setProfileVelocity(100)
+                servo.setGoalPosition(goal)
+
+    Packets are sent in the order their first item was set and each servo's items
+    go out in the order they were set, so disabling torque before changing an
+    EEPROM item still works. Setting an item again only replaces the queued value
+    when nothing else of the servo was set since, otherwise it is queued anew.
+    EEPROM items are never merged with the RAM items after them, as the servo
+    rejects the whole write while torque is on. Sync and bulk writes get no status
+    packet back, errors are only seen on single writes. ``results`` holds the
+    Response of every packet sent.
+
+    :param servos: Servos to capture the setters of
+    """
+
+    def __init__(self, servos):
+        self.servos = list(servos)
+        self.results = []
+        self._pending = {}
+        self._previous = []
+        self._seq = 0
+
+    def __enter__(self):
+        return self.open()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+        if exc_type is None:
+            self.flush()
+        else:
+            self.discard()
+        return False
+
+    def open(self):
+        """Start capturing setters"""
+        self._previous = [servo.batch for servo in self.servos]
+        for servo in self.servos:
+            servo.batch = self
+        return self
+
+    def discard(self):
+        """Forget everything queued"""
+        self._pending = {}
+        self._seq = 0
+
+    def close(self):
+        """Stop capturing setters, anything queued is kept until ``flush``"""
+        for servo, previous in zip(self.servos, self._previous):
+            servo.batch = previous
+        self._previous = []
+
+    def add(self, servo, address: int, length: int, data):
+        if not isinstance(data, int):
+            data = int.from_bytes(bytes(data), "little")
+        # the servo's items as generations of {address: [length, data, seq]}, an
+        # address set again after other items starts a new one
+        generations = self._pending.get(servo)
+        if generations is None:
+            generations = self._pending[servo] = [{}]
+        items = generations[-1]
+        item = items.get(address)
+        if item is not None and item[2] == max(other[2] for other in items.values()):
+            # nothing of the servo was set since
+            item[1] = data
+            return
+        if item is not None:
+            items = {}
+            generations.append(items)
+        items[address] = [length, data, self._seq]
+        self._seq += 1
+
+    @staticmethod
+    def _spans(servo, items: dict) -> list:
+        """Merge adjacent items into [address, length, value, seq, items]"""
+        cache = servo.cache
+        # the EEPROM area ends where TORQUE_ENABLE starts on every Dynamixel
+        ram = getattr(servo.CONTROL_TABLE, "TORQUE_ENABLE", None)
+        ramStart = None if ram is None else ram.address
+        spans = []
+        for address in sorted(items):
+            length, data, seq = items[address]
+            if cache is not None and cache.unchanged(address, length, data):
+                continue
+            if spans and spans[-1][0] + spans[-1][1] == address != ramStart:
+                span = spans[-1]
+                span[2] |= data << (8 * span[1])
+                span[1] += length
+                span[3] = min(span[3], seq)
+                span[4].append((address, length, data))
+            else:
+                spans.append([address, length, data, seq, [(address, length, data)]])
+        return spans
+
+    def flush(self):
+        """Send everything queued so far"""
+        groups = {}
+        for servo, generations in self._pending.items():
+            for generation, items in enumerate(generations):
+                for span in self._spans(servo, items):
+                    key = (servo.protocol, span[0], span[1], generation)
+                    if key in groups:
+                        groups[key].append((servo, span))
+                    else:
+                        groups[key] = [(servo, span)]
+        self._pending = {}
+        self._seq = 0
+
+        packets = []
+        singles = {}
+        for (protocol, _, _, _), writes in groups.items():
+            seq = min(span[3] for _, span in writes)
+            if len(writes) > 1:
+                packets.append((seq, protocol, writes))
+            elif protocol in singles:
+                singles[protocol].append(writes[0])
+            else:
+                singles[protocol] = [writes[0]]
+        for protocol, writes in singles.items():
+            writes.sort(key=lambda write: write[1][3])
+            if not isinstance(protocol, Protocol2):
+                packets.extend((span[3], protocol, [(servo, span)]) for servo, span in writes)
+                continue
+            # a bulk write can only carry one span per servo
+            pending = writes
+            while pending:
+                layer, rest, seen = [], [], set()
+                for servo, span in pending:
+                    (rest if servo.id in seen else layer).append((servo, span))
+                    seen.add(servo.id)
+                packets.append((layer[0][1][3], protocol, layer))
+                pending = rest
+
+        for _, protocol, writes in self._order(packets):
+            self._send(protocol, writes)
+
+    @staticmethod
+    def _overtaken(packets: list, i: int, servo, seq: int) -> int:
+        """Index of the last packet after ``i`` with an item of ``servo`` set before ``seq``"""
+        last = i
+        for j in range(i + 1, len(packets)):
+            for other, span in packets[j][2]:
+                if other is servo and span[3] < seq:
+                    last = j
+        return last
+
+    def _order(self, packets: list) -> list:
+        """Sort packets by their first item, keeping each servo's items in order
+
+        A packet goes out at its first item, so an item set later could overtake
+        an item of the same servo in an earlier packet, e.g. an EEPROM write
+        overtaking the sync write disabling torque. Such items are moved to a
+        packet of their own behind it. Different servos' items may still pass each
+        other, that keeps writes made servo by servo in one sync write per item.
+        """
+        packets.sort(key=lambda packet: packet[0])
+        i = 0
+        while i < len(packets):
+            start, protocol, writes = packets[i]
+            keep, late, after = [], [], i
+            for servo, span in writes:
+                last = self._overtaken(packets, i, servo, span[3])
+                if last > i:
+                    late.append((servo, span))
+                    after = max(after, last)
+                else:
+                    keep.append((servo, span))
+            if not keep:
+                packets.insert(after, packets.pop(i))
+                continue
+            if late:
+                packets[i] = (start, protocol, keep)
+                packets.insert(after + 1, (min(span[3] for _, span in late), protocol, late))
+            i += 1
+        return packets
+
+    def _send(self, protocol, writes: list):
+        servo, span = writes[0]
+        address, length = span[0], span[1]
+        if len(writes) == 1:
+            res = protocol.write(servo.id, address, length, span[2])
+        elif all(s[0] == address and s[1] == length for _, s in writes):
+            res = protocol.syncWrite(address, length, [(sv.id, s[2]) for sv, s in writes])
+        else:
+            res = protocol.bulkWrite([(sv.id, s[0], s[1], s[2]) for sv, s in writes])
+        self.results.append(res)
+        for servo, span in writes:
+            if res.ok:
+                for address, length, data in span[4]:
+                    servo._written(address, length, data)
+            elif servo.cache is not None:
+                servo.cache.invalidate()
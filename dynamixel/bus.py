@@ -0,0 +1,138 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from .asyncprotocol import AsyncProtocol
+from .batch import WriteBatch
+from .cache import provenance
+from .protocol import Error, Protocol, Protocol2, Response
+from .servo import Servo
+
+
+class Bus:
+    """Every servo on one UART, polled together
+
+    Each device class lists the control table spans it wants refreshed in
+    ``STATUS_BLOCKS``. A poll reads a span for every attached servo of that class
+    with one sync read and hands the decoded items to ``Servo.updateStatus``, so
+    ``presentPosition``, ``moving`` and ``torqueEnabled`` stay current without a
+    round trip per servo and register::
+
+        bus = Bus()
+        bus.attach(XL430_W250_T("shoulder", 1))
+        bus.attach(XL430_W250_T("elbow", 2))
+        asyncio.create_task(bus.run())
+
+    :param protocol: Protocol instance of this bus, attached servos are moved onto it.
+        None keeps whatever protocol each servo already has
+    :param fast: Use Fast Sync Read on Protocol 2.0 buses. Every listed servo has
+        to answer for a fast read to decode, turn it off if servos come and go
+    """
+
+    def __init__(self, protocol: Protocol = None, fast: bool = True):
+        self.protocol = protocol
+        self.fast = fast
+        self.servos = {}
+        self.polls = 0
+        self._blocks = {}
+        self._async = {}
+
+    def attach(self, servo: Servo):
+        if self.protocol is not None:
+            servo.protocol = self.protocol
+        self.servos[servo.id] = servo
+
+    def detach(self, servo: Servo):
+        self.servos.pop(servo.id, None)
+
+    def batch(self) -> WriteBatch:
+        """Queue the setters of every attached servo and send them on exit, see WriteBatch"""
+        return WriteBatch(self.servos.values())
+
+    def _spans(self, cls) -> list:
+        """(address, length, items, every) for each STATUS_BLOCKS entry of a class"""
+        spans = self._blocks.get(cls)
+        if spans is None:
+            spans = []
+            table = cls.CONTROL_TABLE
+            for first, last, every in cls.STATUS_BLOCKS:
+                address = getattr(table, first).address
+                lastItem = getattr(table, last)
+                end = lastItem.address + lastItem.length
+                items = []
+                for name, ct in table.items():
+                    if ct.address >= address and ct.address + ct.length <= end:
+                        items.append((name, ct))
+                spans.append((address, end - address, items, every))
+            self._blocks[cls] = spans
+        return spans
+
+    def _reads(self) -> list:
+        """Sync reads due this poll as (protocol, method, address, length, servos, items)"""
+        groups = {}
+        for servo in self.servos.values():
+            key = (servo.protocol, type(servo))
+            if key in groups:
+                groups[key].append(servo)
+            else:
+                groups[key] = [servo]
+        reads = []
+        for (protocol, cls), servos in groups.items():
+            fast = self.fast and isinstance(protocol, Protocol2)
+            method = "fastSyncRead" if fast else "syncRead"
+            for address, length, items, every in self._spans(cls):
+                if self.polls % every == 0:
+                    reads.append((protocol, method, address, length, servos, items))
+        self.polls += 1
+        return reads
+
+    @staticmethod
+    def _fanOut(res: Response, address: int, servos: list, items: list):
+        data = res.data if isinstance(res.data, dict) else {}
+        errors = res.err if isinstance(res.err, dict) else {}
+        for servo in servos:
+            block = data.get(servo.id)
+            err = errors.get(servo.id, Error.OK)
+            # the alert comes with the data, only HARDWARE_ERROR_STATUS is set
+            alert = err == [Error.ERR_HARDWARE_ALERT]
+            if err != Error.OK and not alert:
+                if servo.cache is not None:
+                    servo.cache.invalidate()
+                continue
+            if block is None:
+                continue
+            values = {}
+            cache = servo.cache
+            for name, ct in items:
+                offset = ct.address - address
+                raw = int.from_bytes(block[offset : offset + ct.length], "little")
+                values[name] = servo.decodeControlTableItem(ct, raw)
+                if cache is not None:
+                    cache.store(ct.address, ct.length, raw, provenance.POLL)
+            servo.hardwareAlert = alert
+            servo.updateStatus(values)
+
+    def poll(self):
+        """Refresh the status of every attached servo"""
+        for protocol, method, address, length, servos, items in self._reads():
+            ids = [servo.id for servo in servos]
+            res = getattr(protocol, method)(address, length, ids, asBytes=True)
+            self._fanOut(res, address, servos, items)
+
+    async def pollAsync(self):
+        """``poll`` that gives the event loop control while waiting on the UART"""
+        for protocol, method, address, length, servos, items in self._reads():
+            proxy = self._async.get(protocol)
+            if proxy is None:
+                proxy = self._async[protocol] = AsyncProtocol(protocol)
+            ids = [servo.id for servo in servos]
+            res = await getattr(proxy, method)(address, length, ids, asBytes=True)
+            self._fanOut(res, address, servos, items)
+
+    async def run(self, interval: float = 0.1):
+        while True:
+            await self.pollAsync()
+            await asyncio.sleep(interval)
@@ -0,0 +1,74 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+
+class provenance:
+    READ = 0
+    WRITE = 1
+    POLL = 2
+
+
+class ShadowCache:
+    """Last known raw value of each control table item of one servo
+
+    Entries are keyed by address and hold ``[length, raw, provenance, time_ns]``.
+    Writes of a value the servo already holds can be skipped and reads of static
+    items (EEPROM, below ``staticEnd``) can be served from the cache for up to
+    ``maxAge`` seconds. Volatile RAM items are tracked but never served.
+
+    :param staticEnd: First address that is not static
+    :param maxAge: Seconds a static value may be served for, None for no limit
+    """
+
+    def __init__(self, staticEnd: int, maxAge: float = None):
+        self.staticEnd = staticEnd
+        self.maxAge = maxAge
+        self.entries = {}
+
+    def store(self, address: int, length: int, raw: int, source: int = provenance.READ):
+        self.discard(address, length)
+        self.entries[address] = [length, raw, source, time.monotonic_ns()]
+
+    def entry(self, address: int, length: int) -> list:
+        """The entry for exactly this item or None"""
+        entry = self.entries.get(address)
+        if entry is None or entry[0] != length:
+            return None
+        return entry
+
+    def age(self, address: int) -> float:
+        """Seconds since the entry at ``address`` was stored, None if there isn't one"""
+        entry = self.entries.get(address)
+        if entry is None:
+            return None
+        return (time.monotonic_ns() - entry[3]) / 1e9
+
+    def lookup(self, address: int, length: int, maxAge: float = None) -> int:
+        """Raw value a read of a static item can be answered with, else None"""
+        if address + length > self.staticEnd:
+            return None
+        entry = self.entry(address, length)
+        if entry is None:
+            return None
+        maxAge = self.maxAge if maxAge is None else maxAge
+        if maxAge is not None and time.monotonic_ns() - entry[3] > maxAge * 1e9:
+            return None
+        return entry[1]
+
+    def unchanged(self, address: int, length: int, raw: int) -> bool:
+        """True if writing ``raw`` would leave the servo as it is"""
+        entry = self.entry(address, length)
+        return entry is not None and entry[1] == raw
+
+    def discard(self, address: int, length: int):
+        """Drop every entry overlapping ``length`` bytes at ``address``"""
+        end = address + length
+        for start in [a for a, e in self.entries.items() if a < end and address < a + e[0]]:
+            del self.entries[start]
+
+    def invalidate(self):
+        self.entries.clear()
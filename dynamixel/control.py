@@ -0,0 +1,148 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+from dynamixel.group import ServoGroup
+from dynamixel.stats import Histogram
+from dynamixel.timing import waitUntil
+
+
+class LoopStats:
+    """Timing of every cycle of a ControlLoop, in nanoseconds
+
+    ``late`` is how long after its tick a cycle started, the loop's jitter,
+    ``cycle`` how long a cycle took and ``bus`` the part of it spent in bus
+    transactions. ``misses`` counts the ticks lost to cycles that overran.
+
+    :param periodNs: Period of the loop
+    """
+
+    def __init__(self, periodNs: int):
+        self.periodNs = periodNs
+        self.reset()
+
+    def reset(self):
+        self.cycles = 0
+        self.misses = 0
+        self.late = Histogram()
+        self.cycle = Histogram()
+        self.bus = Histogram()
+
+    def record(self, lateNs: int, cycleNs: int, busNs: int):
+        self.cycles += 1
+        self.late.add(lateNs)
+        self.cycle.add(cycleNs)
+        self.bus.add(busNs)
+
+    @property
+    def utilisation(self) -> float:
+        """Share of the loop's time the bus was busy, 0 to 1"""
+        if not self.cycles:
+            return 0
+        return self.bus.total / (self.cycles * self.periodNs)
+
+    def export(self) -> dict:
+        return {
+            "cycles": self.cycles,
+            "misses": self.misses,
+            "utilisation": self.utilisation,
+            "lateNs": self.late.export(),
+            "cycleNs": self.cycle.export(),
+            "busNs": self.bus.export(),
+        }
+
+
+class ControlLoop:
+    """Read, compute and write a group of servos at a fixed rate
+
+    Every cycle refreshes the group's columns with one sync read (a fast sync read
+    on Protocol 2.0, a bulk read or single reads on Protocol 1.0), calls
+    ``compute(group)`` and writes the goals it returns with one sync write::
+
+        def compute(group):
+            return [p + 10 for p in group["PRESENT_POSITION"]]
+
+        loop = ControlLoop(ServoGroup(legs, ("PRESENT_POSITION",)), 100, compute)
+        loop.run()
+
+    With ``pipeline`` the goal write isn't sent on its own but right ahead of the
+    next cycle's read, both in one turn of the bus. That saves a bus turnaround
+    and keeps the bus free while computing, at the cost of the goals going out at
+    the next tick instead of straight away.
+
+    Cycles start on their tick no matter how long the previous one took, a cycle
+    that runs past the next tick counts the ticks it overran as misses and the
+    loop carries on at the following one instead of bunching cycles up.
+
+    :param group: Servos to control
+    :param rate: Cycles per second
+    :param compute: Called with the group after each read, returns a column of goals
+        for ``goal`` or None to leave them as they are
+    :param goal: Item the goals are written to
+    :param unit: Unit of the goals, the item's default unit when None
+    :param pipeline: Send the goals together with the next read
+    """
+
+    def __init__(
+        self,
+        group: ServoGroup,
+        rate: float,
+        compute,
+        *,
+        goal: str = "GOAL_POSITION",
+        unit: int = None,
+        pipeline: bool = True,
+    ):
+        self.group = group
+        self.compute = compute
+        self.goal = goal
+        self.unit = unit
+        self.pipeline = pipeline
+        self.periodNs = int(1_000_000_000 / rate)
+        self.stats = LoopStats(self.periodNs)
+        self.running = False
+
+    def step(self, lateNs: int = 0):
+        """Run one cycle now
+
+        :param lateNs: How late the cycle is, recorded as jitter
+        """
+        start = time.monotonic_ns()
+        res = self.group.read()
+        read = time.monotonic_ns()
+        goals = self.compute(self.group)
+        computed = time.monotonic_ns()
+        if goals is not None:
+            self.group.write(self.goal, goals, self.unit, defer=self.pipeline)
+        end = time.monotonic_ns()
+        self.stats.record(lateNs, end - start, read - start + end - computed)
+        return res
+
+    def run(self, cycles: int = None):
+        """Run cycles at the loop's rate until ``stop`` or for ``cycles`` cycles"""
+        period = self.periodNs
+        tick = time.monotonic_ns()
+        self.running = True
+        done = 0
+        try:
+            while self.running and (cycles is None or done < cycles):
+                waitUntil(tick)
+                self.step(time.monotonic_ns() - tick)
+                done += 1
+                tick += period
+                now = time.monotonic_ns()
+                if now > tick:
+                    missed = (now - tick) // period + 1
+                    self.stats.misses += missed
+                    tick += missed * period
+        finally:
+            self.running = False
+            # goals still waiting for the next read
+            self.group.protocol.sendDeferred()
+
+    def stop(self):
+        """Let ``run`` return after the current cycle, e.g. from ``compute``"""
+        self.running = False
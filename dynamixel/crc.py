@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+POLYNOMIAL = 0x8005  # CRC-16-ANSI (x^16 + x^15 + x^2 + 1)
+
+
+def _makeTable(polynomial: int) -> tuple:
+    table = []
+    for i in range(256):
+        crc = i << 8  # Start with the value of the byte shifted to the left by 8 bits
+        for _ in range(8):  # For each bit in the byte
+            if crc & 0x8000:  # If the highest bit is set
+                crc = (crc << 1) ^ polynomial  # Shift left and XOR with the polynomial
+            else:
+                crc <<= 1  # Just shift left
+            crc &= 0xFFFF  # Ensure we keep it within 16 bits
+        table.append(crc)
+    return tuple(table)
+
+
+# Built once at import, every call after this is a table lookup per byte
+CRC_TABLE = _makeTable(POLYNOMIAL)
+
+
+def crc16(data, start: int = 0, end: int = None, crc: int = 0) -> int:
+    """Compute the Protocol 2.0 CRC of ``data[start:end]``
+
+    Buffers (bytes, bytearray, memoryview) are walked through a memoryview so
+    slicing never copies. Pass the previous result back in as ``crc`` to keep
+    checksumming a packet as more of it arrives.
+
+    Official SDK vectors::
+
+        crc16(b"\\xff\\xff\\xfd\\x00\\x01\\x03\\x00\\x01") == 0x4E19
+        crc16(b"\\xff\\xff\\xfd\\x00\\x01\\x07\\x00\\x02\\x84\\x00\\x04\\x00") == 0x151D
+
+    :param data: Bytes to checksum, a list of ints is also accepted
+    :param start: Index of the first byte to include
+    :param end: Index one past the last byte to include, defaults to the end
+    :param crc: Running CRC to continue from, 0 for a new packet
+    :returns: 16 bit CRC, low byte goes on the wire first
+    :rtype: int
+    """
+    table = CRC_TABLE
+    if isinstance(data, list):
+        if end is None:
+            end = len(data)
+        for i in range(start, end):
+            crc = ((crc & 0xFF) << 8) ^ table[(crc >> 8) ^ data[i]]
+        return crc
+    for byte in memoryview(data)[start:end]:
+        crc = ((crc & 0xFF) << 8) ^ table[(crc >> 8) ^ byte]
+    return crc
@@ -3,59 +3,89 @@
 #
 # SPDX-License-Identifier: MIT
 
-# gnarly way to handle auto imports if you don't include all the devices in the lib
-# when adding a new devicves add them to imports with (file_name, class_name) format
+# Devices are imported lazily so only the ones in use cost boot time and RAM, and
+# the lib still works if you don't include all the devices in it. When adding a
+# new device add it to imports with (file_name, class_name, MODEL_NUMBER) format.
 from dynamixel.servo import ControlTableItem
 
-imports = [("xl430w250t", "XL430_W250_T"), ("ax12a", "AX12A")]
+imports = [("xl430w250t", "XL430_W250_T", 1060), ("ax12a", "AX12A", 12)]
 
+# MODEL_NUMBER register value -> class name
+models = {model: classname for _, classname, model in imports}
+_modules = {classname: filename for filename, classname, _ in imports}
 
-def make_getter(ct):
+
+def make_getter(ct, codec):
     addr, length, _, _, defaultUnit = ct
+    decoders = codec.decoders
 
-    def getter(self, _addr=addr, _length=length, unit=None):
-        data = None
-        res = self.readControlTableItem(_addr, _length)
-        unit = unit or self.unit or defaultUnit
+    def getter(self, unit=None):
+        if unit is None:
+            unit = defaultUnit if self.unit is None else self.unit
+        res = self.readControlTableItem(addr, length)
         if res.ok:
-            data = self.convertFromNegative(res.data, _length)
-            data = self.convertRaw(data, unit)
-            res.data = data
+            res.data = decoders[unit](res.data)
         return res
 
     return getter
 
 
-def make_setter(ct):
-    addr, length, _, limits, defaultUnit = ct
+def make_setter(ct, codec):
+    addr, length, _, _, defaultUnit = ct
+    encoders = codec.encoders
 
-    def setter(self, data, _addr=addr, _length=length, _limits=limits, unit=None):
-        unit = unit or self.unit or defaultUnit
-        data = self.convertUnits(data, unit)
-        if data < 0:
-            data = self.convertToNegative(data)
-        if isinstance(_limits, list):
-            assert data in _limits, f"{data} should be one of {_limits}"
-        if isinstance(limits, tuple):
-            assert _limits[0] <= data <= _limits[1], (
-                f"{data} should be within {_limits[0]} and {_limits[1]}"
-            )
-        return self.writeControlTableItem(_addr, _length, data)
+    def setter(self, data, unit=None):
+        if unit is None:
+            unit = defaultUnit if self.unit is None else self.unit
+        data = encoders[unit](data)
+        return self.writeControlTableItem(addr, length, data)
 
     return setter
 
 
-for filename, classname in imports:
-    mod = __import__(filename, None, None, (), 1)
+def load(classname: str):
+    """Import a device class and generate its accessors, only done on first use"""
+    cls = globals().get(classname)
+    if cls is not None:
+        return cls
+    filename = _modules[classname]
+    mod = __import__(f"dynamixel.devices.{filename}", None, None, (classname,))
     cls = getattr(mod, classname)
-    globals()[classname] = cls
+    codecs = cls.compileCodecs()
     for key, ct in cls.CONTROL_TABLE.items():
         if not isinstance(ct, ControlTableItem):
             continue
         baseName = "".join([word[0] + word[1:].lower() for word in key.split("_")])
         if ct.writable:
             methodName = f"set{baseName}"
-            setattr(cls, methodName, make_setter(ct))
+            setattr(cls, methodName, make_setter(ct, codecs[ct]))
 
         methodName = f"get{baseName}"
-        setattr(cls, methodName, make_getter(ct))
+        setattr(cls, methodName, make_getter(ct, codecs[ct]))
+    globals()[classname] = cls
+    return cls
+
+
+def forModel(model: int):
+    """Device class of a MODEL_NUMBER value, None when it isn't known
+
+    MODEL_NUMBER is 2 bytes at address 0 on every Dynamixel:
+
+    cls = forModel(protocol.read(1, 0, 2).data)
+    m = cls("shoulder", 1, protocol=protocol)
+    """
+    classname = models.get(model)
+    if classname is None:
+        return None
+    try:
+        return load(classname)
+    except ImportError:
+        # the device was left out of the lib
+        return None
+
+
+def __getattr__(name: str):
+    # from dynamixel.devices import XL430_W250_T
+    if name in _modules:
+        return load(name)
+    raise AttributeError(name)
@@ -5,8 +5,7 @@
 
 import asyncio
 
-from dynamixel import utils
-from dynamixel.protocol import Protocol1, Response
+from dynamixel.protocol import Protocol1
 from dynamixel.servo import ControlTableItem, Servo, controlTable, units
 
 
@@ -53,38 +52,46 @@ class ControlTable(controlTable):
 
 class AX12A(Servo):
     CONTROL_TABLE = ControlTable
+    MODEL = 12
+    resolution = 1024
+    _rpm = 0.111
+    DEFAULT_BAUD = 1000000
+    PROTOCOLS = ("1.0",)
+    bauds = {
+        1: 1000000,
+        3: 500000,
+        4: 400000,
+        7: 250000,
+        9: 200000,
+        16: 115200,
+        34: 57600,
+        103: 19200,
+        207: 9600,
+    }
     OPERATING_MODE = operatingMode
+    STATUS_BLOCKS = (("TORQUE_ENABLE", "MOVING", 1),)
 
-    def __init__(self, *args, unit=None, **kwargs):
+    def __init__(self, *args, unit=None, protocol: Protocol1 = None, **kwargs):
+        """
+        :param protocol: Protocol of the bus the servo is on, by default every
+            servo shares one on the board's UART that is created with ``kwargs``
+        """
         super().__init__(*args, **kwargs)
-        self.protocol = Protocol1(**kwargs)
+        self.protocol = protocol or Protocol1.shared(**kwargs)
         self.unit = unit
-        self.resolution = 1024
         self.torqueEnabled = False
         self.moving = False
         self.presentPosition = 0
-        self._rpm = 0.111
-        self.bauds = {
-            1: 1000000,
-            3: 500000,
-            4: 400000,
-            7: 250000,
-            9: 200000,
-            16: 115200,
-            34: 57600,
-            103: 19200,
-            207: 9600,
-        }
 
     async def run(self):
+        """Poll this servo on its own, use Bus to poll every servo on a bus at once"""
         while True:
-            res = self.getPresentPosition()
             if (res := self.getPresentPosition()).ok:
                 self.presentPosition = res.data
 
-            if (res := self.readControlTableItem(self.CONTROL_TABLE.MOVING)).ok:
+            if (res := self.getMoving()).ok:
                 self.moving = bool(res.data)
 
-            if (res := self.readControlTableItem(self.CONTROL_TABLE.TORQUE_ENABLE)).ok:
+            if (res := self.getTorqueEnable()).ok:
                 self.torqueEnabled = bool(res.data)
             await asyncio.sleep(0.1)
@@ -5,8 +5,7 @@
 
 import asyncio
 
-from dynamixel import utils
-from dynamixel.protocol import Protocol2, Response
+from dynamixel.protocol import Protocol2
 from dynamixel.servo import ControlTableItem, Servo, controlTable, units
 
 
@@ -74,38 +73,49 @@ class ControlTable(controlTable):
 
 class XL430_W250_T(Servo):
     CONTROL_TABLE = ControlTable
+    MODEL = 1060
+    SIGNED = True
+    resolution = 4096
+    _rpm = 0.229
+    DEFAULT_BAUD = 57600
+    bauds = {
+        7: 4500000,
+        6: 4000000,
+        5: 3000000,
+        4: 2000000,
+        3: 1000000,
+        2: 115200,
+        1: 57600,
+        0: 9600,
+    }
     OPERATING_MODE = operatingMode
-
-    def __init__(self, *args, unit=None, **kwargs):
+    STATUS_BLOCKS = (
+        ("MOVING", "PRESENT_TEMPERATURE", 1),
+        ("TORQUE_ENABLE", "HARDWARE_ERROR_STATUS", 10),
+    )
+
+    def __init__(self, *args, unit=None, protocol: Protocol2 = None, **kwargs):
+        """
+        :param protocol: Protocol of the bus the servo is on, by default every
+            servo shares one on the board's UART that is created with ``kwargs``
+        """
         super().__init__(*args, **kwargs)
         self.unit = unit
-        self.protocol = Protocol2(**kwargs)
-        self.resolution = 4096
+        self.protocol = protocol or Protocol2.shared(**kwargs)
         self.torqueEnabled = False
         self.moving = False
         self.presentPosition = 0
-        self._rpm = 0.229
-        self.bauds = {
-            7: 4500000,
-            6: 4000000,
-            5: 3000000,
-            4: 2000000,
-            3: 1000000,
-            2: 115200,
-            1: 57600,
-            0: 9600,
-        }
 
     async def run(self):
+        """Poll this servo on its own, use Bus to poll every servo on a bus at once"""
         while True:
-            res = self.getPresentPosition()
             if (res := self.getPresentPosition()).ok:
                 self.presentPosition = res.data
 
-            if (res := self.readControlTableItem(self.CONTROL_TABLE.MOVING)).ok:
+            if (res := self.getMoving()).ok:
                 self.moving = bool(res.data)
 
-            if (res := self.readControlTableItem(self.CONTROL_TABLE.TORQUE_ENABLE)).ok:
+            if (res := self.getTorqueEnable()).ok:
                 self.torqueEnabled = bool(res.data)
             await asyncio.sleep(0.1)
 
@@ -113,14 +123,3 @@ class XL430_W250_T(Servo):
         if not isinstance(self.protocol, Protocol2):
             return
         self.protocol.clear(self.id, position=position, error=error)
-
-    @classmethod
-    def convertToNegative(cls, value, length):
-        if value < 0:
-            maxInt = int.from_bytes(bytes([0xFF] * length), "little")
-            maxInt += value
-            return list(maxInt.to_bytes(length, "little"))
-
-    @classmethod
-    def convertFromNegative(cls, value, length):
-        return utils.twosComplement(value, length)
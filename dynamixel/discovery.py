@@ -0,0 +1,304 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import json
+from collections import namedtuple
+
+from dynamixel import devices
+from dynamixel.cache import provenance
+from dynamixel.protocol import Protocol2
+
+# One servo found on the bus, ``cls`` is None for models without a device class
+Device = namedtuple("Device", ("ID", "model", "firmware", "cls"))
+
+# MODEL_NUMBER is 2 bytes at address 0 on every Dynamixel
+MODEL_NUMBER = (0, 2)
+
+
+class BusMap:
+    """What was found on a bus: its baud rate, the servos on it and their EEPROM
+
+    A map saved with ``save`` lets the next start skip discovery and the reads of
+    static registers, see ``warmStart``.
+
+    :param baudRate: Baud rate the servos answered at
+    :param devices: Device keyed by ID
+    :param version: Protocol version spoken on the bus, "1.0" or "2.0"
+    :param eeprom: Raw EEPROM area of each servo keyed by ID, see ``snapshot``
+    """
+
+    def __init__(
+        self, baudRate: int, devices: dict = None, version: str = "2.0", eeprom: dict = None
+    ):
+        self.baudRate = baudRate
+        self.devices = devices or {}
+        self.version = version
+        self.eeprom = eeprom or {}
+
+    def __len__(self):
+        return len(self.devices)
+
+    def create(self, protocol, names: dict = None) -> list:
+        """Instantiate every servo that has a device class
+
+        Servos with an EEPROM snapshot get their cache enabled and filled from it,
+        see ``seed``.
+
+        :param protocol: Protocol of the bus, set to ``baudRate``
+        :param names: Servo names keyed by ID, the ID as a string by default
+        """
+        names = names or {}
+        servos = []
+        for ID in sorted(self.devices):
+            cls = self.devices[ID].cls
+            if cls is not None:
+                servo = cls(names.get(ID, str(ID)), ID, protocol=protocol)
+                self.seed(servo)
+                servos.append(servo)
+        return servos
+
+    def seed(self, servo):
+        """Serve the servo's static items from the snapshot instead of the bus"""
+        block = self.eeprom.get(servo.id)
+        if block is None:
+            return
+        cache = servo.cache or servo.enableCache()
+        for _, ct in servo.CONTROL_TABLE.items():
+            end = ct.address + ct.length
+            if end <= len(block):
+                raw = int.from_bytes(block[ct.address : end], "little")
+                cache.store(ct.address, ct.length, raw, provenance.READ)
+        ct = getattr(servo.CONTROL_TABLE, "RETURN_DELAY_TIME", None)
+        if ct is not None and ct.address < len(block):
+            servo.protocol.timing.setReturnDelayTime(servo.id, block[ct.address])
+
+    def snapshot(self, protocol, ids=None):
+        """Read the EEPROM area of the servos in ``ids``, all of them by default
+
+        The area runs up to TORQUE_ENABLE and is read with one sync read per length.
+        """
+        groups = {}
+        for ID in self.devices if ids is None else ids:
+            cls = self.devices[ID].cls
+            ct = getattr(cls.CONTROL_TABLE, "TORQUE_ENABLE", None) if cls else None
+            if ct is not None:
+                groups.setdefault(ct.address, []).append(ID)
+        for length, group in groups.items():
+            res = protocol.syncRead(0, length, group, asBytes=True)
+            for ID, block in res.data.items():
+                self.eeprom[ID] = bytes(block)
+                device = self.devices[ID]
+                ct = getattr(device.cls.CONTROL_TABLE, "FIRMWARE_VERSION", None)
+                if ct is not None and ct.address < len(block):
+                    self.devices[ID] = Device(ID, device.model, block[ct.address], device.cls)
+
+    def validate(self, protocol, margin: float = None) -> bool:
+        """Check the map against the bus with one read of MODEL_NUMBER from every servo
+
+        Only when that finds a difference is the bus scanned again. Servos that are
+        new or changed model are snapshotted, servos that are gone are dropped.
+
+        :param margin: Latency allowed for each ping of a Protocol 1.0 sweep, see ``scan``
+        :returns: True if the map changed
+        """
+        ids = sorted(self.devices)
+        res = protocol.syncRead(*MODEL_NUMBER, ids) if ids else None
+        stale = []
+        missing = []
+        for ID in ids:
+            model = res.data.get(ID)
+            if model is None:
+                missing.append(ID)
+            elif model != self.devices[ID].model:
+                self.devices[ID] = Device(ID, model, None, devices.forModel(model))
+                stale.append(ID)
+        if missing:
+            found = scan(protocol, margin=margin)
+            for ID in missing:
+                if ID not in found:
+                    del self.devices[ID]
+                    self.eeprom.pop(ID, None)
+            for ID, device in found.items():
+                known = self.devices.get(ID)
+                if ID in stale:
+                    continue
+                if known is None or known.model != device.model or ID in missing:
+                    self.devices[ID] = device
+                    stale.append(ID)
+        if stale:
+            self.snapshot(protocol, stale)
+        return bool(stale or missing)
+
+    def save(self, path: str) -> bool:
+        """Write the map to ``path``, False if the filesystem isn't writable
+
+        CIRCUITPY is read only to code unless boot.py remounts it.
+        """
+        servos = {}
+        for ID, device in self.devices.items():
+            block = self.eeprom.get(ID)
+            servos[str(ID)] = [device.model, device.firmware, block.hex() if block else None]
+        data = {"version": self.version, "baudRate": self.baudRate, "servos": servos}
+        try:
+            with open(path, "w") as f:
+                json.dump(data, f)
+        except OSError:
+            return False
+        return True
+
+    @classmethod
+    def load(cls, path: str):
+        """The map saved at ``path``, None if there isn't a readable one"""
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            found = {}
+            eeprom = {}
+            for key, (model, firmware, block) in data["servos"].items():
+                ID = int(key)
+                found[ID] = Device(ID, model, firmware, devices.forModel(model))
+                if block:
+                    eeprom[ID] = bytes.fromhex(block)
+            return cls(data["baudRate"], found, data["version"], eeprom)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+
+def _classes() -> list:
+    classes = []
+    for _, classname, _ in devices.imports:
+        try:
+            classes.append(devices.load(classname))
+        except ImportError:
+            # the device was left out of the lib
+            pass
+    return classes
+
+
+def baudRates(protocol=None, classes: list = None) -> list:
+    """Every baud rate the device classes can be set to, most likely first
+
+    The protocol's current baud rate comes first, then the rates the servos ship
+    with and then the rest from the fastest down, as buses are usually sped up.
+    Only classes that speak the protocol's version are taken into account.
+
+    :param classes: Device classes to take the baud tables from, all of them by default
+    """
+    classes = _classes() if classes is None else classes
+    rates = []
+    if protocol is not None:
+        rates.append(protocol.timing.baudRate)
+        classes = [cls for cls in classes if protocol.VERSION in cls.PROTOCOLS]
+    for cls in classes:
+        if cls.DEFAULT_BAUD is not None:
+            rates.append(cls.DEFAULT_BAUD)
+    rest = set()
+    for cls in classes:
+        rest.update(cls.bauds.values())
+    rates.extend(sorted(rest, reverse=True))
+    ordered = []
+    for rate in rates:
+        if rate not in ordered:
+            ordered.append(rate)
+    return ordered
+
+
+def scan(protocol, ids=None, margin: float = None) -> dict:
+    """Find the servos answering at the protocol's current baud rate
+
+    Protocol 2.0 buses are found with one broadcast ping. Protocol 1.0 has no
+    broadcast ping so every ID is pinged in turn, each only waited on for as
+    long as the bus timing allows, and the servos that answer are asked for
+    their model number and firmware version.
+
+    :param ids: IDs to look for, every ID by default
+    :param margin: Seconds of UART latency allowed for each ping of the sweep, the
+        bus timing's margin by default. Lower it to sweep faster on a low latency port
+    :returns: Device keyed by ID
+    """
+    found = {}
+    if isinstance(protocol, Protocol2):
+        res = protocol.broadcastPing()
+        for ID, (model, firmware) in res.data.items():
+            if ids is None or ID in ids:
+                found[ID] = Device(ID, model, firmware, devices.forModel(model))
+        return found
+    timing = protocol.timing
+    saved = timing.margin
+    if margin is not None:
+        timing.margin = margin
+    present = []
+    try:
+        for ID in range(protocol.MAX_ID + 1) if ids is None else ids:
+            if protocol.ping(ID).data is not None:
+                present.append(ID)
+    finally:
+        timing.margin = saved
+    for ID in present:
+        res = protocol.read(ID, *MODEL_NUMBER)
+        model = res.data if res.ok else None
+        cls = devices.forModel(model)
+        firmware = None
+        ct = getattr(cls.CONTROL_TABLE, "FIRMWARE_VERSION", None) if cls else None
+        if ct is not None:
+            res = protocol.read(ID, ct.address, ct.length)
+            firmware = res.data if res.ok else None
+        found[ID] = Device(ID, model, firmware, cls)
+    return found
+
+
+def discover(protocol, bauds: list = None, ids=None, margin: float = None) -> BusMap:
+    """Find the baud rate of the bus and the servos on it
+
+    Baud rates are tried in order, see ``baudRates``, until servos answer at one.
+    The protocol is left at that rate, or at the rate it started at when nothing
+    answered anywhere.
+
+    m = discover(protocol)
+    servos = m.create(protocol)
+
+    :param bauds: Baud rates to try, ``baudRates(protocol)`` by default
+    :param ids: IDs to look for, every ID by default
+    :param margin: Latency allowed for each ping of a Protocol 1.0 sweep, see ``scan``
+    """
+    start = protocol.timing.baudRate
+    for baud in bauds or baudRates(protocol):
+        if baud != protocol.timing.baudRate:
+            protocol.setBaudRate(baud)
+        found = scan(protocol, ids, margin)
+        if found:
+            return BusMap(baud, found, protocol.VERSION)
+    if protocol.timing.baudRate != start:
+        protocol.setBaudRate(start)
+    return BusMap(start, {}, protocol.VERSION)
+
+
+def warmStart(protocol, path: str, bauds: list = None, margin: float = None) -> BusMap:
+    """The bus map saved at ``path``, checked against the bus and kept up to date
+
+    When the saved map still matches the bus that costs one sync read. Otherwise
+    only what changed is scanned again, and when there is no saved map, or nothing
+    on it answers, the bus is discovered and snapshotted from scratch. The map is
+    saved again whenever it changed::
+
+        m = warmStart(protocol, "/busmap.json")
+        servos = m.create(protocol)
+
+    :param bauds: Baud rates to try if the bus has to be discovered, see ``discover``
+    :param margin: Latency allowed for each ping of a Protocol 1.0 sweep, see ``scan``
+    """
+    busMap = BusMap.load(path)
+    if busMap is not None and busMap.version == protocol.VERSION and len(busMap):
+        if busMap.baudRate != protocol.timing.baudRate:
+            protocol.setBaudRate(busMap.baudRate)
+        changed = busMap.validate(protocol, margin)
+        if len(busMap):
+            if changed:
+                busMap.save(path)
+            return busMap
+    busMap = discover(protocol, bauds, margin=margin)
+    busMap.snapshot(protocol)
+    busMap.save(path)
+    return busMap
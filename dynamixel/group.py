@@ -0,0 +1,181 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from array import array
+
+from dynamixel.protocol import Error, Protocol2, Response
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    array("d")
+    _FLOAT = "d"
+except ValueError:
+    # ports without double precision
+    _FLOAT = "f"
+
+
+class ServoGroup:
+    """Servos of one model on one bus whose state is kept in columns, one per item
+
+    Each column is an ``array.array``, or a NumPy array with ``useNumpy``, holding
+    the value of every servo in the order they were given. ``read`` decodes one
+    sync read straight into the columns and ``write`` encodes a whole column of
+    goals into one sync write, no Python object is made per servo::
+
+        group = ServoGroup(legs, ("PRESENT_POSITION", ("PRESENT_VELOCITY", units.RPM)))
+        group.read()
+        positions = group["PRESENT_POSITION"]
+        group.write("GOAL_POSITION", goals, units.DEGREE)
+
+    Values in a scaled unit are floats, they aren't truncated like the getters do.
+    Unlike the getters and setters ``units.RAW`` can be asked for explicitly.
+
+    :param servos: Servos of the same class sharing one protocol
+    :param items: Item names, or (name, unit) to read them in something other than
+        the item's default unit
+    :param useNumpy: Keep the columns in NumPy arrays, the host needs NumPy
+    :param fast: Read with FAST_SYNC_READ on Protocol 2.0 buses
+    """
+
+    def __init__(self, servos: list, items, useNumpy: bool = False, fast: bool = True):
+        servos = list(servos)
+        cls = type(servos[0])
+        protocol = servos[0].protocol
+        for servo in servos:
+            if type(servo) is not cls or servo.protocol is not protocol:
+                raise ValueError("a group's servos need the same class and protocol")
+        if useNumpy and numpy is None:
+            raise ImportError("useNumpy needs NumPy")
+        self.cls = cls
+        self.protocol = protocol
+        self.ids = array("B", [servo.id for servo in servos])
+        self.useNumpy = useNumpy
+        self.fast = fast and isinstance(protocol, Protocol2)
+        self.columns = {}
+        self._fields = []
+        for item in items:
+            name, unit = (item, None) if isinstance(item, str) else item
+            ct = getattr(cls.CONTROL_TABLE, name)
+            codec = cls.CODECS[ct]
+            if unit is None:
+                unit = codec.defaultUnit
+            factor = codec.factor(unit)
+            if factor is None:
+                raise ValueError(f"{name} can't be read as a column in unit {unit}")
+            self.columns[name] = self._column(codec, factor)
+            self._fields.append((name, ct, codec, None if factor == 1 else factor))
+        # one span covering every item
+        self.address = min(ct.address for _, ct, _, _ in self._fields)
+        self.length = max(ct.address + ct.length for _, ct, _, _ in self._fields) - self.address
+
+    def __getitem__(self, name: str):
+        return self.columns[name]
+
+    def __len__(self):
+        return len(self.ids)
+
+    def _column(self, codec, factor):
+        n = len(self.ids)
+        if self.useNumpy:
+            return numpy.zeros(n, float if factor != 1 else numpy.int64)
+        if factor != 1:
+            typecode = _FLOAT
+        else:
+            typecode = "l" if codec.signed or codec.length < 4 else "L"
+        return array(typecode, bytes(n * array(typecode).itemsize))
+
+    def read(self) -> Response:
+        """Refresh every column with one sync read
+
+        Servos that don't answer keep their last values. ``res.err`` maps each ID
+        to its status.
+        """
+        method = self.protocol.fastSyncRead if self.fast else self.protocol.syncRead
+        res = method(self.address, self.length, self.ids, asBytes=True)
+        if self.useNumpy:
+            self._decodeNumpy(res.data)
+        else:
+            self._decode(res.data)
+        return Response(None, res.err)
+
+    def _decode(self, data: dict):
+        address = self.address
+        for name, ct, codec, factor in self._fields:
+            column = self.columns[name]
+            start = ct.address - address
+            end = start + ct.length
+            width = 8 * ct.length
+            sign = 1 << (width - 1) if codec.signed else 0
+            full = 1 << width
+            for i, ID in enumerate(self.ids):
+                block = data.get(ID)
+                if block is None:
+                    continue
+                raw = int.from_bytes(block[start:end], "little")
+                if raw & sign:
+                    raw -= full
+                column[i] = raw if factor is None else raw * factor
+
+    def _decodeNumpy(self, data: dict):
+        answered = [i for i, ID in enumerate(self.ids) if ID in data]
+        if not answered:
+            return
+        block = b"".join(data[self.ids[i]] for i in answered)
+        rows = numpy.frombuffer(block, numpy.uint8).reshape(len(answered), self.length)
+        address = self.address
+        for name, ct, codec, factor in self._fields:
+            start = ct.address - address
+            if ct.length not in {1, 2, 4}:
+                raise ValueError(f"{name} has no NumPy integer type")
+            kind = "<i" if codec.signed else "<u"
+            raw = rows[:, start : start + ct.length].copy().view(f"{kind}{ct.length}")[:, 0]
+            column = self.columns[name]
+            column[answered] = raw if factor is None else raw * factor
+
+    def encode(self, name: str, values, unit: int = None):
+        """Raw register values of ``values`` in ``unit``, checked against the item's limits"""
+        ct = getattr(self.cls.CONTROL_TABLE, name)
+        codec = self.cls.CODECS[ct]
+        if unit is None:
+            unit = codec.defaultUnit
+        factor = codec.factor(unit)
+        if factor is None:
+            raise ValueError(f"{name} can't be written as a column in unit {unit}")
+        if self.useNumpy:
+            mask = (1 << (8 * ct.length)) - 1
+            limits = codec.limits
+            raw = numpy.asarray(values, float)
+            raw = (raw if factor == 1 else raw / factor).astype(numpy.int64)
+            if isinstance(limits, tuple):
+                inRange = (raw >= limits[0]) & (raw <= limits[1])
+                assert inRange.all(), f"{name} should be within {limits[0]} and {limits[1]}"
+            elif isinstance(limits, list):
+                assert numpy.isin(raw, limits).all(), f"{name} should be one of {limits}"
+            return (raw & mask).tolist()
+        encode = codec.encoders[unit]
+        raw = array("L", bytes(len(values) * array("L").itemsize))
+        for i, value in enumerate(values):
+            raw[i] = encode(value)
+        return raw
+
+    def write(self, name: str, values, unit: int = None, defer: bool = False) -> Response:
+        """Write a column of values, one per servo in order, with one sync write
+
+        :param values: array, list or NumPy array in ``unit``
+        :param unit: Unit of the values, the item's default unit when None
+        :param defer: Send the sync write ahead of the next packet, see Protocol.defer
+        """
+        ct = getattr(self.cls.CONTROL_TABLE, name)
+        if len(values) != len(self.ids):
+            raise ValueError(f"{len(values)} values for {len(self.ids)} servos")
+        raw = self.encode(name, values, unit)
+        if defer:
+            self.protocol.defer("syncWrite", ct.address, ct.length, raw, self.ids)
+            return Response(None, Error.OK)
+        return self.protocol.syncWrite(ct.address, ct.length, raw, self.ids)
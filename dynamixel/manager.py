@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+from .batch import WriteBatch
+from .bus import Bus
+
+try:
+    import threading
+    from queue import Queue
+except ImportError:
+    threading = None
+
+
+class _Worker:
+    """Thread running the jobs of one bus"""
+
+    def __init__(self, bus: Bus):
+        self.bus = bus
+        self.jobs = Queue()
+        self.results = Queue()
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def _loop(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            try:
+                self.results.put((job(self.bus), None))
+            except Exception as e:
+                self.results.put((None, e))
+
+
+class _Batches:
+    """A WriteBatch for every bus, flushed on all of them at once"""
+
+    def __init__(self, manager):
+        self.manager = manager
+        self.batches = {bus: WriteBatch(bus.servos.values()) for bus in manager.buses}
+
+    def __enter__(self):
+        for batch in self.batches.values():
+            batch.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        for batch in self.batches.values():
+            batch.close()
+            if exc_type is not None:
+                batch.discard()
+        if exc_type is None:
+            self.manager.map(lambda bus: self.batches[bus].flush())
+        return False
+
+
+class BusManager:
+    """Drive several buses at the same time
+
+    Every bus needs its own protocol and UART. Jobs given to ``map`` run on all
+    buses at once, either on one worker thread per bus or, with ``pollAsync`` and
+    ``mapAsync``, as event loop tasks. A cycle then takes as long as the slowest
+    bus instead of the sum of all of them::
+
+        left = Bus(Protocol2(tx=board.TX, rx=board.RX, tx_enable=board.D2))
+        right = Bus(Protocol2(tx=board.D10, rx=board.D11, tx_enable=board.D9))
+        left.attach(XL430_W250_T("hip", 1, protocol=left.protocol))
+        right.attach(XL430_W250_T("hip", 1, protocol=right.protocol))
+        manager = BusManager([left, right])
+        manager.poll()
+        with manager.batch():
+            ...
+
+    :param buses: Buses to drive
+    :param threaded: Start a worker thread per bus. Without threads, or where the
+        port has none, ``map`` runs the buses one after the other
+    """
+
+    def __init__(self, buses: list, threaded: bool = True):
+        self.buses = list(buses)
+        self._workers = None
+        if threaded and threading is not None:
+            self._workers = [_Worker(bus) for bus in self.buses]
+
+    def map(self, job) -> list:
+        """Call ``job(bus)`` for every bus in parallel, results are in bus order"""
+        if self._workers is None:
+            return [job(bus) for bus in self.buses]
+        for worker in self._workers:
+            worker.jobs.put(job)
+        results = []
+        error = None
+        for worker in self._workers:
+            result, e = worker.results.get()
+            results.append(result)
+            error = error or e
+        if error is not None:
+            raise error
+        return results
+
+    async def mapAsync(self, job) -> list:
+        """Await ``job(bus)`` for every bus concurrently, ``job`` returns an awaitable"""
+        return await asyncio.gather(*(job(bus) for bus in self.buses))
+
+    def poll(self):
+        """Refresh the status of every servo on every bus, see Bus.poll"""
+        self.map(Bus.poll)
+
+    async def pollAsync(self):
+        await self.mapAsync(Bus.pollAsync)
+
+    def batch(self) -> _Batches:
+        """Queue setters across all buses and flush every bus at once, see WriteBatch"""
+        return _Batches(self)
+
+    async def run(self, interval: float = 0.1):
+        while True:
+            await self.pollAsync()
+            await asyncio.sleep(interval)
+
+    def stop(self):
+        """Let the worker threads finish"""
+        if self._workers is None:
+            return
+        for worker in self._workers:
+            worker.jobs.put(None)
+        for worker in self._workers:
+            worker.thread.join()
+        self._workers = None
@@ -0,0 +1,219 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from .crc import CRC_TABLE, crc16
+
+HEADER2 = b"\xff\xff\xfd\x00"
+HEADER2_CRC = crc16(HEADER2)
+INSTR_STATUS = 0x55
+
+
+class StatusParser:
+    """Incremental status packet parser
+
+    Bytes are handed to ``feed`` as they come off the UART in any sized chunks.
+    Every complete packet is appended to ``packets`` as ``(packet, valid)`` where
+    ``valid`` is False on a checksum mismatch. Anything that is not part of a
+    packet is skipped until the next header so the parser resyncs on its own.
+    """
+
+    HEADER_LENGTH = 0
+
+    def __init__(self, maxLength: int = 2048):
+        self.maxLength = maxLength
+        self._buf = bytearray(64)
+        self._view = memoryview(self._buf)
+        self.reset()
+
+    def reset(self):
+        self.packets = []
+        self.received = 0
+        self._state = 0
+        self._n = 0
+        self._remaining = 0
+        self._sum = 0
+        self._run = 0
+
+    @property
+    def pending(self) -> bool:
+        """True if a packet has been started but not finished"""
+        return self._state >= self.HEADER_LENGTH
+
+    def _grow(self, size: int):
+        buf = bytearray(size)
+        buf[: self._n] = self._view[: self._n]
+        self._buf = buf
+        self._view = memoryview(buf)
+
+    def _emit(self, valid: bool):
+        self.packets.append((bytes(self._view[: self._n]), valid))
+        self._state = 0
+
+
+class StatusParser1(StatusParser):
+    """Protocol 1.0 parser
+
+    HEADER HEADER ID LENGTH ERR PARAM... CHECKSUM
+    """
+
+    HEADER_LENGTH = 2
+
+    def feed(self, data, start: int = 0, end: int = None) -> int:
+        buf = self._buf
+        state = self._state
+        n = self._n
+        remaining = self._remaining
+        total = self._sum
+        count = 0
+        for byte in memoryview(data)[start:end]:
+            count += 1
+            if state < 2:
+                state = state + 1 if byte == 0xFF else 0
+            elif state == 2:
+                # 0xFF is not a valid ID, it is another header byte
+                if byte != 0xFF:
+                    buf[2] = byte
+                    total = byte
+                    state = 3
+            elif state == 3:
+                if byte < 2 or byte + 4 > self.maxLength:
+                    state = 0
+                    continue
+                if byte + 4 > len(buf):
+                    self._n = 3
+                    self._grow(byte + 4)
+                    buf = self._buf
+                buf[0] = 0xFF
+                buf[1] = 0xFF
+                buf[3] = byte
+                total += byte
+                remaining = byte - 1
+                n = 4
+                state = 4
+            elif state == 4:
+                buf[n] = byte
+                n += 1
+                total += byte
+                remaining -= 1
+                if not remaining:
+                    state = 5
+            else:
+                buf[n] = byte
+                n += 1
+                self._n = n
+                self._emit(~total & 0xFF == byte)
+                state = 0
+        self._state = state
+        self._n = n
+        self._remaining = remaining
+        self._sum = total
+        self.received += count
+        return len(self.packets)
+
+
+class StatusParser2(StatusParser):
+    """Protocol 2.0 parser
+
+    HEADER HEADER HEADER RESERVED ID LENGTH_LOW LENGTH_HIGH INSTR ERR PARAM... CRC_LOW CRC_HIGH
+
+    Stuffing bytes are removed from the stored packet while the CRC is run over
+    the bytes exactly as they were received. The length field is left as sent.
+    Only status packets (instruction 0x55) are kept so an echo of our own
+    instruction packet is dropped.
+    """
+
+    HEADER_LENGTH = 4
+
+    @staticmethod
+    def _header(byte: int, state: int) -> int:
+        """Next state while matching the header, 4 once it is complete"""
+        if byte == HEADER2[state]:
+            return state + 1
+        if byte == 0xFF:
+            return 2 if state == 2 else 1
+        return 0
+
+    def _begin(self) -> int:
+        """Check the length field just received, the number of bytes still to come
+
+        The params and instruction are counted, the CRC isn't. -1 if the length
+        can't be right.
+        """
+        buf = self._buf
+        length = buf[5] | buf[6] << 8
+        if length < 4 or length + 7 > self.maxLength:
+            return -1
+        if length + 7 > len(buf):
+            self._n = 7
+            self._grow(length + 7)
+            self._buf[0:4] = HEADER2
+        else:
+            buf[0:4] = HEADER2
+        return length - 2
+
+    def _end(self, state: int, n: int, crc: int) -> int:
+        """State after a CRC byte, the packet is done after the second"""
+        if state == 8:
+            return 9
+        self._n = n
+        buf = self._buf
+        if buf[7] == INSTR_STATUS:
+            self._emit(crc == buf[n - 2] | buf[n - 1] << 8)
+        return 0
+
+    def feed(self, data, start: int = 0, end: int = None) -> int:
+        table = CRC_TABLE
+        buf = self._buf
+        state = self._state
+        n = self._n
+        remaining = self._remaining
+        crc = self._sum
+        run = self._run
+        count = 0
+        for byte in memoryview(data)[start:end]:
+            count += 1
+            if state < 4:
+                state = self._header(byte, state)
+                if state == 4:
+                    crc = HEADER2_CRC
+            elif state < 7:
+                # ID and the length field
+                crc = ((crc & 0xFF) << 8) ^ table[(crc >> 8) ^ byte]
+                buf[state] = byte
+                state += 1
+                if state == 7:
+                    remaining = self._begin()
+                    state = 7 if remaining >= 0 else 0
+                    buf = self._buf
+                    n = 7
+                    run = 0
+            elif state == 7:
+                crc = ((crc & 0xFF) << 8) ^ table[(crc >> 8) ^ byte]
+                remaining -= 1
+                if run == 3:
+                    run = 0
+                    if byte == 0xFD:
+                        # FF FF FD FD is a stuffed FF FF FD
+                        if not remaining:
+                            state = 8
+                        continue
+                if byte == 0xFF:
+                    run = 2 if run else 1
+                elif byte == 0xFD and run == 2:
+                    run = 3
+                else:
+                    run = 0
+                buf[n] = byte
+                n += 1
+                if not remaining:
+                    state = 8
+            else:
+                # the CRC, low byte first
+                buf[n] = byte
+                n += 1
+                state = self._end(state, n, crc)
+        self._state, self._n, self._remaining, self._sum, self._run = state, n, remaining, crc, run
+        self.received += count
+        return len(self.packets)
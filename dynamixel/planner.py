@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from .protocol import Error, Protocol1, Response
+
+# Reading a few unwanted bytes is far cheaper than another round trip, which costs
+# an instruction packet, a status header and the servo's return delay
+MAX_GAP = 16
+
+
+def planSpans(servo, names, maxGap: int = MAX_GAP) -> list:
+    """Merge the named control table items of a servo into spans
+
+    Items closer than ``maxGap`` bytes apart share a span.
+
+    :return: list of (address, length, [(name, ControlTableItem), ...])
+    """
+    table = servo.CONTROL_TABLE
+    items = sorted(((name, getattr(table, name)) for name in names), key=lambda i: i[1].address)
+    spans = []
+    for name, ct in items:
+        end = ct.address + ct.length
+        if spans:
+            start, length, fields = spans[-1]
+            if ct.address - (start + length) <= maxGap:
+                spans[-1] = (start, max(length, end - start), fields)
+                fields.append((name, ct))
+                continue
+        spans.append((ct.address, ct.length, [(name, ct)]))
+    return spans
+
+
+class ReadPlan:
+    """The fewest transactions that read a set of control table items
+
+    Each servo's items are merged into spans with ``planSpans``. Spans are then
+    taken one per servo at a time; a single servo is a read, servos wanting the same
+    span share a sync read and anything else becomes a bulk read where the protocol
+    has one. Plans can be built once and executed every cycle::
+
+        plan = ReadPlan({m: ("PRESENT_VELOCITY", "PRESENT_POSITION", "PRESENT_INPUT_VOLTAGE")})
+        res = plan.execute()
+        res.data == {1: {"PRESENT_VELOCITY": 0, "PRESENT_POSITION": 2048, ...}}
+
+    :param items: Item names to read keyed by servo
+    :param maxGap: Largest gap in bytes between items read in one span
+    """
+
+    def __init__(self, items: dict, maxGap: int = MAX_GAP):
+        self.servos = {servo.id: servo for servo in items}
+        self.transactions = []
+        groups = {}
+        for servo, names in items.items():
+            spans = planSpans(servo, names, maxGap)
+            if servo.protocol in groups:
+                groups[servo.protocol].append((servo, spans))
+            else:
+                groups[servo.protocol] = [(servo, spans)]
+        for protocol, wanted in groups.items():
+            self._planProtocol(protocol, wanted)
+
+    def _planProtocol(self, protocol, wanted: list):
+        layer = 0
+        while True:
+            spans = [(servo, spans[layer]) for servo, spans in wanted if layer < len(spans)]
+            if not spans:
+                return
+            layer += 1
+            fields = {servo.id: span for servo, span in spans}
+            first = spans[0][1]
+            if len(spans) == 1:
+                servo, (address, length, _) = spans[0]
+                self.transactions.append((protocol.read, (servo.id, address, length), fields))
+            elif all(span[:2] == first[:2] for _, span in spans):
+                ids = [servo.id for servo, _ in spans]
+                args = (first[0], first[1], ids, True)
+                self.transactions.append((protocol.syncRead, args, fields))
+            elif isinstance(protocol, Protocol1) and not protocol.supportsBulkRead:
+                for servo, (address, length, _) in spans:
+                    args = (servo.id, address, length)
+                    self.transactions.append((protocol.read, args, {servo.id: fields[servo.id]}))
+            else:
+                values = [(servo.id, span[0], span[1]) for servo, span in spans]
+                self.transactions.append((protocol.bulkRead, (values, True), fields))
+
+    def decode(self, ID: int, span: tuple, block) -> dict:
+        """Split a span read from servo ``ID`` into unit converted, sign corrected fields"""
+        servo = self.servos[ID]
+        if not isinstance(block, int):
+            block = int.from_bytes(block, "little")
+        address, _, fields = span
+        values = {}
+        for name, ct in fields:
+            raw = (block >> (8 * (ct.address - address))) & ((1 << (8 * ct.length)) - 1)
+            values[name] = servo.decodeControlTableItem(ct, raw)
+        return values
+
+    def execute(self) -> Response:
+        """Run every transaction, data and errors are keyed by servo ID"""
+        data = {ID: {} for ID in self.servos}
+        errs = {ID: Error.OK for ID in self.servos}
+        for method, args, fields in self.transactions:
+            res = method(*args)
+            if len(fields) == 1 and not isinstance(res.data, dict):
+                # a plain read
+                ID = next(iter(fields))
+                results = {ID: res.data} if res.ok else {}
+                resErrs = {ID: res.err}
+            else:
+                results = res.data or {}
+                resErrs = res.err if isinstance(res.err, dict) else {}
+            for ID, span in fields.items():
+                err = resErrs.get(ID, Error.OK)
+                if err != Error.OK:
+                    errs[ID] = err
+                elif ID in results:
+                    data[ID].update(self.decode(ID, span, results[ID]))
+        return Response(data, errs)
+
+
+def readItems(items: dict, maxGap: int = MAX_GAP) -> Response:
+    """Plan and execute a one off read, see ReadPlan"""
+    return ReadPlan(items, maxGap).execute()
@@ -5,12 +5,20 @@
 
 import time
 
-import board
-import busio
-import digitalio
-
+from .crc import crc16
+from .parser import StatusParser1, StatusParser2
+from .stats import BusStats, Transaction
+from .timing import BusTiming
+from .transport import UARTTransport
 from .utils import Lock
 
+try:
+    from functools import wraps
+except ImportError:
+    # CircuitPython has no functools, the names only matter to help() and the docs
+    def wraps(_):
+        return lambda call: call
+
 
 class Error:
     ERR_RX_ERROR = "ERR_RX"
@@ -31,6 +39,7 @@ class Error:
     ERR_OVERHEATING_ERROR = "ERR_OVERHEATING_ERROR"
     ERR_ANGLE_ERROR = "ERR_ANGLE_ERROR"
     ERR_INPUT_VOLTAGE_ERROR = "ERR_INPUT_VOLTAGE_ERROR"
+    ERR_HARDWARE_ALERT = "ERR_HARDWARE_ALERT"
 
     OK = "OK"
 
@@ -44,27 +53,444 @@ class Response:
     def ok(self):
         if isinstance(self.err, list):
             return all(err == Error.OK for err in self.err)
+        if isinstance(self.err, dict):
+            return all(err == Error.OK for err in self.err.values())
         return self.err == Error.OK
 
 
+def _decode(data, asBytes: bool):
+    if asBytes:
+        return bytes(data)
+    return int.from_bytes(data, "little")
+
+
+_TRANSACTIONS = {}
+_SHARED = {}
+
+
+def transaction(method):
+    """Turn an instruction written as a generator into a blocking method
+
+    The generator builds its packet in the transmit buffer and yields, the
+    Response to that packet is sent back in and whatever the generator returns is
+    the result of the call. Instructions that need more than one round trip just
+    yield again. AsyncProtocol drives the same generators with awaits so every
+    instruction is only written once.
+    """
+
+    @wraps(method)
+    def call(self, *args, **kwargs):
+        return self._run(method(self, *args, **kwargs))
+
+    _TRANSACTIONS[call] = method
+    return call
+
+
 class Protocol:
     BROADCAST = 254
+    # highest ID a servo can be given
+    MAX_ID = 253
     OK = "OK"
+    TX_BUFFER_SIZE = 64
+    RX_BUFFER_SIZE = 256
+    PARSER = None
+    ID_INDEX = None
+    INSTRUCTION_INDEX = None
+    ERROR_INDEX = None
+    STATUS_LENGTH = None
 
     def __init__(
         self,
-        tx_enable: board.Pin = board.D2,
+        tx_enable=None,
         baudRate: int = 1000000,
-        tx: board.Pin = board.TX,
-        rx: board.Pin = board.RX,
+        *,
+        tx=None,
+        rx=None,
         timeout: int = 1,
+        timing: BusTiming = None,
+        transport=None,
     ):
-        self.uart = busio.UART(tx, rx, baudrate=baudRate, timeout=timeout)
+        """
+        :param tx_enable: Direction pin of the board UART, board.D2 by default
+        :param baudRate: Baud rate of the bus
+        :param tx: TX pin of the board UART, board.TX by default
+        :param rx: RX pin of the board UART, board.RX by default
+        :param timeout: UART read timeout in seconds
+        :param timing: Bus timing, derived from ``baudRate`` by default
+        :param transport: What the bus is attached through, see ``transport.py``.
+            The board UART on the pins above when None
+        """
+        if transport is None:
+            transport = UARTTransport(tx_enable, baudRate, tx, rx, timeout)
+        else:
+            baudRate = transport.baudrate
+        self.uart = transport
+        self.timing = timing or BusTiming(baudRate)
         lock = Lock()
         self.lock = lock
-        self.tx_enable = digitalio.DigitalInOut(tx_enable)
-        self.tx_enable.direction = digitalio.Direction.OUTPUT
+        self.tx_enable = transport.direction
+        self._allocate(self.TX_BUFFER_SIZE)
+        self._rx = bytearray(self.RX_BUFFER_SIZE)
+        self._rxView = memoryview(self._rx)
+        self.parser = self.PARSER()
+        self.stats: BusStats = None
+        self._expectedIds = []
+        self._window = False
+        self._deferred = b""
+        self._wireLength = 0
+
+    def sibling(self):
+        """Protocol on the same bus with its own transmit buffer, parser and reply state
+
+        It shares the transport, timing and lock, so packets built through either
+        never mix and only one of them is on the wire at a time. See AsyncProtocol.
+        """
+        other = type(self)(transport=self.uart, timing=self.timing)
+        other.lock = self.lock
+        return other
+
+    @classmethod
+    def shared(cls, **kwargs):
+        """The instance used by every servo that wasn't given a protocol
+
+        Created with ``kwargs`` on first use. Each bus should have its own instance,
+        this is only a convenience for the single bus on the default pins.
+        """
+        protocol = _SHARED.get(cls)
+        if protocol is None:
+            protocol = _SHARED[cls] = cls(**kwargs)
+        return protocol
+
+    def _allocate(self, size: int):
+        # Only grows when a packet bigger than anything sent so far shows up
+        self._tx = bytearray(size)
+        self._txView = memoryview(self._tx)
+        self._txLength = 0
+
+    def _expect(self, ID: int, length: int, packets: int = 1):
+        """Add a reply to what the packet being built will be answered with
+
+        :param ID: Servo sending the reply, used for its return delay time
+        :param length: Bytes the reply adds on the wire
+        :param packets: Status packets the reply adds, 0 when it extends a shared
+            packet such as the fast sync read frame
+        """
+        self._expected += packets
+        self._expectedLength += length
+        self._returnDelayNs += self.timing.returnDelayNs(ID)
+        if self.stats is not None:
+            self._expectedIds.append(ID)
+
+    def _expectNothing(self):
+        self._expected = 0
+        # when set ``_expected`` is only an upper bound, see broadcastPing
+        self._window = False
+        self._expectedLength = 0
+        self._returnDelayNs = 0
+        if self.stats is not None:
+            del self._expectedIds[:]
+
+    def _write(self) -> int:
+        """Finish the packet in the transmit buffer and start writing it
+
+        Returns when the write started, the direction pin is left driving the bus.
+        """
+        self._finish()
         self.tx_enable.value = True
+        self.timing.waitSetup()
+        start = time.monotonic_ns()
+        deferred = self._deferred
+        self._wireLength = self._txLength + len(deferred)
+        if deferred:
+            # back to back with the packet, in the same turn of the bus
+            self.uart.write(deferred)
+            self._deferred = b""
+        self.uart.write(self._txView[: self._txLength])
+        return start
+
+    def _transmit(self) -> Response:
+        """Send the packet in the transmit buffer and wait for its reply"""
+        if self.stats is not None:
+            return self._transmitMeasured()
+        start = self._write()
+        self.timing.waitTransmitted(start, self._wireLength)
+        self.tx_enable.value = False
+        res = self.receive(self._expected, self._expectedLength, self._returnDelayNs)
+        self.uart.reset_input_buffer()
+        return res
+
+    def _transmitMeasured(self) -> Response:
+        """``_transmit`` that records the transaction in ``stats``"""
+        start = self._write()
+        self.timing.waitTransmitted(start, self._wireLength)
+        self.tx_enable.value = False
+        sent = time.monotonic_ns()
+        expected = self._expected
+        length = self._expectedLength
+        parseNs = 0
+        if expected:
+            deadline = self._startReceive(length, self._returnDelayNs)
+            packets = self.parser.packets
+            while len(packets) < expected:
+                t = time.monotonic_ns()
+                if self._pollReceive(length):
+                    parseNs += time.monotonic_ns() - t
+                elif t > deadline:
+                    break
+            t = time.monotonic_ns()
+            res = self._receiveResponse(expected)
+            parseNs += time.monotonic_ns() - t
+        else:
+            self.parser.reset()
+            res = Response(None, Error.OK)
+        self.uart.reset_input_buffer()
+        self._record(start, sent, time.monotonic_ns(), parseNs, res)
+        return res
+
+    def _record(self, start: int, sent: int, end: int, parseNs: int, res: Response):
+        """Hand a finished transaction to ``stats``
+
+        :param start: When the write started
+        :param sent: When the last byte left the wire
+        :param end: When the reply was complete or given up on
+        :param parseNs: Part of ``sent`` to ``end`` spent reading and parsing
+        """
+        replies = []
+        answered = set()
+        for packet, valid in self.parser.packets:
+            ID = packet[self.ID_INDEX]
+            answered.add(ID)
+            if ID == self.BROADCAST:
+                # a fast read frame, every servo in it answered
+                answered.update(self._expectedIds)
+                continue
+            err = self.statusErrors(packet[self.ERROR_INDEX]) if valid else None
+            if err is None:
+                errors = [Error.ERR_RX_CRC_MISMATCH]
+            else:
+                errors = [] if err == Error.OK else err
+            replies.append((ID, len(packet), errors))
+        missing = [ID for ID in self._expectedIds if ID not in answered]
+        errors = []
+        for err in res.err if isinstance(res.err, list) else (res.err,):
+            if isinstance(err, list):
+                errors.extend(err)
+            elif err != Error.OK:
+                errors.append(err)
+        tx = self._tx
+        t = Transaction(
+            tx[self.INSTRUCTION_INDEX],
+            tx[self.ID_INDEX],
+            self._wireLength,
+            self.parser.received,
+            sent - start,
+            end - sent - parseNs,
+            parseNs,
+            errors,
+        )
+        self.stats.record(t, replies, missing)
+
+    def enableStats(self, callback=None) -> BusStats:
+        """Start recording every transaction, see BusStats
+
+        :param callback: Called with a stats.Transaction after each transaction
+        """
+        names = {}
+        for name in dir(type(self)):
+            if name.startswith("INSTR_"):
+                names[getattr(self, name)] = name[6:]
+        self._expectedIds = []
+        self.stats = BusStats(names, callback)
+        return self.stats
+
+    def disableStats(self):
+        self.stats = None
+
+    def _run(self, gen):
+        """Drive an instruction written as a generator, see ``transaction``"""
+        # building a packet fills the shared transmit buffer, so the lock covers it too
+        with self.lock:
+            try:
+                gen.send(None)
+                while True:
+                    gen.send(self._transmit())
+            except StopIteration as e:
+                return e.value
+
+    def defer(self, name: str, *args, **kwargs):
+        """Build an instruction now and send it ahead of the next packet
+
+        Both go out back to back in one turn of the bus, e.g. the goal sync write
+        of a control loop cycle with the status read of the next. Only for broadcast
+        instructions nothing answers, such as syncWrite. See ``sendDeferred``.
+
+        p.defer("syncWrite", 116, 4, [(1, 2048), (2, 1024)])
+        """
+        with self.lock:
+            self._deferred += self._build(name, *args, **kwargs)
+
+    def build(self, name: str, *args, **kwargs) -> bytes:
+        """The finished packet of an instruction nothing answers, without sending it
+
+        Packets built ahead of time are sent later with ``deferPacket``, keeping the
+        encoding off the critical path of a loop.
+
+        packet = p.build("syncWrite", 116, 4, [(1, 2048), (2, 1024)])
+        """
+        with self.lock:
+            return self._build(name, *args, **kwargs)
+
+    def _build(self, name: str, *args, **kwargs) -> bytes:
+        """``build`` for callers already holding the lock"""
+        gen = self._generator(name)(self, *args, **kwargs)
+        gen.send(None)
+        gen.close()
+        if self._expected:
+            raise ValueError(f"{name} is answered so it can't be sent unanswered")
+        self._finish()
+        return bytes(self._txView[: self._txLength])
+
+    def deferPacket(self, packet: bytes):
+        """Send a packet made by ``build`` ahead of the next packet, see ``defer``"""
+        with self.lock:
+            self._deferred += packet
+
+    def sendDeferred(self):
+        """Send deferred instructions now instead of with the next packet"""
+        if not self._deferred:
+            return
+        with self.lock:
+            deferred = self._deferred
+            self._deferred = b""
+            self.tx_enable.value = True
+            self.timing.waitSetup()
+            start = time.monotonic_ns()
+            self.uart.write(deferred)
+            self.timing.waitTransmitted(start, len(deferred))
+            self.tx_enable.value = False
+
+    def _generator(self, name: str):
+        """The undecorated generator behind the transaction method ``name``
+
+        None if ``name`` isn't an instruction.
+        """
+        return _TRANSACTIONS.get(getattr(type(self), name, None))
+
+    def setBaudRate(self, baudRate: int):
+        """Change the host side of the bus, the servos have to be told separately"""
+        self.uart.baudrate = baudRate
+        self.timing.baudRate = baudRate
+
+    def statusErrors(self, err: int):
+        """Decode an error byte where every bit is an error, bit 0 first"""
+        if err:
+            return [e for i, e in enumerate(self.STATUS_ERRORS) if err >> i & 1]
+        return Error.OK
+
+    def receive(self, expected: int = 1, length: int = None, returnDelayNs: int = None) -> Response:
+        """Read status packets until ``expected`` of them have arrived
+
+        Bytes are fed to the parser as they are available so packets are split,
+        de-stuffed and checked in a single pass no matter how many of them come back
+        from one sync or bulk read. Reading stops as soon as the last packet is
+        complete or at the deadline for a reply of ``length`` bytes, whichever is first.
+
+        :param expected: Number of status packets to wait for
+        :param length: Total bytes expected, defaults to ``expected`` empty status packets
+        :param returnDelayNs: Total return delay of the servos answering
+        """
+        if not expected:
+            return Response(None, Error.OK)
+        if length is None:
+            length = expected * self.STATUS_LENGTH
+        if returnDelayNs is None:
+            returnDelayNs = expected * self.timing.returnDelayNs(None)
+        deadline = self._startReceive(length, returnDelayNs)
+        packets = self.parser.packets
+        while len(packets) < expected:
+            # the time is taken first, bytes that came in while this thread was
+            # switched out past the deadline are still picked up by the poll
+            now = time.monotonic_ns()
+            if not self._pollReceive(length) and now > deadline:
+                break
+        return self._receiveResponse(expected)
+
+    def _startReceive(self, length: int, returnDelayNs: int) -> int:
+        """Reset the parser and return the deadline for a reply of ``length`` bytes"""
+        self.parser.reset()
+        return time.monotonic_ns() + self.timing.responseTimeNs(length, returnDelayNs)
+
+    def _pollReceive(self, length: int) -> int:
+        """Feed whatever is waiting on the UART to the parser without blocking"""
+        uart = self.uart
+        n = uart.in_waiting
+        if not n:
+            return 0
+        view = self._rxView
+        # stuffing can make a reply longer than expected, never ask for less than 1
+        n = min(n, len(view), max(length - self.parser.received, 1))
+        n = uart.readinto(view[:n])
+        if n:
+            self.parser.feed(view, 0, n)
+        return n
+
+    def _receiveResponse(self, expected: int) -> Response:
+        parser = self.parser
+
+        # uncomment the following to see the actual hex, the status packet instr is 55
+        # but will show up in list(packet) as 85 which is just confusing. You can also
+        # capture the send and receive in the dynamixel wizard if you plug on cable into
+        # a u2d2 and select View > Packet
+        # print(f"raw response: {[[f'0x{i:02X}' for i in p] for p, _ in parser.packets]}")
+
+        packets = []
+        errs = []
+        for packet, valid in parser.packets:
+            packets.append(packet)
+            if valid:
+                errs.append(self.statusErrors(packet[self.ERROR_INDEX]))
+            else:
+                errs.append(Error.ERR_RX_CRC_MISMATCH)
+        if expected == 1:
+            if packets:
+                return Response(packets[0], errs[0])
+            if parser.received:
+                return Response(None, Error.ERR_RX_FAILED_TO_RX_ENTIRE_PACKET)
+            return Response(None, Error.ERR_RX_TIMEOUT)
+        if not packets and not parser.received:
+            return Response(None, Error.ERR_RX_TIMEOUT)
+        while len(errs) < expected and not self._window:
+            errs.append(Error.ERR_RX_FAILED_TO_RX_ENTIRE_PACKET)
+        return Response(packets, errs)
+
+    def _decodeStatus(self, res: Response, lengths: dict, asBytes: bool) -> Response:
+        """Map the status packets in ``res`` to the IDs that sent them
+
+        Each ID's params become its value, an int unless ``asBytes`` is set or the
+        span is longer than 4 bytes. IDs that never answered get ``ERR_RX_NO_RESPONSE``.
+
+        :param lengths: Number of bytes read from each ID
+        """
+        data = {}
+        errs = {}
+        for ID in lengths:
+            errs[ID] = Error.ERR_RX_NO_RESPONSE
+        if res.data is None:
+            return Response(data, errs)
+        if isinstance(res.data, list):
+            packets = zip(res.data, res.err)
+        else:
+            packets = ((res.data, res.err),)
+        start = self.ERROR_INDEX + 1
+        for packet, err in packets:
+            ID = packet[self.ID_INDEX]
+            if ID not in errs:
+                continue
+            errs[ID] = err
+            if err != Error.ERR_RX_CRC_MISMATCH:
+                length = lengths[ID]
+                data[ID] = _decode(packet[start : start + length], asBytes or length > 4)
+        return Response(data, errs)
 
     @classmethod
     def _packetLength(cls, packet: list, size: int) -> list:
@@ -75,8 +501,6 @@ class Protocol:
 
 
 class Protocol1(Protocol):
-    _instance = None
-    initialized = False
     VERSION = "1.0"
 
     # (LEN, INST)
@@ -91,6 +515,11 @@ class Protocol1(Protocol):
     INSTR_BULK_READ = 0x92
 
     HEADERS = [0xFF, 0xFF]
+    PARSER = StatusParser1
+    ID_INDEX = 2
+    INSTRUCTION_INDEX = 4
+    ERROR_INDEX = 4
+    STATUS_LENGTH = 6
 
     # INSTR Packet
     class InstrPacket:
@@ -108,91 +537,34 @@ class Protocol1(Protocol):
         ERROR = [4]
         CRC = [-1]
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
-    def __init__(self, *args, **kwargs):
-        if not self.initialized:
-            super().__init__(*args, **kwargs)
-        self.initialized = True
+    def __init__(self, *args, supportsBulkRead: bool = False, **kwargs):
+        """
+        :param supportsBulkRead: The servos on the bus understand BULK_READ (MX series),
+            AX series servos don't so reads of several servos fall back to one read each
+        """
+        super().__init__(*args, **kwargs)
+        self.supportsBulkRead = supportsBulkRead
+        # error byte bits, bit 0 first
         self.STATUS_ERRORS = [
-            None,
-            Error.ERR_INSTR_ERROR,
-            Error.ERR_OVERLOAD_ERROR,
-            Error.ERR_CRC_ERR,
-            Error.ERR_RANGE_ERROR,
-            Error.ERR_OVERHEATING_ERROR,
-            Error.ERR_ANGLE_ERROR,
             Error.ERR_INPUT_VOLTAGE_ERROR,
+            Error.ERR_ANGLE_ERROR,
+            Error.ERR_OVERHEATING_ERROR,
+            Error.ERR_RANGE_ERROR,
+            Error.ERR_CRC_ERR,
+            Error.ERR_OVERLOAD_ERROR,
+            Error.ERR_INSTR_ERROR,
         ]
 
+    def sibling(self):
+        other = super().sibling()
+        other.supportsBulkRead = self.supportsBulkRead
+        return other
+
     def validationErrors(self, packet: list):
         crc = self.checksum(packet[:-1])
         if crc != packet[-1]:
             return Error.ERR_RX_CRC_MISMATCH
-        err = packet[4]
-        if err:
-            return [
-                self.STATUS_ERRORS[i] for i, c in enumerate(reversed(str(bin(err))[2:])) if int(c)
-            ]
-        return Error.OK
-
-    def receive(self) -> Response:
-        length = 0
-        # read in HEADER HEADER HEADER RESERVED ID LENGTH_LOW LENGTH_HIGH 55 ERR CRC_LOW CRC_HIGH
-        packet = self.uart.read(self.uart.in_waiting)
-
-        # uncomment the following to see the actual hex, the status packet instr is 55
-        # but will show up in list(packet) as 85 which is just confusing. You can also
-        # capture the send and receive in the dynamixel wizard if you plug on cable into
-        # a u2d2 and select View > Packet
-        # tp = [f'0x{i:02X}'for i in packet]
-        # print(f'raw response: {tp}')
-
-        if packet is None:
-            return Response(None, Error.ERR_RX_TIMEOUT)
-        else:
-            packet = list(packet)
-        if packet[:2] == self.HEADERS:
-            length = packet[3]
-            if length + 4 == len(packet) and not self.uart.in_waiting:
-                return Response(packet, self.validationErrors(packet))
-            if length < len(packet):
-                headers = []
-                for i in range(len(packet)):
-                    j = packet[i : i + 4]
-                    if len(j) == 4 and j[:3] == self.HEADERS and j[3] != 0xFD:
-                        headers.append(i)
-                if not self.uart.in_waiting:
-                    packets = [
-                        packet[headers[i] : (headers[i + 1] if i + 1 < len(headers) else None)]
-                        for i in range(len(headers))
-                    ]
-                    return Response(packets, [self.validationErrors(packet) for packet in packets])
-            else:
-                toRead = 11 - (length + 1)  # plus one because length include the instruction
-                t = self.uart.read(toRead)
-                if t is None:
-                    return Response(t, Error.ERR_RX_FAILED_TO_RX_ENTIRE_PACKET)
-                packet += list(t)
-                if self.uart.in_waiting:
-                    t = self.uart.read(self.uart.in_waiting)
-                packet += list(t)
-                return Response(packet, self.validationErrors(packet))
-        for i in range(len(packet)):
-            j = packet[i : i + 4]
-            if len(j) == 4 and j[:3] == self.HEADERS and j[3] != 0xFD:
-                break
-        else:
-            if not self.uart.in_waiting:
-                return Response(packet, Error.ERR_RX_NO_RESPONSE)
-            packet = list(self.uart.read(self.uart.in_waiting))
-        if packet:
-            return Response(packet, self.validationErrors(packet))
-
-        return Response(None, Error.ERR_RX_ERROR)
+        return self.statusErrors(packet[4])
 
     @classmethod
     def checksum(cls, packet: list) -> int:
@@ -213,59 +585,118 @@ class Protocol1(Protocol):
             packet[index] = value
         return packet
 
-    def send(self, packet: list) -> Response:
-        """Transmission Process
+    @staticmethod
+    def maxPacketLength(paramLength: int) -> int:
+        """Size of an instruction packet carrying ``paramLength`` params"""
+        return 6 + paramLength
 
-        1. Generate basic packet structure including required parameters.
-        2. Apply Byte Stuffing to ensure that packets are processed successfully.
-        3. Update packet length to include any stuffed bytes.
-        4. Calculate final CRC with byte stuffing applied.
+    def _begin(self, ID: int, instr: int, paramLength: int = 0, responseLength: int = 0):
+        """Start a new instruction packet in the transmit buffer
+
+        Unless ``ID`` is the broadcast ID one status packet carrying
+        ``responseLength`` params is expected back.
+
+        HEADER HEADER ID LENGTH INSTR PARAM... CHECKSUM
         """
-        packet = self.addHeaders(packet)
-        packet = self.updateLength(packet)
-        packet = self.addChecksum(packet)
-        # Packet at this point matches the official sdk
-        with self.lock:
-            self.tx_enable.value = True
-            time.sleep(0.01)
-            self.uart.write(bytes(packet))
-            self.tx_enable.value = False
-            time.sleep(0.01)
-            res = self.receive()
-            self.uart.reset_input_buffer()
-        return res
+        size = self.maxPacketLength(paramLength)
+        if size > len(self._tx):
+            self._allocate(size)
+        buf = self._tx
+        buf[0] = 0xFF
+        buf[1] = 0xFF
+        buf[2] = ID
+        buf[4] = instr
+        self._txLength = 5
+        self._expectNothing()
+        if ID != self.BROADCAST:
+            self._expect(ID, self.STATUS_LENGTH + responseLength)
+
+    def _putInt(self, value: int, length: int):
+        buf = self._tx
+        n = self._txLength
+        for _ in range(length):
+            buf[n] = value & 0xFF
+            value >>= 8
+            n += 1
+        self._txLength = n
+
+    def _putBytes(self, data, start: int = 0):
+        buf = self._tx
+        n = self._txLength
+        for i in range(start, len(data)):
+            buf[n] = data[i]
+            n += 1
+        self._txLength = n
+
+    def _putData(self, data, length: int):
+        if isinstance(data, int):
+            self._putInt(data, length)
+        else:
+            self._putBytes(data)
+
+    def _finish(self):
+        buf = self._tx
+        n = self._txLength
+        # Length is the number of params + 2 (instruction and checksum)
+        buf[3] = n - 3
+        total = 0
+        for i in range(2, n):
+            total += buf[i]
+        buf[n] = ~total & 0xFF
+        self._txLength = n + 1
+
+    @transaction
+    def send(self, packet: list, expected: int = 1) -> Response:
+        """Transmission Process
 
+        Thin wrapper for packets built as lists in the ``[ID, LENGTH, INSTR, PARAM...]``
+        format. The packet is copied into the transmit buffer where the headers, length
+        and checksum are filled in.
+        """
+        self._begin(packet[0], packet[2], len(packet) - 3)
+        self._putBytes(packet, 3)
+        if expected != self._expected:
+            self._expectNothing()
+            for _ in range(expected):
+                self._expect(packet[0], self.STATUS_LENGTH)
+        return (yield)
+
+    @transaction
     def ping(self, ID: int) -> Response:
-        length = self.packetLength([self.INSTR_PING, 0x00])
-        packet = [ID] + length + [self.INSTR_PING]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_PING)
+        return (yield)
 
+    @transaction
     def read(self, ID: int, addr: int, length: int) -> Response:
-        pl = self.packetLength([self.INSTR_READ, addr, length] + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_READ, addr, length]
-        res = self.send(packet)
+        self._begin(ID, self.INSTR_READ, 2, length)
+        self._putInt(addr, 1)
+        self._putInt(length, 1)
+        res = yield
         if not res.ok:
             return res
         data = int.from_bytes(bytes(res.data[5:-1]), "little")
         return Response(data, Error.OK)
 
+    @transaction
     def write(self, ID: int, addr: int, length: int, data: int) -> Response:
-        dataLowHigh = list(data.to_bytes(length, "little"))
-        pl = self.packetLength([self.INSTR_WRITE, addr] + dataLowHigh + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_WRITE, addr] + dataLowHigh
-        return self.send(packet)
+        self._begin(ID, self.INSTR_WRITE, 1 + length)
+        self._putInt(addr, 1)
+        self._putData(data, length)
+        return (yield)
 
+    @transaction
     def regWrite(self, ID: int, addr: int, length: int, data: int) -> Response:
-        dataLowHigh = list(data.to_bytes(length, "little"))
-        pl = self.packetLength([self.INSTR_REG_WRITE, addr] + dataLowHigh + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_REG_WRITE] + dataLowHigh
-        return self.send(packet)
+        self._begin(ID, self.INSTR_REG_WRITE, 1 + length)
+        self._putInt(addr, 1)
+        self._putData(data, length)
+        return (yield)
 
+    @transaction
     def action(self, ID: int) -> Response:
-        length = self.packetLength([self.INSTR_ACTION, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_ACTION]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_ACTION)
+        return (yield)
 
+    @transaction
     def factoryReset(
         self,
         ID: int,
@@ -282,39 +713,79 @@ class Protocol1(Protocol):
             p = 0x02
         else:
             return 0
-        length = self.packetLength([self.INSTR_FACTORY_RESET, p, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_FACTORY_RESET, p]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_FACTORY_RESET, 1)
+        self._putInt(p, 1)
+        return (yield)
 
+    @transaction
     def reboot(self, ID: int) -> Response:
-        length = self.packetLength([self.INSTR_REBOOT, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_REBOOT]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_REBOOT)
+        return (yield)
 
-    def syncRead(self, addr: int, length: int, ids: list) -> Response:
-        lengthLowHigh = list(length.to_bytes(2, "little"))
-        pl = self.packetLength([self.INSTR_SYNC_READ, addr] + lengthLowHigh + ids + [0x00, 0x00])
-        packet = [self.BROADCAST] + pl + [self.INSTR_SYNC_READ, addr] + lengthLowHigh + ids
-        return self.send(packet)
+    @transaction
+    def syncRead(self, addr: int, length: int, ids: list, asBytes: bool = False) -> Response:
+        """Read the same span from every servo in ``ids``
 
-    def syncWrite(self, addr: int, length: int, values: list) -> Response:
+        Protocol 1.0 has no sync read so this is a bulk read when the bus supports it
+        and one read per servo otherwise. Either way the result is the same ID keyed
+        Response as Protocol2.syncRead.
         """
-        Example call: p.syncWrite(116, 4, [(1, 150), (2, 170)])
-        set value at 116 which is 4 bytes to 150 for motor 1 and 170 to motor 2
+        if self.supportsBulkRead:
+            bulkRead = self._generator("bulkRead")
+            return (yield from bulkRead(self, [(ID, addr, length) for ID in ids], asBytes))
+        data = {}
+        errs = {}
+        lengths = {}
+        for ID in ids:
+            self._begin(ID, self.INSTR_READ, 2, length)
+            self._putInt(addr, 1)
+            self._putInt(length, 1)
+            lengths.clear()
+            lengths[ID] = length
+            res = self._decodeStatus((yield), lengths, asBytes)
+            data.update(res.data)
+            errs.update(res.err)
+        return Response(data, errs)
+
+    @transaction
+    def bulkRead(self, values: list, asBytes: bool = False) -> Response:
+        """
+        Example call: p.bulkRead([(1, 36, 2), (2, 43, 1)])
+        read 2 bytes at 36 from motor 1 and 1 byte at 43 from motor 2,
+        res.data == {1: 512, 2: 35}
+
+        Only MX series servos answer a bulk read, see ``supportsBulkRead``.
+        """
+        self._begin(self.BROADCAST, self.INSTR_BULK_READ, 1 + 3 * len(values))
+        self._putInt(0x00, 1)
+        lengths = {}
+        for ID, addr, length in values:
+            self._putInt(length, 1)
+            self._putInt(ID, 1)
+            self._putInt(addr, 1)
+            self._expect(ID, self.STATUS_LENGTH + length)
+            lengths[ID] = length
+        return self._decodeStatus((yield), lengths, asBytes)
+
+    @transaction
+    def syncWrite(self, addr: int, length: int, values: list, ids: list = None) -> Response:
+        """
+        Example call: p.syncWrite(30, 2, [(1, 150), (2, 170)])
+        set value at 30 which is 2 bytes to 150 for motor 1 and 170 to motor 2
+
+        With ``ids`` the values are a column in the same order, e.g. an array:
+        p.syncWrite(30, 2, array("H", [150, 170]), ids=[1, 2])
         """
-        p = []
-        for ID, value in values:
-            p.append(ID)
-            p.extend(list(value.to_bytes(length, "little")))
-        lengthLowHigh = list(length.to_bytes(2, "little"))
-        pl = self.packetLength([self.INSTR_SYNC_WRITE, addr] + lengthLowHigh + p + [0x00, 0x00])
-        packet = [self.BROADCAST] + pl + [self.INSTR_SYNC_WRITE, addr] + lengthLowHigh + p
-        return self.send(packet)
+        self._begin(self.BROADCAST, self.INSTR_SYNC_WRITE, 2 + len(values) * (1 + length))
+        self._putInt(addr, 1)
+        self._putInt(length, 1)
+        for ID, value in values if ids is None else zip(ids, values):
+            self._putInt(ID, 1)
+            self._putData(value, length)
+        return (yield)
 
 
 class Protocol2(Protocol):
-    _instance = None
-    initialized = False
     VERSION = "2.0"
 
     INSTR_PING = 0x01
@@ -348,18 +819,19 @@ class Protocol2(Protocol):
     # HEADER ID LENGTH INSTR ERR PARAM CRC
 
     HEADERS = [0xFF, 0xFF, 0xFD]
+    PARSER = StatusParser2
+    ID_INDEX = 4
+    INSTRUCTION_INDEX = 7
+    ERROR_INDEX = 8
+    STATUS_LENGTH = 11
+    MAX_ID = 252
+    # the reference SDK gives every ID 3 ms to answer a broadcast ping
+    PING_SLOT_NS = 3_000_000
     RESERVED = [0x00]
     LENGTH_PLACEHOLDER = [0x00, 0x00]
 
-    def __new__(cls, *args, **kwargs):
-        if not cls._instance:
-            cls._instance = super().__new__(cls)
-        return cls._instance
-
     def __init__(self, *args, **kwargs):
-        if not self.initialized:
-            super().__init__(*args, **kwargs)
-        self.initialized = True
+        super().__init__(*args, **kwargs)
         self.STATUS_ERRORS = [
             None,
             Error.ERR_RESULT_FAIL,
@@ -371,40 +843,51 @@ class Protocol2(Protocol):
             Error.ERR_ACCESS_ERROR,
         ]
 
+    def statusErrors(self, err: int):
+        """Decode an error byte, an error number in bits 0-6 and the hardware alert in bit 7
+
+        The alert means HARDWARE_ERROR_STATUS is set, the instruction itself may
+        still have succeeded.
+        """
+        if not err:
+            return Error.OK
+        errors = []
+        number = err & 0x7F
+        if number:
+            if number < len(self.STATUS_ERRORS):
+                errors.append(self.STATUS_ERRORS[number])
+            else:
+                errors.append(Error.ERR_RESULT_FAIL)
+        if err & 0x80:
+            errors.append(Error.ERR_HARDWARE_ALERT)
+        return errors
+
     @classmethod
     def checksum(cls, packet: list) -> list:
-        crc_accum = 0
-        crc_table = []
-        polynomial = 0x8005  # CRC-16-ANSI (x^16 + x^15 + x^2 + 1)
-
-        for i in range(256):
-            crc = i << 8  # Start with the value of the byte shifted to the left by 8 bits
-            for j in range(8):  # For each bit in the byte
-                if crc & 0x8000:  # If the highest bit is set
-                    crc = (crc << 1) ^ polynomial  # Shift left and XOR with the polynomial
-                else:
-                    crc <<= 1  # Just shift left
-                crc &= 0xFFFF  # Ensure we keep it within 16 bits
-            crc_table.append(crc)
-
-        for j in range(0, len(packet) - 2):
-            i = ((crc_accum >> 8) ^ packet[j]) & 0xFF
-            crc_accum = ((crc_accum << 8) ^ crc_table[i]) & 0xFFFF
-        return list(crc_accum.to_bytes(2, "little"))
+        # the last two entries are the CRC placeholder and are not part of the sum
+        return list(crc16(packet, 0, len(packet) - 2).to_bytes(2, "little"))
 
     def packetLength(self, packet: list) -> list:
         return self._packetLength(packet, 2)
 
-    def addStuffing(self, packet: list) -> list:
-        padIndices = []
-        for i in range(len(packet)):
-            j = packet[i : i + 4]
-            if len(j) == 4 and j[:3] == self.HEADERS and j[3] != 0xFD:
-                padIndices.append(i + 3 + len(padIndices))
-            elif len(j) == 3 and j == self.HEADERS:
-                padIndices.append(i + 3 + len(padIndices))
-        for padIndex in padIndices:
-            packet.insert(padIndex, 0xFD)
+    @staticmethod
+    def addStuffing(packet: list) -> list:
+        """Stuff an extra 0xFD after every FF FF FD in ``packet``, in place
+
+        One pass over the packet, the same stuffing ``_putInt`` and ``_putBytes``
+        apply while encoding, so data that is already FF FF FD FD is stuffed too.
+        """
+        out = []
+        run = 0
+        for byte in packet:
+            out.append(byte)
+            if byte == 0xFF:
+                run += 1
+            else:
+                if byte == 0xFD and run >= 2:
+                    out.append(0xFD)
+                run = 0
+        packet[:] = out
         return packet
 
     def updateLength(self, packet: list) -> list:
@@ -416,137 +899,184 @@ class Protocol2(Protocol):
     def addHeaders(self, packet: list) -> list:
         return self.HEADERS + self.RESERVED + packet
 
-    def addChecksum(self, packet: list) -> list:
-        return packet + self.checksum(packet + [0x00, 0x00])
+    @staticmethod
+    def addChecksum(packet: list) -> list:
+        return packet + list(crc16(packet).to_bytes(2, "little"))
 
-    def send(self, packet: list) -> Response:
+    @staticmethod
+    def maxPacketLength(paramLength: int) -> int:
+        """Worst case size of an instruction packet carrying ``paramLength`` params
+
+        At most every third param completes a header and gets an FD stuffed
+        after it, so the buffer reserved up front never has to grow while the
+        params are written.
+        """
+        return 10 + paramLength + paramLength // 3
+
+    def _begin(self, ID: int, instr: int, paramLength: int = 0, responseLength: int = 0):
+        """Start a new instruction packet in the transmit buffer
+
+        Unless ``ID`` is the broadcast ID one status packet carrying
+        ``responseLength`` params is expected back.
+
+        HEADER HEADER HEADER RESERVED ID LENGTH_LOW LENGTH_HIGH INSTR PARAM... CRC_LOW CRC_HIGH
+        """
+        size = self.maxPacketLength(paramLength)
+        if size > len(self._tx):
+            self._allocate(size)
+        buf = self._tx
+        buf[0] = 0xFF
+        buf[1] = 0xFF
+        buf[2] = 0xFD
+        buf[3] = 0x00
+        buf[4] = ID
+        buf[7] = instr
+        self._txLength = 8
+        self._expectNothing()
+        if ID != self.BROADCAST:
+            self._expect(ID, self.STATUS_LENGTH + responseLength)
+
+    def _putInt(self, value: int, length: int):
+        buf = self._tx
+        n = self._txLength
+        for _ in range(length):
+            byte = value & 0xFF
+            value >>= 8
+            buf[n] = byte
+            n += 1
+            # stuffing only applies from the instruction onwards, index 7
+            if byte == 0xFD and n > 10 and buf[n - 2] == 0xFF and buf[n - 3] == 0xFF:
+                buf[n] = 0xFD
+                n += 1
+        self._txLength = n
+
+    def _putBytes(self, data, start: int = 0):
+        buf = self._tx
+        n = self._txLength
+        for i in range(start, len(data)):
+            byte = data[i]
+            buf[n] = byte
+            n += 1
+            if byte == 0xFD and n > 10 and buf[n - 2] == 0xFF and buf[n - 3] == 0xFF:
+                buf[n] = 0xFD
+                n += 1
+        self._txLength = n
+
+    def _putData(self, data, length: int):
+        if isinstance(data, int):
+            self._putInt(data, length)
+        else:
+            self._putBytes(data)
+
+    def _finish(self):
+        buf = self._tx
+        n = self._txLength
+        # Length is the instruction + params (stuffed) + CRC
+        length = n - 5
+        buf[5] = length & 0xFF
+        buf[6] = length >> 8
+        crc = crc16(buf, 0, n)
+        buf[n] = crc & 0xFF
+        buf[n + 1] = crc >> 8
+        self._txLength = n + 2
+
+    @transaction
+    def send(self, packet: list, expected: int = 1) -> Response:
         """Transmission Process
 
-        1. Generate basic packet structure including required parameters.
-        2. Apply Byte Stuffing to ensure that packets are processed successfully.
+        Thin wrapper for packets built as lists in the
+        ``[ID, LENGTH_LOW, LENGTH_HIGH, INSTR, PARAM...]`` format.
+
+        1. Copy the packet into the transmit buffer after the headers.
+        2. Apply Byte Stuffing to the params as they are copied.
         3. Update packet length to include any stuffed bytes.
         4. Calculate final CRC with byte stuffing applied.
         """
-        packet = self.addStuffing(packet)
-        packet = self.addHeaders(packet)
-        packet = self.updateLength(packet)
-        packet = self.addChecksum(packet)
-        # Packet at this point matches the official sdk
-        with self.lock:
-            self.tx_enable.value = True
-            time.sleep(0.01)
-            self.uart.write(bytes(packet))
-            self.tx_enable.value = False
-            time.sleep(0.01)
-            res = self.receive()
-            self.uart.reset_input_buffer()
-        return res
+        self._begin(packet[0], packet[3], len(packet) - 4)
+        self._putBytes(packet, 4)
+        if expected != self._expected:
+            self._expectNothing()
+            for _ in range(expected):
+                self._expect(packet[0], self.STATUS_LENGTH)
+        return (yield)
 
     def validationErrors(self, packet: list):
-        crc = self.checksum(packet[:-2] + [0x00, 0x00])
-        if crc != packet[-2:]:
+        crc = crc16(packet, 0, len(packet) - 2)
+        if crc != packet[-2] | packet[-1] << 8:
             return Error.ERR_RX_CRC_MISMATCH
-        err = packet[8]
-        if err:
-            return [
-                self.STATUS_ERRORS[i] for i, c in enumerate(reversed(str(bin(err))[2:])) if int(c)
-            ]
-        return Error.OK
+        return self.statusErrors(packet[8])
 
-    def receive(self) -> Response:
-        length = 0
-        # read in HEADER HEADER HEADER RESERVED ID LENGTH_LOW LENGTH_HIGH 55 ERR CRC_LOW CRC_HIGH
-        packet = self.uart.read(self.uart.in_waiting)
-
-        # uncomment the following to see the actual hex, the status packet instr is 55
-        # but will show up in list(packet) as 85 which is just confusing. You can also
-        # capture the send and receive in the dynamixel wizard if you plug on cable into
-        # a u2d2 and select View > Packet
-        # tp = [f'0x{i:02X}'for i in packet]
-        # print(f'raw response: {tp}')
-
-        if packet is None:
-            return Response(None, Error.ERR_RX_TIMEOUT)
-        else:
-            packet = list(packet)
-        if packet[:3] == self.HEADERS:
-            low, high = packet[5 : 6 + 1]
-            length = int.from_bytes(bytes([low, high]), "little")
-            if length + 7 == len(packet) and not self.uart.in_waiting:
-                return Response(packet, self.validationErrors(packet))
-            if length < len(packet):
-                headers = []
-                for i in range(len(packet)):
-                    j = packet[i : i + 4]
-                    if len(j) == 4 and j[:3] == self.HEADERS and j[3] != 0xFD:
-                        headers.append(i)
-                if not self.uart.in_waiting:
-                    packets = [
-                        packet[headers[i] : (headers[i + 1] if i + 1 < len(headers) else None)]
-                        for i in range(len(headers))
-                    ]
-                    return Response(packets, [self.validationErrors(packet) for packet in packets])
-            else:
-                toRead = 11 - (length + 1)  # plus one because length include the instruction
-                t = self.uart.read(toRead)
-                if t is None:
-                    return Response(t, Error.ERR_RX_FAILED_TO_RX_ENTIRE_PACKET)
-                packet += list(t)
-                if self.uart.in_waiting:
-                    t = self.uart.read(self.uart.in_waiting)
-                packet += list(t)
-                return Response(packet, self.validationErrors(packet))
-        for i in range(len(packet)):
-            j = packet[i : i + 4]
-            if len(j) == 4 and j[:3] == self.HEADERS and j[3] != 0xFD:
-                break
-        else:
-            if not self.uart.in_waiting:
-                return Response(packet, Error.ERR_RX_NO_RESPONSE)
-            packet = list(self.uart.read(self.uart.in_waiting))
-        if packet:
-            return Response(packet, self.validationErrors(packet))
+    @transaction
+    def ping(self, ID: int) -> Response:
+        self._begin(ID, self.INSTR_PING, 0, 3)
+        return (yield)
 
-        return Response(None, Error.ERR_RX_ERROR)
+    @transaction
+    def broadcastPing(self) -> Response:
+        """Ping every ID at once, every servo on the bus answers in ID order
 
-    def ping(self, ID: int) -> Response:
-        length = self.packetLength([self.INSTR_PING, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_PING]
-        return self.send(packet)
+        Replies are collected for as long as it takes all possible IDs to answer,
+        one slot per ID of its status packet and return delay but at least
+        ``PING_SLOT_NS``, about 0.76 s at 1 Mbps.
 
+        res.data == {1: (1060, 52), 2: (1060, 52)}, the model number and firmware
+        version of each servo that answered. ``res.err`` maps each of them to its status.
+        """
+        self._begin(self.BROADCAST, self.INSTR_PING)
+        ids = self.MAX_ID + 1
+        self._expected = ids
+        self._expectedLength = ids * (self.STATUS_LENGTH + 3)
+        # the wire time of the status packets is added to this for the deadline
+        timing = self.timing
+        statusNs = timing.wireTimeNs(self.STATUS_LENGTH + 3)
+        self._returnDelayNs = sum(
+            max(timing.returnDelayNs(ID), self.PING_SLOT_NS - statusNs) for ID in range(ids)
+        )
+        self._window = True
+        res = yield
+        data = {}
+        errs = {}
+        if isinstance(res.data, list):
+            start = self.ERROR_INDEX + 1
+            for packet, err in zip(res.data, res.err):
+                if err == Error.ERR_RX_CRC_MISMATCH:
+                    continue
+                ID = packet[self.ID_INDEX]
+                errs[ID] = err
+                data[ID] = (packet[start] | packet[start + 1] << 8, packet[start + 2])
+        return Response(data, errs)
+
+    @transaction
     def read(self, ID: int, addr: int, length: int) -> Response:
-        addrLowHigh = list(addr.to_bytes(2, "little"))
-        lengthLowHigh = list(length.to_bytes(2, "little"))
-        pl = self.packetLength([self.INSTR_READ] + addrLowHigh + lengthLowHigh + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_READ] + addrLowHigh + lengthLowHigh
-        res = self.send(packet)
+        self._begin(ID, self.INSTR_READ, 4, length)
+        self._putInt(addr, 2)
+        self._putInt(length, 2)
+        res = yield
         if not res.ok:
             return res
         data = int.from_bytes(bytes(res.data[9:-2]), "little")
         return Response(data, Error.OK)
 
+    @transaction
     def write(self, ID: int, addr: int, length: int, data: int) -> Response:
-        addrLowHigh = list(addr.to_bytes(2, "little"))
-        if not isinstance(data, list):
-            dataLowHigh = list(data.to_bytes(length, "little"))
-        else:
-            dataLowHigh = data
-        pl = self.packetLength([self.INSTR_WRITE] + addrLowHigh + dataLowHigh + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_WRITE] + addrLowHigh + dataLowHigh
-        return self.send(packet)
+        self._begin(ID, self.INSTR_WRITE, 2 + length)
+        self._putInt(addr, 2)
+        self._putData(data, length)
+        return (yield)
 
+    @transaction
     def regWrite(self, ID: int, addr: int, length: int, data: int) -> Response:
-        addrLowHigh = list(addr.to_bytes(2, "little"))
-        dataLowHigh = list(data.to_bytes(length, "little"))
-        pl = self.packetLength([self.INSTR_REG_WRITE] + addrLowHigh + dataLowHigh + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_REG_WRITE] + addrLowHigh + dataLowHigh
-        return self.send(packet)
+        self._begin(ID, self.INSTR_REG_WRITE, 2 + length)
+        self._putInt(addr, 2)
+        self._putData(data, length)
+        return (yield)
 
+    @transaction
     def action(self, ID: int) -> Response:
-        length = self.packetLength([self.INSTR_ACTION, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_ACTION]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_ACTION)
+        return (yield)
 
+    @transaction
     def factoryReset(
         self,
         ID: int,
@@ -563,113 +1093,183 @@ class Protocol2(Protocol):
             p = 0x02
         else:
             return 0
-        length = self.packetLength([self.INSTR_FACTORY_RESET, p, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_FACTORY_RESET, p]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_FACTORY_RESET, 1)
+        self._putInt(p, 1)
+        return (yield)
 
+    @transaction
     def reboot(self, ID: int) -> Response:
-        length = self.packetLength([self.INSTR_REBOOT, 0x00, 0x00])
-        packet = [ID] + length + [self.INSTR_REBOOT]
-        return self.send(packet)
+        self._begin(ID, self.INSTR_REBOOT)
+        return (yield)
 
+    @transaction
     def clear(self, ID: int, position: bool = False, error: bool = False) -> Response:
         p = 0x00
         if position:
             p = 0x01
-            d = [0x44, 0x58, 0x4C, 0x22]
+            d = 0x224C5844  # "DXL" 0x22
         elif error:
             p = 0x02
-            d = [0x45, 0x52, 0x43, 0x4C]
+            d = 0x4C435245  # "ERCL"
         else:
             return 0
-        pl = self.packetLength([self.INSTR_CLEAR, p] + d + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_CLEAR, p] + d
-        return self.send(packet)
+        self._begin(ID, self.INSTR_CLEAR, 5)
+        self._putInt(p, 1)
+        self._putInt(d, 4)
+        return (yield)
 
+    @transaction
     def controlTableBackup(self, ID: int, store: bool = False, restore: bool = False) -> Response:
         p = 0x00
         if store:
-            p = [0x01, 0x43, 0x54, 0x52, 0x4C]
+            p = 0x01
         elif restore:
-            p = [0x02, 0x43, 0x54, 0x52, 0x4C]
+            p = 0x02
         else:
             return Response(None, "ERR_REQUIRES_STORE_OR_RESTORE")
-        pl = self.packetLength([self.INSTR_CONTROL_TABLE_BACKUP] + p + [0x00, 0x00])
-        packet = [ID] + pl + [self.INSTR_CONTROL_TABLE_BACKUP] + p
-        return self.send(packet)
-
-    def syncRead(self, addr: int, length: int, ids: list) -> Response:
-        addrLowHigh = list(addr.to_bytes(2, "little"))
-        lengthLowHigh = list(length.to_bytes(2, "little"))
-        pl = self.packetLength(
-            [self.INSTR_SYNC_READ] + addrLowHigh + lengthLowHigh + ids + [0x00, 0x00]
-        )
-        packet = [self.BROADCAST] + pl + [self.INSTR_SYNC_READ] + addrLowHigh + lengthLowHigh + ids
-        return self.send(packet)
+        self._begin(ID, self.INSTR_CONTROL_TABLE_BACKUP, 5)
+        self._putInt(p, 1)
+        self._putInt(0x4C525443, 4)  # "CTRL"
+        return (yield)
+
+    @transaction
+    def syncRead(self, addr: int, length: int, ids: list, asBytes: bool = False) -> Response:
+        """
+        Example call: p.syncRead(132, 4, [1, 2])
+        read 4 bytes at 132 from motors 1 and 2, res.data == {1: 2048, 2: 1024}
 
-    def syncWrite(self, addr: int, length: int, values: list) -> Response:
+        ``res.data`` maps each ID to its value and ``res.err`` each ID to its status.
+        Spans longer than 4 bytes, or any span when ``asBytes`` is set, come back as
+        bytes so they can be split into fields.
+        """
+        self._begin(self.BROADCAST, self.INSTR_SYNC_READ, 4 + len(ids))
+        self._putInt(addr, 2)
+        self._putInt(length, 2)
+        self._putBytes(ids)
+        for ID in ids:
+            self._expect(ID, self.STATUS_LENGTH + length)
+        lengths = {}
+        for ID in ids:
+            lengths[ID] = length
+        return self._decodeStatus((yield), lengths, asBytes)
+
+    @transaction
+    def syncWrite(self, addr: int, length: int, values: list, ids: list = None) -> Response:
         """
         Example call: p.syncWrite(116, 4, [(1, 150), (2, 170)])
         set value at 116 which is 4 bytes to 150 for motor 1 and 170 to motor 2
-        """
-        p = []
-        for ID, value in values:
-            p.append(ID)
-            p.extend(list(value.to_bytes(length, "little")))
-        addrLowHigh = list(addr.to_bytes(2, "little"))
-        lengthLowHigh = list(length.to_bytes(2, "little"))
-        pl = self.packetLength(
-            [self.INSTR_SYNC_WRITE] + addrLowHigh + lengthLowHigh + p + [0x00, 0x00]
-        )
-        packet = [self.BROADCAST] + pl + [self.INSTR_SYNC_WRITE] + addrLowHigh + lengthLowHigh + p
-        return self.send(packet)
-
-    def fastSyncRead(self, addr: int, length: int, ids: list) -> Response:
-        addrLowHigh = list(addr.to_bytes(2, "little"))
-        lengthLowHigh = list(length.to_bytes(2, "little"))
-        pl = self.packetLength(
-            [self.INSTR_FAST_SYNC_READ] + addrLowHigh + lengthLowHigh + ids + [0x00, 0x00]
-        )
-        packet = (
-            [self.BROADCAST] + pl + [self.INSTR_FAST_SYNC_READ] + addrLowHigh + lengthLowHigh + ids
-        )
-        return self.send(packet)
 
-    def bulkRead(self, values: list) -> Response:
+        With ``ids`` the values are a column in the same order, e.g. an array:
+        p.syncWrite(116, 4, array("l", [150, 170]), ids=[1, 2])
         """
-        Example call: p.bulkRead(116, 4, [(1, 150), (2, 170)])
-        set value at 116 which is 4 bytes to 150 for motor 1 and 170 to motor 2
+        self._begin(self.BROADCAST, self.INSTR_SYNC_WRITE, 4 + len(values) * (1 + length))
+        self._putInt(addr, 2)
+        self._putInt(length, 2)
+        for ID, value in values if ids is None else zip(ids, values):
+            self._putInt(ID, 1)
+            self._putData(value, length)
+        return (yield)
+
+    @transaction
+    def fastSyncRead(self, addr: int, length: int, ids: list, asBytes: bool = False) -> Response:
+        """Same as syncRead but every servo answers in one shared status packet
+
+        HEADER ID=0xFE LENGTH 55 [ERR ID DATA CRC]... where the last servo's CRC
+        covers the whole frame. Returns the same ID keyed Response as syncRead.
+        """
+        self._begin(self.BROADCAST, self.INSTR_FAST_SYNC_READ, 4 + len(ids))
+        self._putInt(addr, 2)
+        self._putInt(length, 2)
+        self._putBytes(ids)
+        # one frame, each servo adds ERR ID DATA and the CRC slot to it
+        packets = 1
+        for ID in ids:
+            self._expect(ID, 4 + length, packets)
+            packets = 0
+        self._expectedLength += 8
+        lengths = {}
+        for ID in ids:
+            lengths[ID] = length
+        return self._decodeFastStatus((yield), ids, lengths, asBytes)
+
+    @transaction
+    def bulkRead(self, values: list, asBytes: bool = False) -> Response:
+        """
+        Example call: p.bulkRead([(1, 132, 4), (2, 146, 1)])
+        read 4 bytes at 132 from motor 1 and 1 byte at 146 from motor 2,
+        res.data == {1: 2048, 2: 35}
         """
-        p = []
+        self._begin(self.BROADCAST, self.INSTR_BULK_READ, 5 * len(values))
+        lengths = {}
         for ID, addr, length in values:
-            p.append(ID)
-            p.extend(list(addr.to_bytes(2, "little")))
-            p.extend(list(length.to_bytes(2, "little")))
-        pl = self.packetLength([self.INSTR_BULK_READ] + p + [0x00, 0x00])
-        packet = [self.BROADCAST] + pl + [self.INSTR_BULK_READ] + p
-        return self.send(packet)
-
+            self._putInt(ID, 1)
+            self._putInt(addr, 2)
+            self._putInt(length, 2)
+            self._expect(ID, self.STATUS_LENGTH + length)
+            lengths[ID] = length
+        return self._decodeStatus((yield), lengths, asBytes)
+
+    @transaction
     def bulkWrite(self, values: list) -> Response:
-        p = []
+        paramLength = 0
+        for _, _, length, _ in values:
+            paramLength += 5 + length
+        self._begin(self.BROADCAST, self.INSTR_BULK_WRITE, paramLength)
         for ID, addr, length, data in values:
-            p.append(ID)
-            p.extend(list(addr.to_bytes(2, "little")))
-            p.extend(list(length.to_bytes(2, "little")))
-            p.extend(list(data.to_bytes(length, "little")))
-        pl = self.packetLength([self.INSTR_BULK_WRITE] + p + [0x00, 0x00])
-        packet = [self.BROADCAST] + pl + [self.INSTR_BULK_WRITE] + p
-        return self.send(packet)
-
-    def fastBulkRead(self, values: list) -> Response:
+            self._putInt(ID, 1)
+            self._putInt(addr, 2)
+            self._putInt(length, 2)
+            self._putData(data, length)
+        return (yield)
+
+    @transaction
+    def fastBulkRead(self, values: list, asBytes: bool = False) -> Response:
         """
-        Example call: p.bulkRead(116, 4, [(1, 150), (2, 170)])
-        set value at 116 which is 4 bytes to 150 for motor 1 and 170 to motor 2
+        Example call: p.fastBulkRead([(1, 132, 4), (2, 146, 1)])
+        read 4 bytes at 132 from motor 1 and 1 byte at 146 from motor 2,
+        res.data == {1: 2048, 2: 35}
         """
-        p = []
+        self._begin(self.BROADCAST, self.INSTR_FAST_BULK_READ, 5 * len(values))
+        ids = []
+        lengths = {}
+        packets = 1
         for ID, addr, length in values:
-            p.append(ID)
-            p.extend(list(addr.to_bytes(2, "little")))
-            p.extend(list(length.to_bytes(2, "little")))
-        pl = self.packetLength([self.INSTR_FAST_BULK_READ] + p + [0x00, 0x00])
-        packet = [self.BROADCAST] + pl + [self.INSTR_FAST_BULK_READ] + p
-        return self.send(packet)
+            self._putInt(ID, 1)
+            self._putInt(addr, 2)
+            self._putInt(length, 2)
+            # one frame like fastSyncRead, each servo adds ERR ID DATA CRC
+            self._expect(ID, 4 + length, packets)
+            packets = 0
+            ids.append(ID)
+            lengths[ID] = length
+        self._expectedLength += 8
+        return self._decodeFastStatus((yield), ids, lengths, asBytes)
+
+    def _decodeFastStatus(self, res: Response, ids: list, lengths: dict, asBytes: bool):
+        """Split a fast sync/bulk read frame into an ID keyed Response
+
+        The blocks come back in the order the IDs were sent which is the only way
+        to know how long each block is when the lengths differ.
+        """
+        data = {}
+        errs = {}
+        for ID in ids:
+            errs[ID] = Error.ERR_RX_NO_RESPONSE
+        if res.data is None:
+            return Response(data, errs)
+        if res.err == Error.ERR_RX_CRC_MISMATCH:
+            # one CRC covers every servo so none of the data can be trusted
+            for ID in ids:
+                errs[ID] = res.err
+            return Response(data, errs)
+        packet = res.data
+        end = len(packet)
+        i = self.ERROR_INDEX
+        for ID in ids:
+            length = lengths[ID]
+            if i + 2 + length > end or packet[i + 1] != ID:
+                break
+            errs[ID] = self.statusErrors(packet[i])
+            data[ID] = _decode(packet[i + 2 : i + 2 + length], asBytes or length > 4)
+            i += length + 4
+        return Response(data, errs)
@@ -5,7 +5,10 @@
 
 from collections import namedtuple
 
-from dynamixel.protocol import Protocol1, Protocol2, Response
+from dynamixel import utils
+from dynamixel.cache import ShadowCache, provenance
+from dynamixel.planner import ReadPlan
+from dynamixel.protocol import Error, Protocol1, Protocol2, Response
 
 
 class units:
@@ -18,6 +21,9 @@ class units:
     BAUD = 6
 
 
+UNITS = [value for key, value in units.__dict__.items() if not key.startswith("_")]
+
+
 class ControlTableItem:
     def __init__(self, address, length, writable, limits=None, defaultUnit=units.RAW):
         self.address = address
@@ -30,6 +36,154 @@ class ControlTableItem:
         yield from [self.address, self.length, self.writable, self.limits, self.defaultUnit]
 
 
+class Codec:
+    """Straight line encoder and decoder of one control table item of one servo model
+
+    Compiled once per item when the model's accessors are generated, see
+    ``Servo.compileCodecs``. Decoding sign extends the raw value and scales it
+    to a unit, encoding scales, checks the limits and masks the value to the
+    item's length. There is one function per unit in ``decoders`` and
+    ``encoders``.
+
+    :param ct: The control table item
+    :param servo: Servo class the item belongs to
+    """
+
+    def __init__(self, ct: ControlTableItem, servo):
+        self.length = ct.length
+        self.limits = ct.limits
+        self.defaultUnit = ct.defaultUnit
+        self.signed = servo.SIGNED
+        resolution = servo.resolution
+        self._factors = {
+            units.DEGREE: 360 / resolution if resolution else None,
+            units.VOLTAGE: 0.1,
+            units.RPM: servo._rpm,
+            units.BAUD: None,
+        }
+        self.decoders = {unit: self._decoder(unit, servo) for unit in UNITS}
+        self.encoders = {unit: self._encoder(unit, servo) for unit in UNITS}
+
+    def decode(self, raw: int, unit: int = None):
+        return self.decoders[self.defaultUnit if unit is None else unit](raw)
+
+    def encode(self, value, unit: int = None) -> int:
+        return self.encoders[self.defaultUnit if unit is None else unit](value)
+
+    def factor(self, unit: int = None):
+        """What a raw value is multiplied by to get ``unit``, None if that isn't a scale"""
+        return self._factors.get(self.defaultUnit if unit is None else unit, 1)
+
+    def decodeMany(self, payload, unit: int = None, offset: int = 0) -> list:
+        """Decode the values of several servos at once, e.g. a sync read payload
+
+        :param payload: Raw values in order, ints or byte blocks as returned with
+            ``asBytes=True``, for a dict the values are taken in ID order
+        :param offset: Position of the item in each block when a span was read
+        """
+        if isinstance(payload, dict):
+            payload = [payload[ID] for ID in sorted(payload)]
+        decode = self.decoders[self.defaultUnit if unit is None else unit]
+        end = offset + self.length
+        mask = (1 << (8 * self.length)) - 1
+        shift = 8 * offset
+        values = []
+        for raw in payload:
+            if isinstance(raw, int):
+                values.append(decode((raw >> shift) & mask))
+            else:
+                values.append(decode(int.from_bytes(raw[offset:end], "little")))
+        return values
+
+    def _decoder(self, unit: int, servo):
+        width = 8 * self.length
+        sign = 1 << (width - 1) if servo.SIGNED else 0
+        full = 1 << width
+        resolution = servo.resolution
+        rpm = servo._rpm
+        bauds = servo.bauds
+        if unit == units.DEGREE:
+
+            def decode(raw):
+                if raw & sign:
+                    raw -= full
+                return int((raw / resolution) * 360)
+
+        elif unit == units.VOLTAGE:
+
+            def decode(raw):
+                if raw & sign:
+                    raw -= full
+                return raw / 10
+
+        elif unit == units.RPM:
+
+            def decode(raw):
+                if raw & sign:
+                    raw -= full
+                return raw * rpm
+
+        elif unit == units.BAUD:
+
+            def decode(raw):
+                return bauds[raw]
+
+        elif sign:
+
+            def decode(raw):
+                if raw & sign:
+                    raw -= full
+                return raw
+
+        else:
+
+            def decode(raw):
+                return raw
+
+        return decode
+
+    def _encoder(self, unit: int, servo):
+        mask = (1 << (8 * self.length)) - 1
+        limits = self.limits
+        choices = limits if isinstance(limits, list) else None
+        low, high = limits if isinstance(limits, tuple) else (None, None)
+        resolution = servo.resolution
+        rpm = servo._rpm
+        indices = {baud: index for index, baud in servo.bauds.items()}
+
+        def check(raw):
+            if choices is not None:
+                assert raw in choices, f"{raw} should be one of {choices}"
+            elif low is not None:
+                assert low <= raw <= high, f"{raw} should be within {low} and {high}"
+            return raw & mask
+
+        if unit == units.DEGREE:
+
+            def encode(value):
+                return check(int((value / 360) * resolution))
+
+        elif unit == units.VOLTAGE:
+
+            def encode(value):
+                return check(int(value * 10))
+
+        elif unit == units.RPM:
+
+            def encode(value):
+                return check(int(value / rpm))
+
+        elif unit == units.BAUD:
+
+            def encode(value):
+                return check(indices[value])
+
+        else:
+            encode = check
+
+        return encode
+
+
 class controlTable:
     @classmethod
     def items(cls):
@@ -42,48 +196,107 @@ class controlTable:
 class Servo:
     CONTROL_TABLE = controlTable
     UNITS = units
+    # value of the MODEL_NUMBER register
+    MODEL = None
+    # registers hold two's complement values
+    SIGNED = False
+    # Codec of every ControlTableItem, see compileCodecs
+    CODECS = {}
+    # position steps per revolution, size of one velocity step in RPM and the
+    # baud rates keyed by the value of the BAUD register
+    resolution = None
+    _rpm = 1
+    bauds = {}
+    # baud rate the servo ships with
+    DEFAULT_BAUD = None
+    # versions of the protocol the servo can be set to speak, as in Protocol.VERSION
+    PROTOCOLS = ("1.0", "2.0")
+    # Contiguous control table spans read by Bus.poll as (first item, last item, every).
+    # A span is read on every ``every``th poll.
+    STATUS_BLOCKS = ()
 
     def __init__(self, name: str, servo_id: int, **kwargs):
         self.name = name
         self._id = servo_id
         self.protocol: Protocol1 | Protocol2 = None
-        self.resolution = None
-        self.bauds = {}
-        self._rpm = 1
+        self.unit = None
+        self.status = {}
+        # the last status packet polled had the hardware alert bit set
+        self.hardwareAlert = False
+        self.cache: ShadowCache = None
+        self.batch = None
         _ = kwargs
 
+    @property
+    def id(self) -> int:
+        return self._id
+
+    @classmethod
+    def compileCodecs(cls) -> dict:
+        """Build the Codec of every control table item, done once per model"""
+        cls.CODECS = {ct: Codec(ct, cls) for _, ct in cls.CONTROL_TABLE.items()}
+        return cls.CODECS
+
     def convertUnits(self, raw: int, unit: int) -> int:
+        if unit == units.DEGREE:
+            return int((raw / 360) * self.resolution)
+        if unit == units.VOLTAGE:
+            return int(raw * 10)
         if unit == units.BAUD:
-            inverseBauds = {v: k for k, v in self.bauds.items()}
-        else:
-            inverseBauds = {}
-
-        unitMap = {
-            units.DEGREE: lambda raw: int((raw / 360) * self.resolution),
-            units.VOLTAGE: lambda raw: int(raw * 10),
-            units.BAUD: lambda raw: inverseBauds[raw],
-            units.RPM: lambda raw: self._rpm * raw,
-        }
-        return unitMap.get(unit, lambda raw: raw)(raw)
+            for index, baud in self.bauds.items():
+                if baud == raw:
+                    return index
+            raise KeyError(raw)
+        if unit == units.RPM:
+            return int(raw / self._rpm)
+        return raw
 
     def convertRaw(self, raw: int, unit: int) -> int:
-        unitMap = {
-            units.DEGREE: lambda raw: int((raw / self.resolution) * 360),
-            units.VOLTAGE: lambda raw: raw / 10,
-            units.BAUD: lambda raw: self.bauds[raw],
-            units.RPM: lambda raw: raw / self._rpm,
-        }
-        return unitMap.get(unit, lambda raw: raw)(raw)
+        if unit == units.DEGREE:
+            return int((raw / self.resolution) * 360)
+        if unit == units.VOLTAGE:
+            return raw / 10
+        if unit == units.BAUD:
+            return self.bauds[raw]
+        if unit == units.RPM:
+            return raw * self._rpm
+        return raw
+
+    def enableCache(self, maxAge: float = None) -> ShadowCache:
+        """Shadow the control table so redundant writes and EEPROM reads are skipped
+
+        :param maxAge: Seconds a cached EEPROM value may be served for, None for no limit
+        """
+        # the EEPROM area ends where TORQUE_ENABLE starts on every Dynamixel
+        ct = getattr(self.CONTROL_TABLE, "TORQUE_ENABLE", None)
+        self.cache = ShadowCache(ct.address if ct is not None else 0, maxAge)
+        return self.cache
 
     def read(self, address: int, length: int) -> Response:
-        return self.protocol.read(self._id, address, length)
+        res = self.protocol.read(self._id, address, length)
+        if self.cache is not None and not res.ok:
+            self.cache.invalidate()
+        return res
 
     def write(self, address: int, length: int, *args) -> Response:
-        return self.protocol.write(self._id, address, length, *args)
+        res = self.protocol.write(self._id, address, length, *args)
+        if self.cache is not None:
+            if res.ok:
+                self.cache.discard(address, length)
+            else:
+                self.cache.invalidate()
+        return res
 
     def reboot(self):
+        if self.cache is not None:
+            self.cache.invalidate()
         self.protocol.reboot(self._id)
 
+    def factoryReset(self, **kwargs) -> Response:
+        if self.cache is not None:
+            self.cache.invalidate()
+        return self.protocol.factoryReset(self._id, **kwargs)
+
     def clear(self, position: bool = False, error: bool = False):
         if isinstance(self.protocol, Protocol2):
             self.protocol.clear(self._id, position=position, error=error)
@@ -94,11 +307,69 @@ class Servo:
         res = self.protocol.ping(self._id)
         return res
 
-    def readControlTableItem(self, address, size) -> Response:
-        return self.read(address, size)
+    def decodeControlTableItem(self, ct: ControlTableItem, raw: int, unit: int = None):
+        """Turn the raw register value of ``ct`` into a signed value in ``unit``"""
+        return self.CODECS[ct].decode(raw, self.unit if unit is None else unit)
+
+    def updateStatus(self, values: dict):
+        """Take decoded control table values keyed by item name, e.g. from Bus.poll"""
+        self.status.update(values)
+        if "PRESENT_POSITION" in values:
+            self.presentPosition = values["PRESENT_POSITION"]
+        if "MOVING" in values:
+            self.moving = bool(values["MOVING"])
+        if "TORQUE_ENABLE" in values:
+            self.torqueEnabled = bool(values["TORQUE_ENABLE"])
+
+    def readItems(self, *names: str) -> Response:
+        """Read several control table items in as few reads as possible
+
+        res = m.readItems("PRESENT_VELOCITY", "PRESENT_POSITION")
+        res.data == {"PRESENT_VELOCITY": 0, "PRESENT_POSITION": 2048}
+        """
+        res = ReadPlan({self: names}).execute()
+        return Response(res.data[self._id], res.err[self._id])
+
+    def readControlTableItem(self, address, size, maxAge: float = None) -> Response:
+        """Read an item, static items come from the cache when it is enabled
+
+        :param maxAge: Overrides the cache's staleness bound for this read
+        """
+        cache = self.cache
+        if cache is not None:
+            raw = cache.lookup(address, size, maxAge)
+            if raw is not None:
+                return Response(raw, Error.OK)
+        res = self.read(address, size)
+        if res.ok:
+            self._trackReturnDelay(address, res.data)
+            if cache is not None:
+                cache.store(address, size, res.data, provenance.READ)
+        return res
 
     def writeControlTableItem(self, address, size, data) -> Response:
-        return self.write(address, size, data)
+        if self.batch is not None:
+            # sent when the batch closes, see WriteBatch
+            self.batch.add(self, address, size, data)
+            return Response(None, Error.OK)
+        cache = self.cache
+        if cache is not None and cache.unchanged(address, size, data):
+            return Response(None, Error.OK)
+        res = self.write(address, size, data)
+        if res.ok:
+            self._written(address, size, data)
+        return res
+
+    def _written(self, address, size, data):
+        self._trackReturnDelay(address, data)
+        if self.cache is not None and isinstance(data, int):
+            self.cache.store(address, size, data, provenance.WRITE)
+
+    def _trackReturnDelay(self, address, raw):
+        # keep the bus timing in step with the servo so reply deadlines stay tight
+        ct = getattr(self.CONTROL_TABLE, "RETURN_DELAY_TIME", None)
+        if ct is not None and address == ct.address:
+            self.protocol.timing.setReturnDelayTime(self._id, raw)
 
     def ping(self):
         res = self.protocol.ping(self.id)
@@ -106,10 +377,12 @@ class Servo:
 
     @classmethod
     def convertToNegative(cls, value, length):
-        _ = length
+        if cls.SIGNED and value < 0:
+            return value + (1 << (8 * length))
         return value
 
     @classmethod
     def convertFromNegative(cls, value, length):
-        _ = length
+        if cls.SIGNED:
+            return utils.twosComplement(value, length)
         return value
@@ -0,0 +1,527 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import random
+import time
+
+from .crc import crc16
+from .transport import _NoPin
+
+BROADCAST = 0xFE
+
+# Protocol 2.0 status error numbers
+ERR2_INSTRUCTION = 0x02
+ERR2_CRC = 0x03
+ERR2_DATA_LIMIT = 0x06
+ERR2_ACCESS = 0x07
+ERR2_ALERT = 0x80
+
+# Protocol 1.0 status error bits
+ERR1_RANGE = 0x08
+ERR1_CHECKSUM = 0x10
+ERR1_INSTRUCTION = 0x40
+
+
+def _stuff(data) -> bytearray:
+    out = bytearray()
+    for byte in data:
+        out.append(byte)
+        if byte == 0xFD and len(out) >= 3 and out[-2] == 0xFF and out[-3] == 0xFF:
+            out.append(0xFD)
+    return out
+
+
+def _unstuff(data) -> bytearray:
+    out = bytearray()
+    i = 0
+    while i < len(data):
+        out.append(data[i])
+        if len(out) >= 3 and out[-3:] == b"\xff\xff\xfd" and i + 1 < len(data):
+            if data[i + 1] == 0xFD:
+                i += 1
+        i += 1
+    return out
+
+
+def _le(data, start: int, length: int) -> int:
+    return int.from_bytes(bytes(data[start : start + length]), "little")
+
+
+class SimServo:
+    """Control table and behaviour of one simulated servo
+
+    The memory is laid out from the device class's ``CONTROL_TABLE``. Writes are
+    checked against the items' writable flags and limits the way the firmware
+    does and a GOAL_POSITION written with torque on is reached immediately.
+
+    :param cls: Device class, e.g. XL430_W250_T
+    :param ID: Servo ID
+    :param values: Raw register values to start from keyed by item name. A servo
+        started without a BAUD value hears the bus at any baud rate
+    """
+
+    def __init__(self, cls, ID: int, values: dict = None):
+        self.cls = cls
+        self.table = dict(cls.CONTROL_TABLE.items())
+        end = max(ct.address + ct.length for ct in self.table.values())
+        ram = self.table.get("TORQUE_ENABLE")
+        self.ramStart = ram.address if ram is not None else end
+        self.defaults = {
+            "MODEL_NUMBER": cls.MODEL or 0,
+            "ID": ID,
+            "RETURN_DELAY_TIME": 250,
+            "STATUS_RETURN_LEVEL": 2,
+        }
+        self.defaults.update(values or {})
+        self.fixedBaud = "BAUD" in self.defaults
+        self.memory = bytearray(end)
+        self.registered = None
+        self.alert = False
+        self.factoryReset(0xFF)
+
+    @property
+    def id(self) -> int:
+        return self.memory[self.table["ID"].address]
+
+    def get(self, name: str) -> int:
+        ct = self.table[name]
+        return _le(self.memory, ct.address, ct.length)
+
+    def set(self, name: str, value: int):
+        ct = self.table[name]
+        self.memory[ct.address : ct.address + ct.length] = value.to_bytes(ct.length, "little")
+
+    def hears(self, baudRate: int) -> bool:
+        """Whether the servo is set to ``baudRate``"""
+        return not self.fixedBaud or self.cls.bauds.get(self.get("BAUD")) == baudRate
+
+    def returnDelayNs(self) -> int:
+        return self.get("RETURN_DELAY_TIME") * 2000
+
+    def statusLevel(self) -> int:
+        ct = self.table.get("STATUS_RETURN_LEVEL")
+        return 2 if ct is None else self.memory[ct.address]
+
+    def read(self, address: int, length: int):
+        if address + length > len(self.memory):
+            return None
+        return bytes(self.memory[address : address + length])
+
+    def write(self, address: int, data) -> bool:
+        """Write raw bytes, False if any item in the span can't take them"""
+        end = address + len(data)
+        if end > len(self.memory):
+            return False
+        torque = self.table.get("TORQUE_ENABLE")
+        for name, ct in self.table.items():
+            if ct.address < address or ct.address + ct.length > end:
+                continue
+            if not ct.writable:
+                return False
+            if ct.address < self.ramStart and torque and self.memory[torque.address]:
+                # EEPROM is locked while torque is on
+                return False
+            value = _le(data, ct.address - address, ct.length)
+            if not self._allowed(ct, value):
+                return False
+        self.memory[address:end] = data
+        self._update(address, end)
+        return True
+
+    @staticmethod
+    def _allowed(ct, value: int) -> bool:
+        limits = ct.limits
+        if isinstance(limits, list):
+            return value in limits
+        if isinstance(limits, tuple):
+            low, high = limits
+            if low < 0 and value >= 1 << (8 * ct.length - 1):
+                value -= 1 << (8 * ct.length)
+            return low <= value <= high
+        return True
+
+    def _update(self, start: int, end: int):
+        goal = self.table.get("GOAL_POSITION")
+        present = self.table.get("PRESENT_POSITION")
+        if goal is None or present is None or not start < goal.address + goal.length <= end:
+            return
+        if self.get("TORQUE_ENABLE"):
+            self.memory[present.address : present.address + present.length] = self.memory[
+                goal.address : goal.address + present.length
+            ]
+
+    def reboot(self):
+        """RAM goes back to its defaults, EEPROM is kept"""
+        self.memory[self.ramStart :] = bytes(len(self.memory) - self.ramStart)
+        for name, value in self.defaults.items():
+            if self.table[name].address >= self.ramStart:
+                self.set(name, value)
+        self.registered = None
+
+    def factoryReset(self, keep: int):
+        """:param keep: 0x01 keeps the ID, 0x02 keeps the ID and baud, 0xFF nothing"""
+        saved = {}
+        for name in ("ID", "BAUD")[: {0x01: 1, 0x02: 2}.get(keep, 0)]:
+            saved[name] = self.get(name)
+        self.memory[:] = bytes(len(self.memory))
+        for name, value in self.defaults.items():
+            self.set(name, value)
+        for name, value in saved.items():
+            self.set(name, value)
+        self.registered = None
+
+
+class SimBus:
+    """In process Dynamixel bus that behaves like a transport
+
+    Hand it to a protocol in place of a UART::
+
+        bus = SimBus(2, baudRate=4000000)
+        bus.add(SimServo(XL430_W250_T, 1))
+        protocol = Protocol2(transport=bus)
+
+    Replies only become readable once they would have arrived on a real bus: after
+    the instruction's wire time, each servo's Return Delay Time and the wire time of
+    the reply itself, so measured throughput and latency follow the baud rate.
+    Servos answer a broadcast ping in turn, ID n no earlier than n ``pingSlotNs``
+    after the ping. Faults are injected at random with a seeded generator so runs
+    are repeatable.
+
+    :param version: Protocol version spoken on the bus, 1 or 2
+    :param baudRate: Baud rate of the bus
+    :param crcErrors: Chance a status packet has a corrupted checksum
+    :param drops: Chance a byte of a status packet is lost
+    :param late: Chance a status packet is held back by ``lateNs``
+    :param lateNs: How much later a late status packet arrives
+    :param seed: Seed for the fault generator
+    :param pingSlotNs: Time each ID is given to answer a broadcast ping, 3 ms as
+        the reference SDK allows
+    """
+
+    def __init__(
+        self,
+        version: int = 2,
+        baudRate: int = 1000000,
+        *,
+        crcErrors: float = 0,
+        drops: float = 0,
+        late: float = 0,
+        lateNs: int = 10_000_000,
+        seed: int = 0,
+        pingSlotNs: int = 3_000_000,
+    ):
+        self.version = version
+        self.baudrate = baudRate
+        self.crcErrors = crcErrors
+        self.drops = drops
+        self.late = late
+        self.lateNs = lateNs
+        self.random = random.Random(seed)
+        self.pingSlotNs = pingSlotNs
+        self.direction = _NoPin()
+        self.servos = {}
+        self.instructions = 0
+        self._in = bytearray()
+        self._replies = []
+        self._ready = bytearray()
+
+    def add(self, servo: SimServo) -> SimServo:
+        self.servos[servo.id] = servo
+        return servo
+
+    def byteTimeNs(self) -> int:
+        return 10 * 1_000_000_000 // self.baudrate
+
+    def _listener(self, ID: int):
+        """The servo with ``ID`` if it's set to the bus's baud rate, otherwise None"""
+        servo = self.servos.get(ID)
+        if servo is not None and servo.hears(self.baudrate):
+            return servo
+        return None
+
+    # transport
+
+    def write(self, data) -> int:
+        now = time.monotonic_ns()
+        self._in += data
+        start = now + len(data) * self.byteTimeNs()
+        while True:
+            packet = self._nextPacket()
+            if packet is None:
+                break
+            self.instructions += 1
+            start = self._respond(packet, start)
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        self._arrive()
+        return len(self._ready)
+
+    def readinto(self, buf) -> int:
+        self._arrive()
+        n = min(len(buf), len(self._ready))
+        if not n:
+            return None
+        buf[:n] = self._ready[:n]
+        del self._ready[:n]
+        return n
+
+    def reset_input_buffer(self):
+        self._arrive()
+        self._ready = bytearray()
+
+    def _arrive(self):
+        """Move bytes whose time has come from the pending replies to the input"""
+        now = time.monotonic_ns()
+        byteTime = self.byteTimeNs()
+        while self._replies:
+            start, data = self._replies[0]
+            n = min(len(data), max(0, (now - start) // byteTime))
+            if not n:
+                return
+            self._ready += data[:n]
+            if n == len(data):
+                self._replies.pop(0)
+                continue
+            self._replies[0] = (start + n * byteTime, data[n:])
+            return
+
+    # instruction packets
+
+    def _nextPacket(self):
+        """Split the next complete instruction packet off the input, None if there isn't one"""
+        buf = self._in
+        header = b"\xff\xff\xfd\x00" if self.version == 2 else b"\xff\xff"
+        i = buf.find(header)
+        if i < 0:
+            del buf[: max(0, len(buf) - len(header) + 1)]
+            return None
+        del buf[:i]
+        if self.version == 2:
+            if len(buf) < 7:
+                return None
+            end = 7 + _le(buf, 5, 2)
+        else:
+            if len(buf) < 4:
+                return None
+            end = 4 + buf[3]
+        if len(buf) < end:
+            return None
+        packet = bytes(buf[:end])
+        del buf[:end]
+        return packet
+
+    def _respond(self, packet: bytes, start: int) -> int:
+        """Queue the replies to ``packet`` from ``start`` on and return when they end"""
+        if self.version == 2:
+            ID = packet[4]
+            valid = crc16(packet[:-2]) == _le(packet, len(packet) - 2, 2)
+            instr = packet[7]
+            params = _unstuff(packet[8:-2])
+        else:
+            ID = packet[2]
+            valid = ~sum(packet[2:-1]) & 0xFF == packet[-1]
+            instr = packet[4]
+            params = packet[5:-1]
+        if not valid:
+            servo = self._listener(ID)
+            if servo is None:
+                return start
+            err = ERR2_CRC if self.version == 2 else ERR1_CHECKSUM
+            return self._queue(start, [(servo, self._status(servo, err))])
+        replies = self._execute(ID, instr, params)
+        if ID == BROADCAST and instr == 0x01:
+            end = start
+            for servo, reply in replies:
+                end = self._queue(max(end, start + servo.id * self.pingSlotNs), [(servo, reply)])
+            return end
+        return self._queue(start, replies)
+
+    def _queue(self, start: int, replies: list) -> int:
+        byteTime = self.byteTimeNs()
+        if self._replies:
+            # the wire is still busy with a reply that hasn't finished arriving
+            last, sent = self._replies[-1]
+            start = max(start, last + len(sent) * byteTime)
+        for servo, status in replies:
+            start += servo.returnDelayNs()
+            if self.late and self.random.random() < self.late:
+                start += self.lateNs
+            data = bytearray(status)
+            if data and self.crcErrors and self.random.random() < self.crcErrors:
+                data[-1] ^= 0xFF
+            if self.drops:
+                data = bytearray(b for b in data if self.random.random() >= self.drops)
+            self._replies.append((start, data))
+            start += len(data) * byteTime
+        return start
+
+    def _status(self, servo: SimServo, err: int, params: bytes = b"") -> bytes:
+        if self.version == 1:
+            body = bytes((servo.id, len(params) + 2, err)) + params
+            return b"\xff\xff" + body + bytes((~sum(body) & 0xFF,))
+        if servo.alert:
+            err |= ERR2_ALERT
+        body = _stuff(bytes((0x55, err)) + params)
+        packet = b"\xff\xff\xfd\x00" + bytes((servo.id,)) + (len(body) + 2).to_bytes(2, "little")
+        packet += body
+        return packet + crc16(packet).to_bytes(2, "little")
+
+    @staticmethod
+    def _fastStatus(blocks: list) -> list:
+        """One frame carrying ``(servo, err, data)`` blocks, the last CRC is the frame's
+
+        Returned as one ``(servo, bytes)`` segment per servo, each servo sends its
+        own part of the frame after its return delay.
+        """
+        body = bytearray((0x55,))
+        ends = []
+        for i, (servo, err, data) in enumerate(blocks):
+            alert = ERR2_ALERT if servo.alert else 0
+            body += bytes((err | alert, servo.id)) + data
+            if i < len(blocks) - 1:
+                body += crc16(body).to_bytes(2, "little")
+            ends.append(len(body))
+        stuffed = bytearray()
+        cuts = []
+        for i, byte in enumerate(body):
+            stuffed += _stuff(stuffed[-2:] + bytes((byte,)))[min(2, len(stuffed)) :]
+            if i + 1 in ends:
+                cuts.append(len(stuffed))
+        length = (len(stuffed) + 2).to_bytes(2, "little")
+        packet = b"\xff\xff\xfd\x00\xfe" + length + stuffed
+        packet += crc16(packet).to_bytes(2, "little")
+        segments = []
+        start = 0
+        for (servo, _, _), cut in zip(blocks, cuts):
+            end = 7 + cut if servo is not blocks[-1][0] else len(packet)
+            segments.append((servo, packet[start:end]))
+            start = end
+        return segments
+
+    @staticmethod
+    def _answers(servo: SimServo, instr: int) -> bool:
+        level = servo.statusLevel()
+        if instr == 0x01:
+            return True
+        if instr == 0x02:
+            return level >= 1
+        return level >= 2
+
+    def _execute(self, ID: int, instr: int, params: bytes) -> list:
+        """Run an instruction and return the replies as [(servo, bytes)]"""
+        v2 = self.version == 2
+        wide = 2 if v2 else 1
+        errRange = ERR2_DATA_LIMIT if v2 else ERR1_RANGE
+        errAccess = ERR2_ACCESS if v2 else ERR1_RANGE
+
+        if instr in {0x82, 0x83, 0x8A, 0x92, 0x93, 0x9A}:
+            return self._executeMulti(instr, params)
+
+        if ID == BROADCAST:
+            targets = [self._listener(i) for i in sorted(self.servos)]
+            targets = [servo for servo in targets if servo is not None]
+        elif self._listener(ID) is not None:
+            targets = [self.servos[ID]]
+        else:
+            return []
+        replies = []
+        for servo in targets:
+            err = 0
+            data = b""
+            if instr == 0x01:
+                if v2:
+                    model = servo.get("MODEL_NUMBER").to_bytes(2, "little")
+                    data = model + bytes((servo.get("FIRMWARE_VERSION"),))
+            elif instr == 0x02:
+                data = servo.read(_le(params, 0, wide), _le(params, wide, wide))
+                if data is None:
+                    err, data = errAccess, b""
+            elif instr == 0x03:
+                if not servo.write(_le(params, 0, wide), params[wide:]):
+                    err = errRange
+            elif instr == 0x04:
+                servo.registered = (_le(params, 0, wide), bytes(params[wide:]))
+            elif instr == 0x05:
+                if servo.registered is not None:
+                    servo.write(*servo.registered)
+                    servo.registered = None
+            elif instr == 0x06:
+                servo.factoryReset(params[0] if params else 0xFF)
+                self.servos = {s.id: s for s in self.servos.values()}
+            elif instr == 0x08:
+                servo.reboot()
+            elif instr == 0x10 and v2:
+                present = servo.table.get("PRESENT_POSITION")
+                if present is not None and params[:1] == b"\x01":
+                    servo.set("PRESENT_POSITION", servo.get("PRESENT_POSITION") % 4096)
+            else:
+                err = ERR2_INSTRUCTION if v2 else ERR1_INSTRUCTION
+            # only pings are answered when broadcast, Protocol 2.0 only
+            if ID == BROADCAST and not (instr == 0x01 and v2):
+                continue
+            if self._answers(servo, instr):
+                replies.append((servo, self._status(servo, err, data)))
+        return replies
+
+    def _executeMulti(self, instr: int, params: bytes) -> list:
+        v2 = self.version == 2
+        wide = 2 if v2 else 1
+        replies = []
+        if instr == 0x83:
+            # SYNC_WRITE: ADDR LEN (ID DATA)...
+            address = _le(params, 0, wide)
+            length = _le(params, wide, wide)
+            for i in range(2 * wide, len(params), length + 1):
+                servo = self._listener(params[i])
+                if servo is not None:
+                    servo.write(address, params[i + 1 : i + 1 + length])
+            return replies
+        if instr == 0x93:
+            # BULK_WRITE: (ID ADDR LEN DATA)...
+            i = 0
+            while i + 5 <= len(params):
+                length = _le(params, i + 3, 2)
+                servo = self._listener(params[i])
+                if servo is not None:
+                    servo.write(_le(params, i + 1, 2), params[i + 5 : i + 5 + length])
+                i += 5 + length
+            return replies
+
+        reads = []
+        if instr in {0x82, 0x8A}:
+            # SYNC_READ: ADDR LEN ID...
+            address = _le(params, 0, 2)
+            length = _le(params, 2, 2)
+            reads = [(ID, address, length) for ID in params[4:]]
+        elif instr in {0x92, 0x9A} and v2:
+            reads = [
+                (params[i], _le(params, i + 1, 2), _le(params, i + 3, 2))
+                for i in range(0, len(params) - 4, 5)
+            ]
+        elif instr == 0x92:
+            # Protocol 1.0 BULK_READ: 0x00 (LEN ID ADDR)...
+            reads = [
+                (params[i + 1], params[i + 2], params[i]) for i in range(1, len(params) - 2, 3)
+            ]
+        blocks = []
+        for ID, address, length in reads:
+            servo = self._listener(ID)
+            if servo is None:
+                if instr in {0x8A, 0x9A}:
+                    # the chain of a fast read breaks at the first missing servo
+                    break
+                continue
+            data = servo.read(address, length)
+            err = 0
+            if data is None:
+                err, data = (ERR2_ACCESS if v2 else ERR1_RANGE), bytes(length)
+            blocks.append((servo, err, data))
+        if instr in {0x8A, 0x9A}:
+            return self._fastStatus(blocks) if blocks else replies
+        for servo, err, data in blocks:
+            replies.append((servo, self._status(servo, err, data)))
+        return replies
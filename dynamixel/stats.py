@@ -0,0 +1,164 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from collections import namedtuple
+
+# One finished transaction as handed to the export callback. Times are in ns,
+# ``errors`` is the list of error codes of the reply, empty when all went well.
+Transaction = namedtuple(
+    "Transaction",
+    ("instruction", "ID", "txBytes", "rxBytes", "wireNs", "waitNs", "parseNs", "errors"),
+)
+
+_TIMEOUTS = ("ERR_RX_TIMEOUT", "ERR_RX_NO_RESPONSE", "ERR_RX_FAILED_TO_RX_ENTIRE_PACKET")
+
+
+class Histogram:
+    """Counts of values in power of two buckets, the memory used never grows
+
+    Bucket ``i`` holds values below ``2 ** i`` units, the last bucket everything
+    larger.
+
+    :param buckets: Number of buckets
+    :param unit: Size of one unit, 1000 to bucket nanoseconds by the microsecond
+    """
+
+    def __init__(self, buckets: int = 20, unit: int = 1000):
+        self.unit = unit
+        self.counts = [0] * buckets
+        self.count = 0
+        self.total = 0
+        self.max = 0
+
+    def add(self, value: int):
+        counts = self.counts
+        i = min((value // self.unit).bit_length(), len(counts) - 1)
+        counts[i] += 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0
+
+    def percentile(self, p: float) -> int:
+        """Upper bound of the bucket holding the ``p`` th percentile, in the value's units"""
+        target = self.count * p / 100
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if n and seen >= target:
+                return min(self.unit << i, self.max)
+        return 0
+
+    def export(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "max": self.max,
+            "p50": self.percentile(50),
+            "p99": self.percentile(99),
+            "buckets": list(self.counts),
+        }
+
+
+class Counters:
+    """Everything recorded for one instruction or one servo"""
+
+    def __init__(self):
+        self.transactions = 0
+        self.txBytes = 0
+        self.rxBytes = 0
+        self.crcErrors = 0
+        self.timeouts = 0
+        self.statusErrors = 0
+        self.wire = Histogram()
+        self.wait = Histogram()
+        self.parse = Histogram()
+
+    def export(self) -> dict:
+        return {
+            "transactions": self.transactions,
+            "txBytes": self.txBytes,
+            "rxBytes": self.rxBytes,
+            "crcErrors": self.crcErrors,
+            "timeouts": self.timeouts,
+            "statusErrors": self.statusErrors,
+            "wireNs": self.wire.export(),
+            "waitNs": self.wait.export(),
+            "parseNs": self.parse.export(),
+        }
+
+
+class BusStats:
+    """Per instruction and per servo counters of one bus, see Protocol.enableStats
+
+    :param names: Instruction names keyed by instruction byte, for ``export``
+    :param callback: Called with a Transaction after every transaction
+    """
+
+    def __init__(self, names: dict = None, callback=None):
+        self.names = names or {}
+        self.callback = callback
+        self.instructions = {}
+        self.servos = {}
+
+    @staticmethod
+    def _counters(table: dict, key: int) -> Counters:
+        counters = table.get(key)
+        if counters is None:
+            counters = table[key] = Counters()
+        return counters
+
+    @staticmethod
+    def _count(counters: Counters, errors: list):
+        for err in errors:
+            if err == "ERR_RX_CRC_MISMATCH":
+                counters.crcErrors += 1
+            elif err in _TIMEOUTS:
+                counters.timeouts += 1
+            else:
+                counters.statusErrors += 1
+
+    def record(self, t: Transaction, replies: list, missing: list):
+        """
+        :param t: The transaction as a whole
+        :param replies: (ID, length, errors) for every status packet received
+        :param missing: IDs that were expected to answer but didn't
+        """
+        counters = self._counters(self.instructions, t.instruction)
+        counters.transactions += 1
+        counters.txBytes += t.txBytes
+        counters.rxBytes += t.rxBytes
+        counters.wire.add(t.wireNs)
+        counters.wait.add(t.waitNs)
+        counters.parse.add(t.parseNs)
+        self._count(counters, t.errors)
+        for ID, length, errors in replies:
+            counters = self._counters(self.servos, ID)
+            counters.transactions += 1
+            counters.rxBytes += length
+            self._count(counters, errors)
+        for ID in missing:
+            counters = self._counters(self.servos, ID)
+            counters.transactions += 1
+            counters.timeouts += 1
+        if self.callback is not None:
+            self.callback(t)
+
+    def reset(self):
+        self.instructions = {}
+        self.servos = {}
+
+    def export(self) -> dict:
+        names = self.names
+        return {
+            "instructions": {
+                names.get(instr, hex(instr)): c.export() for instr, c in self.instructions.items()
+            },
+            "servos": {ID: c.export() for ID, c in self.servos.items()},
+        }
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+# time.sleep only has millisecond resolution on most boards so anything
+# shorter than this is spun out on time.monotonic_ns instead
+_SPIN_NS = 2_000_000
+
+
+def waitUntil(deadline: int):
+    """Block until ``time.monotonic_ns()`` reaches ``deadline``"""
+    remaining = deadline - time.monotonic_ns()
+    if remaining > _SPIN_NS:
+        time.sleep((remaining - _SPIN_NS // 2) / 1e9)
+    while time.monotonic_ns() < deadline:
+        pass
+
+
+class BusTiming:
+    """Half duplex timing derived from the baud rate
+
+    The direction pin is held for exactly as long as the packet takes to leave the
+    wire and a reply is only waited for as long as it takes the servos to start
+    answering and the expected status packets to come back. All of the settings
+    are per bus so each protocol gets its own.
+
+    :param baudRate: Baud rate of the bus
+    :param bitsPerByte: Start + data + stop bits, 10 for 8N1
+    :param setupTime: Seconds to hold the direction pin before writing
+    :param returnDelay: Seconds a servo waits before answering, the servo's
+        RETURN_DELAY_TIME register (2 us per unit, 500 us by default). Servos
+        that have been configured differently can be set with ``setReturnDelayTime``
+    :param margin: Extra seconds allowed for UART latency and scheduling jitter
+    """
+
+    def __init__(
+        self,
+        baudRate: int = 1000000,
+        bitsPerByte: int = 10,
+        setupTime: float = 0,
+        returnDelay: float = 0.0005,
+        margin: float = 0.002,
+    ):
+        self.bitsPerByte = bitsPerByte
+        self.setupTime = setupTime
+        self.returnDelay = returnDelay
+        self.margin = margin
+        self.returnDelays = {}
+        self.baudRate = baudRate
+
+    @property
+    def baudRate(self) -> int:
+        return self._baudRate
+
+    @baudRate.setter
+    def baudRate(self, baudRate: int):
+        self._baudRate = baudRate
+        self.byteTimeNs = self.bitsPerByte * 1_000_000_000 // baudRate
+
+    def wireTimeNs(self, length: int) -> int:
+        """Nanoseconds it takes ``length`` bytes to go out on the wire"""
+        return length * self.byteTimeNs
+
+    def setReturnDelayTime(self, ID: int, raw: int):
+        """Record the RETURN_DELAY_TIME register value of a servo, 2 us per unit"""
+        self.returnDelays[ID] = raw * 2000
+
+    def returnDelayNs(self, ID: int) -> int:
+        delay = self.returnDelays.get(ID)
+        if delay is None:
+            return int(self.returnDelay * 1_000_000_000)
+        return delay
+
+    def responseTimeNs(self, length: int, returnDelayNs: int) -> int:
+        """Nanoseconds from releasing the bus until a reply should be complete
+
+        :param length: Total bytes of every status packet expected back
+        :param returnDelayNs: Sum of the return delays of the servos answering
+        """
+        return returnDelayNs + self.wireTimeNs(length) + int(self.margin * 1_000_000_000)
+
+    def waitSetup(self):
+        if self.setupTime:
+            waitUntil(time.monotonic_ns() + int(self.setupTime * 1_000_000_000))
+
+    def waitTransmitted(self, start: int, length: int):
+        """Wait for the last stop bit of a write that started at ``start``
+
+        UART writes usually return as soon as the bytes are queued so the
+        direction pin can't be released until the wire time has passed. If the
+        write already blocked for that long this returns immediately.
+        """
+        waitUntil(start + self.wireTimeNs(length))
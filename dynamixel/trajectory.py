@@ -0,0 +1,324 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+from dynamixel.control import LoopStats
+from dynamixel.group import ServoGroup
+from dynamixel.protocol import Error
+from dynamixel.timing import waitUntil
+
+
+class Trajectory:
+    """Positions of several joints over time, linear between each joint's waypoints
+
+    Before its first and after its last waypoint a joint holds still. Anything with
+    a ``duration`` in seconds and a ``sample(t)`` returning one position per joint
+    can be played instead, e.g. a spline evaluated ahead of time, and with a
+    ``times()`` listing its segment ends it can be played as profile segments too.
+
+    :param joints: Waypoints of each joint in the order of the servos, a list of
+        (seconds, position) sorted by time. Joints needn't share waypoint times
+    """
+
+    def __init__(self, joints):
+        self.joints = []
+        for waypoints in joints:
+            if not waypoints:
+                raise ValueError("every joint needs at least one waypoint")
+            times = [t for t, _ in waypoints]
+            positions = [p for _, p in waypoints]
+            for i in range(1, len(times)):
+                if times[i] < times[i - 1]:
+                    raise ValueError("waypoints should be sorted by time")
+            self.joints.append((times, positions))
+        self.duration = max(times[-1] for times, _ in self.joints)
+        # index of the waypoint each joint was last sampled after
+        self._cursors = [0] * len(self.joints)
+
+    @classmethod
+    def fromWaypoints(cls, waypoints):
+        """Trajectory from waypoints that set every joint, (seconds, [position, ...])"""
+        n = len(waypoints[0][1])
+        return cls([[(t, positions[i]) for t, positions in waypoints] for i in range(n)])
+
+    def times(self) -> list:
+        """Every waypoint time of any joint, sorted"""
+        return sorted({t for times, _ in self.joints for t in times})
+
+    def sample(self, t: float) -> list:
+        """Position of every joint at ``t`` seconds
+
+        Sampling forward in time is a step per waypoint passed, not a search.
+        """
+        cursors = self._cursors
+        out = []
+        for j, (times, positions) in enumerate(self.joints):
+            i = cursors[j]
+            if times[i] > t:
+                i = 0
+            last = len(times) - 1
+            while i < last and times[i + 1] <= t:
+                i += 1
+            cursors[j] = i
+            if i == last or t <= times[i]:
+                out.append(positions[i])
+            else:
+                t0 = times[i]
+                p0 = positions[i]
+                out.append(p0 + (positions[i + 1] - p0) * (t - t0) / (times[i + 1] - t0))
+        return out
+
+
+class TrajectoryPlayer:
+    """Stream a trajectory to a group of servos with one sync write per sample
+
+    Every joint gets its goal from the same packet so they all start together.
+    The trajectory is sampled at ``rate`` and the sync write of each sample is
+    encoded and built ``prefetch`` samples ahead, in the time left over after a
+    cycle, so at each tick the bus only has prebuilt bytes to send. The goal goes
+    out in the same turn of the bus as a sync read of ``feedback``, whose
+    difference to the sample is the tracking error::
+
+        trajectory = Trajectory.fromWaypoints([(0, [0, 90]), (1, [90, 0]), (2, [0, 90])])
+        player = TrajectoryPlayer(legs, trajectory, 100, unit=units.DEGREE)
+        player.play()
+        player.rmsErrors()
+
+    With ``profile`` the servos interpolate instead. There is one sync write per
+    segment between waypoint times, setting PROFILE_ACCELERATION, PROFILE_VELOCITY
+    and GOAL_POSITION at once, and the servos must be set to the time-based profile
+    (bit 2 of DRIVE_MODE) so these are the segment's acceleration time and duration
+    in ms. That takes far fewer packets, at the cost of errors only being tracked
+    at waypoints. The trajectory needs a ``times()`` then, and no segment can take
+    longer than the registers hold, 32.767 s on the XL430.
+
+    A sample whose tick has passed before it could be sent is skipped and counted
+    as a miss so the motion keeps to time. The last sample is always sent.
+
+    :param servos: Servos of the same class sharing one protocol, one per joint
+    :param trajectory: Trajectory or anything with ``duration`` and ``sample(t)``
+    :param rate: Samples per second, unused with ``profile``
+    :param unit: Unit of the trajectory, the goal item's default unit when None
+    :param goal: Item the samples are written to
+    :param feedback: Item read back to track the error, in ``unit``
+    :param readEvery: Read ``feedback`` every this many samples, never when 0
+    :param prefetch: Number of packets built ahead
+    :param profile: Play the trajectory as profile segments between waypoint times
+    :param accel: Share of each profile segment spent accelerating, and decelerating
+    :param fast: Read with FAST_SYNC_READ on Protocol 2.0 buses
+    """
+
+    def __init__(
+        self,
+        servos,
+        trajectory,
+        rate: float = 100,
+        *,
+        unit: int = None,
+        goal: str = "GOAL_POSITION",
+        feedback: str = "PRESENT_POSITION",
+        readEvery: int = 1,
+        prefetch: int = 4,
+        profile: bool = False,
+        accel: float = 0.25,
+        fast: bool = True,
+    ):
+        servos = list(servos)
+        cls = type(servos[0])
+        table = cls.CONTROL_TABLE
+        ct = getattr(table, goal)
+        codec = cls.CODECS[ct]
+        if unit is None:
+            unit = codec.defaultUnit
+        self.group = ServoGroup(servos, ((feedback, unit),), fast=fast)
+        self.protocol = self.group.protocol
+        self.trajectory = trajectory
+        self.goal = goal
+        self.feedback = feedback
+        self.unit = unit
+        self.readEvery = readEvery
+        self.profile = profile
+        self.accel = accel
+        # raw units take whole numbers, the scaled ones are truncated by the codec
+        self._whole = codec.factor(unit) == 1
+        if profile:
+            acceleration = getattr(table, "PROFILE_ACCELERATION", None)
+            velocity = getattr(table, "PROFILE_VELOCITY", None)
+            if (
+                acceleration is None
+                or velocity is None
+                or acceleration.address + acceleration.length != velocity.address
+                or velocity.address + velocity.length != ct.address
+            ):
+                raise ValueError(f"{cls.__name__} has no profile registers right before {goal}")
+            if getattr(trajectory, "times", None) is None:
+                raise ValueError("a trajectory played as profile segments needs times()")
+            self._profile = (acceleration, cls.CODECS[acceleration], velocity, cls.CODECS[velocity])
+            self.address = acceleration.address
+            self.length = acceleration.length + velocity.length + ct.length
+            self.times = trajectory.times()
+            # duration and acceleration time of every segment in ms
+            self._segments = []
+            for start, end in zip(self.times, self.times[1:]):
+                ms = round((end - start) * 1000)
+                accelMs = round(ms * accel)
+                for name, item, value in (
+                    ("PROFILE_VELOCITY", velocity, ms),
+                    ("PROFILE_ACCELERATION", acceleration, accelMs),
+                ):
+                    if isinstance(item.limits, tuple) and not (
+                        item.limits[0] <= value <= item.limits[1]
+                    ):
+                        raise ValueError(
+                            f"the segment from {start} s to {end} s needs {name} {value}, "
+                            f"{cls.__name__} takes {item.limits[0]} to {item.limits[1]} ms"
+                        )
+                self._segments.append((ms, accelMs))
+            self.count = len(self.times)
+            self.periodNs = None
+            meanNs = int(trajectory.duration * 1_000_000_000 / max(self.count - 1, 1))
+        else:
+            self.address = ct.address
+            self.length = ct.length
+            self.times = None
+            self.periodNs = meanNs = int(1_000_000_000 / rate)
+            self.count = int(trajectory.duration * rate) + 1
+        depth = max(1, min(prefetch, self.count))
+        self._packets = [None] * depth
+        self._targets = [None] * depth
+        self._built = 0
+        self.stats = LoopStats(meanNs)
+        self.running = False
+        self.resetErrors()
+
+    def resetErrors(self):
+        n = len(self.group)
+        self.errors = [0] * n
+        self.maxErrors = [0] * n
+        self._squares = [0] * n
+        self._samples = [0] * n
+
+    def rmsErrors(self) -> list:
+        """Root mean square tracking error of every joint, in ``unit``"""
+        return [(s / n) ** 0.5 if n else 0 for s, n in zip(self._squares, self._samples)]
+
+    def _offsetNs(self, k: int) -> int:
+        """Time of sample ``k`` from the start, in ns"""
+        if self.times is None:
+            return k * self.periodNs
+        return int(self.times[k] * 1_000_000_000)
+
+    def _positions(self, t: float) -> list:
+        positions = self.trajectory.sample(t)
+        if self._whole:
+            positions = [round(p) for p in positions]
+        return positions
+
+    def _build(self, k: int):
+        """Sample ``k`` and the packet sending it, into its slot of the ring"""
+        slot = k % len(self._packets)
+        if self.times is None:
+            targets = self._positions(k * self.periodNs / 1_000_000_000)
+            goals = self.group.encode(self.goal, targets, self.unit)
+            packet = self.protocol.build(
+                "syncWrite", self.address, self.length, goals, self.group.ids
+            )
+        else:
+            start = self.times[k]
+            targets = self._positions(start)
+            packet = None
+            if k + 1 < self.count:
+                end = self.times[k + 1]
+                goals = self.group.encode(self.goal, self._positions(end), self.unit)
+                acceleration, accelCodec, velocity, velocityCodec = self._profile
+                ms, accelMs = self._segments[k]
+                # acceleration time, duration and goal as one integer per servo
+                head = accelCodec.encode(accelMs)
+                head |= velocityCodec.encode(ms) << 8 * acceleration.length
+                shift = 8 * (acceleration.length + velocity.length)
+                values = [head | raw << shift for raw in goals]
+                packet = self.protocol.build(
+                    "syncWrite", self.address, self.length, values, self.group.ids
+                )
+        self._packets[slot] = packet
+        self._targets[slot] = targets
+
+    def buildAhead(self, k: int):
+        """Build every sample from ``k`` up to the depth of the ring
+
+        ``play`` does this between samples, it's only needed to drive ``step`` by hand.
+        """
+        if self._built < k:
+            self._built = k
+        end = min(k + len(self._packets), self.count)
+        while self._built < end:
+            self._build(self._built)
+            self._built += 1
+
+    def _track(self, targets: list, res):
+        present = self.group[self.feedback]
+        errors = self.errors
+        for i, ID in enumerate(self.group.ids):
+            if res.err.get(ID) != Error.OK:
+                continue
+            error = targets[i] - present[i]
+            errors[i] = error
+            if abs(error) > self.maxErrors[i]:
+                self.maxErrors[i] = abs(error)
+            self._squares[i] += error * error
+            self._samples[i] += 1
+
+    def step(self, k: int, lateNs: int = 0):
+        """Send sample ``k``, built by ``buildAhead``, and read the feedback if due"""
+        slot = k % len(self._packets)
+        packet = self._packets[slot]
+        protocol = self.protocol
+        start = time.monotonic_ns()
+        if packet is not None:
+            protocol.deferPacket(packet)
+        every = self.readEvery
+        if every and (k % every == 0 or k == self.count - 1):
+            self._track(self._targets[slot], self.group.read())
+        else:
+            protocol.sendDeferred()
+        busNs = time.monotonic_ns() - start
+        self.stats.record(lateNs, busNs, busNs)
+
+    def play(self):
+        """Play the trajectory from the start, returns once it's done or ``stop`` was called"""
+        count = self.count
+        period = self.periodNs
+        self._built = 0
+        self.buildAhead(0)
+        self.running = True
+        start = time.monotonic_ns()
+        k = 0
+        try:
+            while self.running and k < count:
+                tick = start + self._offsetNs(k)
+                waitUntil(tick)
+                self.step(k, time.monotonic_ns() - tick)
+                k += 1
+                if period is not None and k < count:
+                    late = time.monotonic_ns() - start - k * period
+                    if late > 0:
+                        missed = min(late // period + 1, count - 1 - k)
+                        self.stats.misses += missed
+                        k += missed
+                self.buildAhead(k)
+        finally:
+            self.running = False
+            self.protocol.sendDeferred()
+
+    def stop(self):
+        """Let ``play`` return after the current sample"""
+        self.running = False
+
+    def export(self) -> dict:
+        data = self.stats.export()
+        data["maxErrors"] = list(self.maxErrors)
+        data["rmsErrors"] = self.rmsErrors()
+        return data
@@ -0,0 +1,198 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+# Every transport looks like a busio.UART (write, readinto, in_waiting,
+# reset_input_buffer, baudrate) plus a ``direction`` whose ``value`` is True while
+# the host drives the half duplex bus. Protocols only ever use that much of them.
+
+try:
+    import board
+    import busio
+    import digitalio
+except (ImportError, NotImplementedError):
+    # a host without CircuitPython or Blinka, only the other transports work
+    board = None
+
+try:
+    import serial
+    import serial.rs485
+except ImportError:
+    serial = None
+
+
+class _NoPin:
+    """Direction for hardware that switches on its own"""
+
+    def __init__(self):
+        self.value = False
+
+
+class UARTTransport:
+    """CircuitPython UART with a GPIO driving the transceiver's direction
+
+    :param tx_enable: Pin that is high while transmitting, board.D2 by default
+    :param baudRate: Baud rate of the bus
+    :param tx: TX pin, board.TX by default
+    :param rx: RX pin, board.RX by default
+    :param timeout: UART read timeout in seconds
+    """
+
+    def __init__(
+        self,
+        tx_enable=None,
+        baudRate: int = 1000000,
+        tx=None,
+        rx=None,
+        timeout: int = 1,
+    ):
+        if board is None:
+            raise RuntimeError("UARTTransport needs CircuitPython or Blinka")
+        uart = busio.UART(tx or board.TX, rx or board.RX, baudrate=baudRate, timeout=timeout)
+        self.uart = uart
+        self.direction = digitalio.DigitalInOut(tx_enable or board.D2)
+        self.direction.direction = digitalio.Direction.OUTPUT
+        self.direction.value = True
+        self.write = uart.write
+        self.readinto = uart.readinto
+        self.reset_input_buffer = uart.reset_input_buffer
+
+    @property
+    def in_waiting(self) -> int:
+        return self.uart.in_waiting
+
+    @property
+    def baudrate(self) -> int:
+        return self.uart.baudrate
+
+    @baudrate.setter
+    def baudrate(self, baudRate: int):
+        self.uart.baudrate = baudRate
+
+
+class _RTSPin:
+    """Direction on the RTS line, switched from user space"""
+
+    def __init__(self, port):
+        self.port = port
+        self._value = False
+
+    @property
+    def value(self) -> bool:
+        return self._value
+
+    @value.setter
+    def value(self, value: bool):
+        if not value:
+            # the bus can't be released while bytes are still in the UART
+            self.port.flush()
+        self.port.rts = value
+        self._value = value
+
+
+class SerialTransport:
+    """pyserial port, e.g. a U2D2 or USB-RS485 adapter on a Linux host
+
+    :param port: Device name such as "/dev/ttyUSB0"
+    :param baudRate: Baud rate of the bus
+    :param direction: How the transceiver direction is switched. "auto" when the
+        adapter does it itself (U2D2, most USB-RS485 dongles), "rs485" to let the
+        kernel drive RTS with the TIOCSRS485 ioctl, "rts" to toggle RTS from here
+    :param lowLatency: Ask the driver to hand over received bytes immediately
+        instead of batching them, cuts the turnaround of FTDI adapters from 16 ms
+        to about 1 ms
+    """
+
+    def __init__(
+        self,
+        port: str,
+        baudRate: int = 1000000,
+        direction: str = "auto",
+        lowLatency: bool = True,
+    ):
+        if serial is None:
+            raise RuntimeError("SerialTransport needs pyserial")
+        self.port = serial.Serial(port, baudRate, timeout=0, write_timeout=1)
+        if direction == "rs485":
+            self.port.rs485_mode = serial.rs485.RS485Settings(
+                rts_level_for_tx=True, rts_level_for_rx=False
+            )
+            self.direction = _NoPin()
+        elif direction == "rts":
+            self.direction = _RTSPin(self.port)
+        else:
+            self.direction = _NoPin()
+        if lowLatency:
+            self.setLowLatency(port)
+        self.write = self.port.write
+        self.readinto = self.port.readinto
+        self.reset_input_buffer = self.port.reset_input_buffer
+
+    def setLowLatency(self, port: str):
+        """ASYNC_LOW_LATENCY and, for FTDI chips, a 1 ms latency timer"""
+        try:
+            self.port.set_low_latency_mode(True)
+        except (AttributeError, ValueError, OSError):
+            pass
+        name = port.rsplit("/", 1)[-1]
+        try:
+            with open(f"/sys/bus/usb-serial/devices/{name}/latency_timer", "w") as f:
+                f.write("1")
+        except OSError:
+            # not an FTDI adapter or no permission, nothing more to do
+            pass
+
+    @property
+    def in_waiting(self) -> int:
+        return self.port.in_waiting
+
+    @property
+    def baudrate(self) -> int:
+        return self.port.baudrate
+
+    @baudrate.setter
+    def baudrate(self, baudRate: int):
+        self.port.baudrate = baudRate
+
+    def close(self):
+        self.port.close()
+
+
+class LoopbackTransport:
+    """In memory bus for tests, nothing is sent anywhere
+
+    Everything written is kept in ``tx``. If a ``responder`` is given it is
+    called with each written packet and what it returns is what gets read back.
+
+    :param responder: Callable taking the written bytes and returning reply bytes
+    :param baudRate: Reported baud rate, only used for timing
+    """
+
+    def __init__(self, responder=None, baudRate: int = 1000000):
+        self.responder = responder
+        self.baudrate = baudRate
+        self.direction = _NoPin()
+        self.tx = bytearray()
+        self.rx = bytearray()
+
+    def write(self, data) -> int:
+        self.tx += data
+        if self.responder is not None:
+            self.rx += self.responder(bytes(data))
+        return len(data)
+
+    @property
+    def in_waiting(self) -> int:
+        return len(self.rx)
+
+    def readinto(self, buf) -> int:
+        n = min(len(buf), len(self.rx))
+        if not n:
+            return None
+        buf[:n] = self.rx[:n]
+        del self.rx[:n]
+        return n
+
+    def reset_input_buffer(self):
+        self.rx = bytearray()
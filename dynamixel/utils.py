@@ -3,26 +3,56 @@
 #
 # SPDX-License-Identifier: MIT
 
-import time
+try:
+    from _thread import allocate_lock, get_ident
+except ImportError:
+    allocate_lock = None
+
+    def get_ident():
+        return 0
 
 
 class Lock:
     """Simple lock to use with half duplex UART
 
-    Not "thread" safe so it should only be initialized by a singleton.
+    Backed by a real lock where threads exist so a bus can be driven from a
+    worker thread, see BusManager. Taking the lock again from the thread that
+    holds it raises RuntimeError instead of waiting forever, e.g. a blocking call
+    made while an AsyncProtocol transaction on the same bus is awaiting its reply.
     """
 
     def __init__(self):
         self.locked = False
+        self.owner = None
+        self._lock = allocate_lock() if allocate_lock else None
+        # asyncio.Lock every AsyncProtocol of the bus queues on, made by the first one
+        self.asyncLock = None
 
-    def __enter__(self):
-        while self.locked:
-            time.sleep(0.01)
+    def acquire(self, blocking: bool = True) -> bool:
+        """Take the lock, False if ``blocking`` is off and it is held, by any thread"""
+        me = get_ident()
+        if self.locked and self.owner == me:
+            if not blocking:
+                return False
+            raise RuntimeError("the bus is already in use by this thread")
+        if self._lock is not None and not self._lock.acquire(blocking):
+            return False
         self.locked = True
+        self.owner = me
+        return True
+
+    def release(self):
+        self.locked = False
+        self.owner = None
+        if self._lock is not None:
+            self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
 
     def __exit__(self, *args):
         _ = args
-        self.locked = False
+        self.release()
 
 
 def twosComplement(value: int, length: int) -> int:
@@ -0,0 +1,44 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+# Measure transactions per second at every baud rate the servo supports.
+# BAUD is an EEPROM register so torque has to be off, the servo is put back
+# on the baud rate it started at when the run finishes. benchmarks/bauds.py
+# produces the same table against the simulated bus, without hardware.
+import time
+
+from dynamixel.devices import XL430_W250_T
+
+ROUNDS = 200
+
+m = XL430_W250_T("", 1)
+m.setTorqueEnable(0)
+ct = m.CONTROL_TABLE.BAUD
+startBaud = m.protocol.timing.baudRate
+startIndex = {v: k for k, v in m.bauds.items()}[startBaud]
+
+
+def switchBaud(index):
+    m.writeControlTableItem(ct.address, ct.length, index)
+    m.protocol.setBaudRate(m.bauds[index])
+    time.sleep(0.05)
+
+
+print("baud, ping/s, read/s")
+for index, baud in sorted(m.bauds.items(), key=lambda item: item[1]):
+    switchBaud(index)
+    if not m.ping().ok:
+        print(f"{baud}, no response")
+        continue
+    results = []
+    for call in (m.ping, m.getPresentPosition):
+        start = time.monotonic_ns()
+        for _ in range(ROUNDS):
+            call()
+        elapsed = (time.monotonic_ns() - start) / 1e9
+        results.append(ROUNDS / elapsed)
+    print(f"{baud}, {results[0]:.0f}, {results[1]:.0f}")
+
+switchBaud(startIndex)
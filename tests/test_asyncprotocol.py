@@ -0,0 +1,100 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+import threading
+
+import pytest
+
+from dynamixel.asyncprotocol import AsyncProtocol
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+POSITION = XL430_W250_T.CONTROL_TABLE.PRESENT_POSITION
+
+
+def bus(baudRate: int = 1000000) -> Protocol2:
+    sim = SimBus(2, baudRate=baudRate)
+    protocol = Protocol2(transport=sim)
+    for ID in (1, 2):
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0, "PRESENT_POSITION": ID}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+    return protocol
+
+
+def test_instructions_keep_their_names():
+    assert Protocol2.syncRead.__name__ == "syncRead"
+    assert "p.syncWrite(116, 4" in Protocol2.syncWrite.__doc__
+
+
+def test_async_and_a_blocking_thread_share_a_bus():
+    protocol = bus()
+    proto = AsyncProtocol(protocol)
+    wrong = []
+
+    def worker():
+        for _ in range(200):
+            res = protocol.read(2, POSITION.address, POSITION.length)
+            if res.data != 2:
+                wrong.append((res.data, res.err))
+
+    async def reads():
+        for _ in range(200):
+            res = await proto.read(1, POSITION.address, POSITION.length)
+            if res.data != 1:
+                wrong.append((res.data, res.err))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    asyncio.run(reads())
+    thread.join()
+    assert wrong == []
+
+
+def test_blocking_call_during_an_async_transaction_raises():
+    # slow enough that the async read awaits its reply
+    protocol = bus(57600)
+    proto = AsyncProtocol(protocol)
+
+    async def main():
+        task = asyncio.ensure_future(proto.read(1, POSITION.address, POSITION.length))
+        await asyncio.sleep(0.001)
+        with pytest.raises(RuntimeError):
+            protocol.ping(2)
+        assert (await task).data == 1
+        assert protocol.ping(2).ok
+
+    asyncio.run(main())
+
+
+def test_wrappers_of_one_bus_take_turns():
+    protocol = bus(57600)
+    first = AsyncProtocol(protocol)
+    second = AsyncProtocol(protocol)
+    assert first.lock is second.lock
+
+    async def main():
+        return await asyncio.gather(
+            *(
+                proto.read(ID, POSITION.address, POSITION.length)
+                for _ in range(5)
+                for proto, ID in ((first, 1), (second, 2), (first, 2))
+            )
+        )
+
+    results = asyncio.run(main())
+    assert [res.data for res in results] == [1, 2, 2] * 5
+    assert all(res.ok for res in results)
+
+
+def test_lock_polled_by_its_owner():
+    protocol = bus()
+    assert protocol.lock.acquire(False)
+    assert not protocol.lock.acquire(False)
+    with pytest.raises(RuntimeError):
+        protocol.lock.acquire()
+    protocol.lock.release()
+    assert protocol.ping(1).ok
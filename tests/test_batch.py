@@ -0,0 +1,92 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from dynamixel.bus import Bus
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+
+def simBus():
+    sim = SimBus(2, baudRate=4000000)
+    protocol = Protocol2(transport=sim)
+    bus = Bus(protocol)
+    servos = []
+    for ID in (1, 2, 3):
+        sim.add(SimServo(XL430_W250_T, ID, {"TORQUE_ENABLE": 1}))
+        servo = XL430_W250_T(str(ID), ID, protocol=protocol)
+        bus.attach(servo)
+        servos.append(servo)
+    return sim, bus, servos
+
+
+def test_eeprom_write_waits_for_torque_off():
+    sim, bus, (s1, s2, s3) = simBus()
+    with bus.batch() as batch:
+        s3.setLed(1)
+        s1.setTorqueEnable(0)
+        s2.setTorqueEnable(0)
+        s1.setReturnDelayTime(5)
+    assert sim.servos[1].get("RETURN_DELAY_TIME") == 5
+    assert sim.servos[1].get("TORQUE_ENABLE") == 0
+    assert sim.servos[2].get("TORQUE_ENABLE") == 0
+    assert sim.servos[3].get("LED") == 1
+    # LED, the torque sync write, then the EEPROM write on its own
+    assert len(batch.results) == 3
+
+
+def test_unrelated_writes_still_share_packets():
+    sim, bus, servos = simBus()
+    with bus.batch() as batch:
+        for servo in servos:
+            servo.setLed(1)
+            servo.setGoalPosition(90)
+    assert [sim.servos[ID].get("LED") for ID in (1, 2, 3)] == [1, 1, 1]
+    assert len(batch.results) == 2
+
+
+def test_item_set_again_after_others_keeps_its_place():
+    sim, bus, (s1, _, _) = simBus()
+    with bus.batch() as batch:
+        s1.setTorqueEnable(0)
+        s1.setReturnDelayTime(7)
+        s1.setTorqueEnable(1)
+    assert [res.err for res in batch.results] == ["OK"] * 3
+    assert sim.servos[1].get("RETURN_DELAY_TIME") == 7
+    assert sim.servos[1].get("TORQUE_ENABLE") == 1
+    assert s1.protocol.timing.returnDelayNs(1) == 14000
+
+
+def test_servo_by_servo_eeprom_changes_share_packets():
+    sim, bus, servos = simBus()
+    with bus.batch() as batch:
+        for servo in servos:
+            servo.setTorqueEnable(0)
+            servo.setReturnDelayTime(7)
+            servo.setTorqueEnable(1)
+    for ID in (1, 2, 3):
+        assert sim.servos[ID].get("RETURN_DELAY_TIME") == 7
+        assert sim.servos[ID].get("TORQUE_ENABLE") == 1
+    assert len(batch.results) == 3
+
+
+def test_value_set_twice_in_a_row_is_sent_once():
+    sim, bus, (s1, _, _) = simBus()
+    with bus.batch() as batch:
+        s1.setLed(1)
+        s1.setLed(0)
+        s1.setGoalPosition(90)
+    assert sim.servos[1].get("LED") == 0
+    assert len(batch.results) == 2
+
+
+def test_eeprom_item_is_not_merged_with_torque_enable():
+    sim, bus, (s1, _, _) = simBus()
+    with bus.batch() as batch:
+        s1.setTorqueEnable(0)
+        s1.setShutdown(0x15)
+    assert [res.err for res in batch.results] == ["OK"] * 2
+    assert sim.servos[1].get("SHUTDOWN") == 0x15
+    assert sim.servos[1].get("TORQUE_ENABLE") == 0
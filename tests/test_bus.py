@@ -0,0 +1,55 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import asyncio
+
+import pytest
+
+from dynamixel.asyncprotocol import AsyncProtocol
+from dynamixel.bus import Bus
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+
+def attached(baudRate: int, fast: bool = True) -> tuple:
+    """A simulated bus, a Bus on it and its two servos"""
+    sim = SimBus(2, baudRate=baudRate)
+    protocol = Protocol2(transport=sim)
+    bus = Bus(protocol, fast=fast)
+    servos = []
+    for ID in (1, 2):
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0, "PRESENT_POSITION": 100 * ID}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+        servo = XL430_W250_T(str(ID), ID, protocol=protocol)
+        bus.attach(servo)
+        servos.append(servo)
+    return sim, bus, servos
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_poll_keeps_data_sent_with_a_hardware_alert(fast):
+    sim, bus, servos = attached(4000000, fast)
+    sim.servos[2].alert = True
+    bus.poll()
+    assert [servo.status["PRESENT_POSITION"] for servo in servos] == [100, 200]
+    assert [servo.hardwareAlert for servo in servos] == [False, True]
+    sim.servos[2].alert = False
+    sim.servos[2].set("PRESENT_POSITION", 250)
+    bus.poll()
+    assert servos[1].status["PRESENT_POSITION"] == 250
+    assert not servos[1].hardwareAlert
+
+
+def test_poll_async_next_to_another_wrapper():
+    _, bus, servos = attached(57600)
+    proto = AsyncProtocol(servos[0].protocol)
+
+    async def main():
+        return await asyncio.gather(bus.pollAsync(), proto.ping(1), bus.pollAsync())
+
+    _, ping, _ = asyncio.run(main())
+    assert ping.ok
+    assert [servo.status["PRESENT_POSITION"] for servo in servos] == [100, 200]
@@ -0,0 +1,70 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+
+def cached(maxAge: float = None) -> tuple:
+    """A simulated bus and a servo on it with its cache enabled and RETURN_DELAY_TIME in it"""
+    sim = SimBus(2)
+    protocol = Protocol2(transport=sim)
+    sim.add(SimServo(XL430_W250_T, 1, {"RETURN_DELAY_TIME": 0}))
+    servo = XL430_W250_T("1", 1, protocol=protocol)
+    servo.enableCache(maxAge)
+    assert servo.getReturnDelayTime().data == 0
+    return sim, servo
+
+
+def test_static_reads_expire():
+    sim, servo = cached(0.05)
+    sim.servos[1].set("RETURN_DELAY_TIME", 5)
+    count = sim.instructions
+    assert servo.getReturnDelayTime().data == 0
+    assert sim.instructions == count
+    time.sleep(0.06)
+    assert servo.getReturnDelayTime().data == 5
+    assert sim.instructions == count + 1
+
+
+def test_reads_can_ask_for_fresher_values():
+    sim, servo = cached()
+    sim.servos[1].set("RETURN_DELAY_TIME", 5)
+    ct = XL430_W250_T.CONTROL_TABLE.RETURN_DELAY_TIME
+    assert servo.readControlTableItem(ct.address, ct.length).data == 0
+    assert servo.readControlTableItem(ct.address, ct.length, maxAge=0).data == 5
+
+
+def test_reboot_clears():
+    sim, servo = cached()
+    sim.servos[1].set("RETURN_DELAY_TIME", 5)
+    servo.reboot()
+    assert not servo.cache.entries
+    assert servo.getReturnDelayTime().data == 5
+
+
+def test_factory_reset_clears():
+    _, servo = cached()
+    assert servo.setReturnDelayTime(9).ok
+    assert servo.factoryReset(resetAllExceptIdBaud=True).ok
+    assert not servo.cache.entries
+    # back to what the simulated servo started with
+    assert servo.getReturnDelayTime().data == 0
+
+
+def test_error_response_clears():
+    _, servo = cached()
+    assert servo.setTorqueEnable(1).ok
+    assert servo.cache.entries
+    # EEPROM is locked with torque on
+    assert not servo.setReturnDelayTime(7).ok
+    assert not servo.cache.entries
+    assert servo.getReturnDelayTime().data == 0
+    servo.getReturnDelayTime()
+    assert not servo.read(1000, 4).ok
+    assert not servo.cache.entries
@@ -0,0 +1,131 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+from dynamixel.control import ControlLoop
+from dynamixel.devices import XL430_W250_T
+from dynamixel.group import ServoGroup
+from dynamixel.protocol import Protocol2
+from dynamixel.servo import units
+from dynamixel.sim import SimBus, SimServo
+
+IDS = (1, 2)
+
+
+class Turns:
+    """Direction pin that records the instruction of every packet sent in each turn of the bus"""
+
+    def __init__(self, sim):
+        self.turns = []
+        self._value = False
+        write = sim.write
+
+        def record(data):
+            self.turns[-1].append(data[7])
+            return write(data)
+
+        sim.write = record
+
+    @property
+    def value(self) -> bool:
+        return self._value
+
+    @value.setter
+    def value(self, value: bool):
+        if value and not self._value:
+            self.turns.append([])
+        self._value = value
+
+
+def controlled(rate: float, compute, **kwargs) -> tuple:
+    """A simulated bus and a loop writing raw goals to the servos at IDS on it"""
+    sim = SimBus(2, 4000000)
+    protocol = Protocol2(transport=sim, baudRate=4000000)
+    servos = []
+    for ID in IDS:
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+        servos.append(XL430_W250_T(str(ID), ID, protocol=protocol))
+    group = ServoGroup(servos, ("PRESENT_POSITION",))
+    return sim, ControlLoop(group, rate, compute, unit=units.RAW, **kwargs)
+
+
+def goals(sim) -> list:
+    return [sim.servos[ID].get("GOAL_POSITION") for ID in IDS]
+
+
+def test_cycles_start_on_their_ticks():
+    starts = []
+
+    def compute(group):
+        starts.append(time.monotonic_ns())
+
+    _, loop = controlled(200, compute)
+    loop.run(5)
+    period = loop.periodNs
+    gaps = [b - a for a, b in zip(starts, starts[1:])]
+    assert min(gaps) > period * 0.8
+    assert starts[-1] - starts[0] < period * 6
+    assert loop.stats.cycles == 5
+    assert loop.stats.misses == 0
+
+
+def test_overruns_count_the_ticks_they_miss():
+    starts = []
+
+    def compute(group):
+        starts.append(time.monotonic_ns())
+        if len(starts) == 1:
+            time.sleep(0.025)
+
+    _, loop = controlled(100, compute)
+    loop.run(3)
+    period = loop.periodNs
+    assert loop.stats.cycles == 3
+    assert loop.stats.misses == 2
+    # the loop carries on at the next tick, it doesn't make up for the lost ones
+    assert starts[1] - starts[0] > period * 2.5
+    assert starts[2] - starts[1] > period * 0.8
+
+
+def test_pipelined_goals_go_out_with_the_next_read():
+    cycle = iter(range(1, 100))
+
+    def compute(group):
+        n = next(cycle)
+        return [n] * len(group)
+
+    sim, loop = controlled(500, compute)
+    pin = loop.group.protocol.tx_enable = Turns(sim)
+    loop.run(3)
+    read, write = 0x8A, 0x83
+    assert pin.turns == [[read], [write, read], [write, read], [write]]
+    assert goals(sim) == [3, 3]
+
+
+def test_unpipelined_goals_go_out_straight_away():
+    sim, loop = controlled(500, lambda group: [7] * len(group), pipeline=False)
+    pin = loop.group.protocol.tx_enable = Turns(sim)
+    loop.run(2)
+    read, write = 0x8A, 0x83
+    assert pin.turns == [[read], [write], [read], [write]]
+    assert goals(sim) == [7, 7]
+
+
+def test_stop_sends_the_last_goals():
+    cycle = iter(range(1, 100))
+
+    def compute(group):
+        n = next(cycle)
+        if n == 3:
+            loop.stop()
+        return [n] * len(group)
+
+    sim, loop = controlled(500, compute)
+    loop.run()
+    assert loop.stats.cycles == 3
+    assert goals(sim) == [3, 3]
+    assert not loop.group.protocol._deferred
@@ -0,0 +1,37 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from dynamixel.crc import crc16
+from dynamixel.protocol import Protocol2
+
+# Packets from the Protocol 2.0 e-Manual and the official SDK, CRC included
+PING = b"\xff\xff\xfd\x00\x01\x03\x00\x01\x19\x4e"
+READ = b"\xff\xff\xfd\x00\x01\x07\x00\x02\x84\x00\x04\x00\x1d\x15"
+
+
+def test_sdk_vectors():
+    assert crc16(PING[:-2]) == 0x4E19
+    assert crc16(READ[:-2]) == 0x151D
+
+
+def test_types_and_ranges_agree():
+    for packet in (PING, READ):
+        body = packet[:-2]
+        expected = crc16(body)
+        assert crc16(bytearray(body)) == expected
+        assert crc16(memoryview(body)) == expected
+        assert crc16(list(body)) == expected
+        assert crc16(b"\x00\x00" + body, 2) == expected
+        assert crc16(body + b"\x00", 0, len(body)) == expected
+
+
+def test_running_crc():
+    body = READ[:-2]
+    assert crc16(body, 5, crc=crc16(body, 0, 5)) == 0x151D
+
+
+def test_add_checksum():
+    assert Protocol2.addChecksum(list(PING[:-2])) == list(PING)
+    assert Protocol2.addChecksum(list(READ[:-2])) == list(READ)
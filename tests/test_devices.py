@@ -0,0 +1,48 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from dynamixel import devices
+
+
+def loaded(code: str) -> list:
+    """Device modules imported by running ``code`` in a fresh interpreter"""
+    script = "\n".join(
+        (
+            "import json, sys",
+            "from dynamixel import devices",
+            code,
+            "names = [m for m in sys.modules if m.startswith('dynamixel.devices.')]",
+            "print(json.dumps(sorted(names)))",
+        )
+    )
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True, cwd=root
+    )
+    return json.loads(out.stdout)
+
+
+def test_unknown_model_imports_nothing():
+    assert devices.forModel(9999) is None
+    assert loaded("assert devices.forModel(9999) is None") == []
+
+
+def test_model_imports_only_its_device():
+    assert devices.forModel(1060) is devices.XL430_W250_T
+    assert devices.forModel(12).MODEL == 12
+    assert loaded("devices.forModel(1060)") == ["dynamixel.devices.xl430w250t"]
+    assert loaded("devices.AX12A") == ["dynamixel.devices.ax12a"]
+
+
+def test_unknown_name():
+    with pytest.raises(AttributeError):
+        _ = devices.XL999
@@ -0,0 +1,94 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import json
+
+from dynamixel.devices import AX12A, XL430_W250_T
+from dynamixel.discovery import BusMap, Device, baudRates, warmStart
+from dynamixel.protocol import Error, Protocol1, Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+CLASSES = [XL430_W250_T, AX12A]
+
+
+def bus(*ids) -> tuple:
+    """A simulated bus with an XL430 at each of ``ids`` and a protocol on it"""
+    sim = SimBus(2)
+    for ID in ids:
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0}))
+    return sim, Protocol2(transport=sim)
+
+
+def test_baud_rates_follow_the_protocol():
+    p2 = baudRates(Protocol2(transport=SimBus(2)), CLASSES)
+    assert set(p2) == set(XL430_W250_T.bauds.values())
+    assert p2[:2] == [1000000, 57600]
+    p1 = baudRates(Protocol1(transport=SimBus(1)), CLASSES)
+    assert set(p1) == set(XL430_W250_T.bauds.values()) | set(AX12A.bauds.values())
+
+
+def test_broadcast_ping_waits_for_the_highest_id():
+    sim = SimBus(2)
+    protocol = Protocol2(transport=sim)
+    for ID in (1, 252):
+        sim.add(SimServo(XL430_W250_T, ID))
+    res = protocol.broadcastPing()
+    assert sorted(res.data) == [1, 252]
+    assert res.data[252] == (XL430_W250_T.MODEL, 0)
+    assert res.err == {1: Error.OK, 252: Error.OK}
+
+
+def test_warm_start_checks_a_saved_map_in_one_transaction(tmp_path):
+    path = str(tmp_path / "busmap.json")
+    sim, protocol = bus(1, 2)
+    first = warmStart(protocol, path)
+    assert sorted(first.devices) == [1, 2]
+    assert len(first.eeprom[1]) == XL430_W250_T.CONTROL_TABLE.TORQUE_ENABLE.address
+    with open(path) as f:
+        saved = f.read()
+    count = sim.instructions
+    warm = warmStart(Protocol2(transport=sim), path)
+    assert sim.instructions == count + 1
+    assert warm.devices == first.devices
+    assert warm.eeprom == first.eeprom
+    with open(path) as f:
+        assert f.read() == saved
+
+
+def test_warm_start_rescans_when_a_servo_is_missing(tmp_path):
+    path = str(tmp_path / "busmap.json")
+    sim, protocol = bus(1, 2)
+    warmStart(protocol, path)
+    del sim.servos[2]
+    sim.add(SimServo(XL430_W250_T, 3, {"RETURN_DELAY_TIME": 0}))
+    busMap = warmStart(protocol, path)
+    assert sorted(busMap.devices) == [1, 3]
+    assert sorted(busMap.eeprom) == [1, 3]
+    assert sorted(BusMap.load(path).devices) == [1, 3]
+
+
+def test_warm_start_snapshots_a_servo_that_changed_model(tmp_path):
+    path = str(tmp_path / "busmap.json")
+    sim, protocol = bus(1, 2)
+    saved = warmStart(protocol, path)
+    saved.devices[2] = Device(2, AX12A.MODEL, None, AX12A)
+    saved.eeprom[2] = bytes(5)
+    saved.save(path)
+    count = sim.instructions
+    busMap = warmStart(protocol, path)
+    # the model check and the snapshot, no rescan
+    assert sim.instructions == count + 2
+    assert busMap.devices[2].model == XL430_W250_T.MODEL
+    assert busMap.devices[2].cls is XL430_W250_T
+    assert busMap.eeprom[2] == sim.servos[2].read(0, len(busMap.eeprom[1]))
+    assert BusMap.load(path).devices[2].cls is XL430_W250_T
+
+
+def test_load_gives_none_for_a_bad_file(tmp_path):
+    assert BusMap.load(str(tmp_path / "missing.json")) is None
+    path = tmp_path / "busmap.json"
+    for content in ("not json", json.dumps({"baudRate": 57600}), json.dumps([1, 2])):
+        path.write_text(content)
+        assert BusMap.load(str(path)) is None
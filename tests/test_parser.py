@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from dynamixel.crc import crc16
+from dynamixel.parser import StatusParser1, StatusParser2
+
+
+def status2(ID: int, params: list, err: int = 0) -> bytes:
+    body = []
+    for byte in [0x55, err, *params]:
+        body.append(byte)
+        if body[-3:] == [0xFF, 0xFF, 0xFD]:
+            body.append(0xFD)
+    packet = [0xFF, 0xFF, 0xFD, 0x00, ID, *(len(body) + 2).to_bytes(2, "little"), *body]
+    return bytes(packet + list(crc16(packet).to_bytes(2, "little")))
+
+
+def status1(ID: int, params: list, err: int = 0) -> bytes:
+    packet = [0xFF, 0xFF, ID, len(params) + 2, err, *params]
+    return bytes([*packet, ~sum(packet[2:]) & 0xFF])
+
+
+def feed(parser, stream: bytes, chunk: int):
+    for i in range(0, len(stream), chunk):
+        parser.feed(stream[i : i + chunk])
+    return parser.packets
+
+
+def test_parser2_any_chunking():
+    bad = bytearray(status2(4, [5]))
+    bad[-1] ^= 1
+    stream = (
+        b"\x00\xff\x12\xff\xff"
+        + status2(1, [1, 2, 3, 4])
+        # an instruction packet, e.g. our own echo, is dropped
+        + b"\xff\xff\xfd\x00\x01\x07\x00\x02\x84\x00\x04\x00\x1d\x15"
+        + status2(2, [0xFF, 0xFF, 0xFD, 7])
+        + bytes(bad)
+        + status2(5, [6, 7])
+    )
+    expected = [(1, "01020304", True), (2, "fffffd07", True), (4, "05", False), (5, "0607", True)]
+    for chunk in (1, 2, 3, 7, len(stream)):
+        packets = feed(StatusParser2(), stream, chunk)
+        assert [(p[4], p[9:-2].hex(), valid) for p, valid in packets] == expected
+
+
+def test_parser2_grows_for_long_packets():
+    params = list(range(200))
+    ((packet, valid),) = feed(StatusParser2(), status2(3, params), 16)
+    assert valid
+    assert list(packet[9:-2]) == params
+
+
+def test_parser2_rejects_bad_length():
+    parser = StatusParser2(maxLength=32)
+    packets = feed(parser, status2(1, list(range(40))) + status2(2, [1]), 5)
+    assert [(p[4], valid) for p, valid in packets] == [(2, True)]
+
+
+def test_parser1():
+    stream = b"\x05\xff" + status1(1, [0x10, 0x20]) + status1(2, [], err=4)
+    packets = feed(StatusParser1(), stream, 1)
+    assert [(p.hex(" "), valid) for p, valid in packets] == [
+        ("ff ff 01 04 00 10 20 ca", True),
+        ("ff ff 02 02 04 f7", True),
+    ]
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dynamixel.devices import AX12A, XL430_W250_T
+from dynamixel.planner import ReadPlan, planSpans
+from dynamixel.protocol import Error, Protocol1, Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+STATUS = ("PRESENT_VELOCITY", "PRESENT_POSITION", "PRESENT_INPUT_VOLTAGE")
+
+
+def servos(cls=XL430_W250_T, supportsBulkRead: bool = False) -> list:
+    if cls is AX12A:
+        sim = SimBus(1)
+        protocol = Protocol1(transport=sim, supportsBulkRead=supportsBulkRead)
+        values = {"PRESENT_VOLTAGE": 120}
+    else:
+        sim = SimBus(2)
+        protocol = Protocol2(transport=sim)
+        values = {"PRESENT_VELOCITY": 7, "PRESENT_INPUT_VOLTAGE": 120}
+    out = []
+    for ID in (1, 2):
+        values.update({"RETURN_DELAY_TIME": 0, "PRESENT_POSITION": 100 * ID})
+        sim.add(SimServo(cls, ID, values))
+        protocol.timing.setReturnDelayTime(ID, 0)
+        out.append(cls(str(ID), ID, protocol=protocol))
+    return out
+
+
+def instructions(plan: ReadPlan) -> list:
+    return [method.__name__ for method, _, _ in plan.transactions]
+
+
+def test_spans_merge_within_max_gap():
+    spans = planSpans(XL430_W250_T, STATUS)
+    assert [span[:2] for span in spans] == [(128, 18)]
+    assert [name for name, _ in spans[0][2]] == list(STATUS)
+    assert [span[:2] for span in planSpans(XL430_W250_T, STATUS, maxGap=4)] == [(128, 8), (144, 2)]
+    # adjacent items merge even without a gap allowed
+    spans = planSpans(XL430_W250_T, ("PRESENT_POSITION", "PRESENT_VELOCITY"), maxGap=0)
+    assert [span[:2] for span in spans] == [(128, 8)]
+
+
+def test_one_servo_is_a_read():
+    one, _ = servos()
+    plan = ReadPlan({one: STATUS})
+    assert instructions(plan) == ["read"]
+    res = plan.execute()
+    assert res.data == {
+        1: {"PRESENT_VELOCITY": 7, "PRESENT_POSITION": 100, "PRESENT_INPUT_VOLTAGE": 120}
+    }
+    assert res.err == {1: Error.OK}
+
+
+def test_same_spans_are_a_sync_read():
+    plan = ReadPlan({servo: STATUS for servo in servos()}, maxGap=4)
+    assert instructions(plan) == ["syncRead", "syncRead"]
+    res = plan.execute()
+    assert res.data[2] == {
+        "PRESENT_VELOCITY": 7,
+        "PRESENT_POSITION": 200,
+        "PRESENT_INPUT_VOLTAGE": 120,
+    }
+    assert res.err == {1: Error.OK, 2: Error.OK}
+
+
+def test_different_spans_are_a_bulk_read():
+    one, two = servos()
+    plan = ReadPlan({one: ("PRESENT_POSITION",), two: ("PRESENT_INPUT_VOLTAGE",)})
+    assert instructions(plan) == ["bulkRead"]
+    res = plan.execute()
+    assert res.data == {1: {"PRESENT_POSITION": 100}, 2: {"PRESENT_INPUT_VOLTAGE": 120}}
+
+
+@pytest.mark.parametrize(
+    ("supportsBulkRead", "expected"), [(True, ["bulkRead"]), (False, ["read", "read"])]
+)
+def test_protocol1_without_bulk_read_reads_each_servo(supportsBulkRead, expected):
+    one, two = servos(AX12A, supportsBulkRead)
+    plan = ReadPlan({one: ("PRESENT_POSITION",), two: ("PRESENT_VOLTAGE",)})
+    assert instructions(plan) == expected
+    res = plan.execute()
+    assert res.data == {1: {"PRESENT_POSITION": 100}, 2: {"PRESENT_VOLTAGE": 120}}
+    assert res.err == {1: Error.OK, 2: Error.OK}
+
+
+def test_missing_servo_is_an_error():
+    one, _ = servos()
+    missing = XL430_W250_T("9", 9, protocol=one.protocol)
+    res = ReadPlan({one: STATUS, missing: STATUS}).execute()
+    assert res.data[9] == {}
+    assert res.err == {1: Error.OK, 9: Error.ERR_RX_NO_RESPONSE}
@@ -0,0 +1,126 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import threading
+
+import pytest
+
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Error, Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+POSITION = XL430_W250_T.CONTROL_TABLE.PRESENT_POSITION
+GOAL = XL430_W250_T.CONTROL_TABLE.GOAL_POSITION
+
+
+def bus(**faults) -> Protocol2:
+    sim = SimBus(2, **faults)
+    protocol = Protocol2(transport=sim)
+    for ID in (1, 2):
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0, "PRESENT_POSITION": ID}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+    return protocol
+
+
+def test_threads_share_a_protocol():
+    protocol = bus()
+    wrong = []
+
+    def worker(ID: int):
+        for _ in range(300):
+            res = protocol.read(ID, POSITION.address, POSITION.length)
+            if res.data != ID:
+                wrong.append((ID, res.data, res.err))
+            res = protocol.syncRead(POSITION.address, POSITION.length, [ID, 3 - ID])
+            if res.data != {ID: ID, 3 - ID: 3 - ID}:
+                wrong.append((ID, res.data, res.err))
+
+    threads = [threading.Thread(target=worker, args=(ID,)) for ID in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert wrong == []
+
+
+def test_threads_share_deferred_packets():
+    protocol = bus()
+    wrong = []
+
+    def worker(ID: int):
+        for i in range(300):
+            if i % 2:
+                protocol.defer("syncWrite", GOAL.address, GOAL.length, [(ID, 1000 + i)])
+            else:
+                packet = protocol.build("syncWrite", GOAL.address, GOAL.length, [(ID, 1000 + i)])
+                protocol.deferPacket(packet)
+            res = protocol.read(ID, POSITION.address, POSITION.length)
+            if res.data != ID:
+                wrong.append((ID, res.data, res.err))
+
+    threads = [threading.Thread(target=worker, args=(ID,)) for ID in (1, 2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert wrong == []
+    for ID in (1, 2):
+        res = protocol.read(ID, GOAL.address, GOAL.length)
+        assert res.data == 1299
+
+
+def test_add_stuffing():
+    stuffed = [0x01, 0xFF, 0xFF, 0xFD, 0xFD, 0x02, 0xFF, 0xFF, 0xFD, 0xFD]
+    assert Protocol2.addStuffing([0x01, 0xFF, 0xFF, 0xFD, 0x02, 0xFF, 0xFF, 0xFD]) == stuffed
+    # data that is already FF FF FD FD gets stuffed as well
+    assert Protocol2.addStuffing([0xFF, 0xFF, 0xFD, 0xFD]) == [0xFF, 0xFF, 0xFD, 0xFD, 0xFD]
+
+
+def test_add_stuffing_matches_the_encoder():
+    data = [0xFF, 0xFF, 0xFD, 0xFD, 0x00, 0xFF, 0xFF, 0xFD]
+    packet = bus().build("bulkWrite", [(1, 0x1234, len(data), bytes(data))])
+    # the params start after ID 01 ADDR 34 12 LEN 08 00
+    params = list(packet[13:-2])
+    assert params == Protocol2.addStuffing(list(data))
+
+
+def multiRead(protocol: Protocol2, name: str, ids: list, address: int, length: int, **kwargs):
+    """One of the multi-servo reads of the same span from every ID"""
+    if name in {"bulkRead", "fastBulkRead"}:
+        return getattr(protocol, name)([(ID, address, length) for ID in ids], **kwargs)
+    return getattr(protocol, name)(address, length, ids, **kwargs)
+
+
+MULTI = ["syncRead", "fastSyncRead", "bulkRead", "fastBulkRead"]
+
+
+@pytest.mark.parametrize("name", MULTI)
+def test_reads_are_keyed_by_id(name):
+    res = multiRead(bus(), name, [1, 2], POSITION.address, POSITION.length)
+    assert res.data == {1: 1, 2: 2}
+    assert res.err == {1: Error.OK, 2: Error.OK}
+
+
+@pytest.mark.parametrize("name", MULTI)
+def test_missing_id_has_no_response(name):
+    res = multiRead(bus(), name, [1, 2, 9], POSITION.address, POSITION.length)
+    assert res.data == {1: 1, 2: 2}
+    assert res.err == {1: Error.OK, 2: Error.OK, 9: Error.ERR_RX_NO_RESPONSE}
+
+
+@pytest.mark.parametrize("name", ["fastSyncRead", "fastBulkRead"])
+def test_fast_frame_crc_mismatch_marks_every_id(name):
+    res = multiRead(bus(crcErrors=1), name, [1, 2], POSITION.address, POSITION.length)
+    assert res.data == {}
+    assert res.err == {1: Error.ERR_RX_CRC_MISMATCH, 2: Error.ERR_RX_CRC_MISMATCH}
+
+
+@pytest.mark.parametrize("name", MULTI)
+def test_long_spans_are_bytes(name):
+    # PRESENT_VELOCITY and PRESENT_POSITION
+    res = multiRead(bus(), name, [1, 2], POSITION.address - 4, 8)
+    assert res.data == {ID: bytes(4) + ID.to_bytes(4, "little") for ID in (1, 2)}
+    res = multiRead(bus(), name, [1, 2], POSITION.address, POSITION.length, asBytes=True)
+    assert res.data == {ID: ID.to_bytes(4, "little") for ID in (1, 2)}
@@ -0,0 +1,47 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dynamixel.devices import AX12A
+from dynamixel.protocol import Error, Protocol1
+from dynamixel.sim import SimBus, SimServo
+
+POSITION = AX12A.CONTROL_TABLE.PRESENT_POSITION
+
+
+def bus(supportsBulkRead: bool) -> Protocol1:
+    sim = SimBus(1)
+    protocol = Protocol1(transport=sim, supportsBulkRead=supportsBulkRead)
+    for ID in (1, 2):
+        values = {"RETURN_DELAY_TIME": 0, "PRESENT_POSITION": 100 * ID, "PRESENT_SPEED": ID}
+        sim.add(SimServo(AX12A, ID, values))
+        protocol.timing.setReturnDelayTime(ID, 0)
+    return protocol
+
+
+@pytest.mark.parametrize("supportsBulkRead", [True, False])
+def test_sync_read(supportsBulkRead):
+    protocol = bus(supportsBulkRead)
+    res = protocol.syncRead(POSITION.address, POSITION.length, [1, 2, 9])
+    assert res.data == {1: 100, 2: 200}
+    assert res.err == {1: Error.OK, 2: Error.OK, 9: Error.ERR_RX_NO_RESPONSE}
+
+
+@pytest.mark.parametrize("supportsBulkRead", [True, False])
+def test_sync_read_long_spans_are_bytes(supportsBulkRead):
+    protocol = bus(supportsBulkRead)
+    # PRESENT_POSITION, PRESENT_SPEED and PRESENT_LOAD
+    res = protocol.syncRead(POSITION.address, 6, [1, 2])
+    assert res.data == {ID: bytes((100 * ID, 0, ID, 0, 0, 0)) for ID in (1, 2)}
+    res = protocol.syncRead(POSITION.address, POSITION.length, [1, 2], asBytes=True)
+    assert res.data == {ID: bytes((100 * ID, 0)) for ID in (1, 2)}
+
+
+def test_bulk_read():
+    protocol = bus(True)
+    res = protocol.bulkRead([(1, POSITION.address, 2), (2, POSITION.address + 2, 2), (9, 0, 1)])
+    assert res.data == {1: 100, 2: 2}
+    assert res.err == {1: Error.OK, 2: Error.OK, 9: Error.ERR_RX_NO_RESPONSE}
@@ -0,0 +1,34 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Protocol2
+from dynamixel.servo import units
+from dynamixel.sim import SimBus, SimServo
+
+GOAL = XL430_W250_T.CONTROL_TABLE.GOAL_POSITION
+
+
+def test_raw_is_not_the_default_unit():
+    codec = XL430_W250_T.CODECS[GOAL]
+    assert codec.decode(2048) == 180
+    assert codec.decode(2048, units.RAW) == 2048
+    assert codec.encode(180) == 2048
+    assert codec.encode(2048, units.RAW) == 2048
+    assert codec.decodeMany([2048, 1024], units.RAW) == [2048, 1024]
+
+
+def test_accessors_take_raw():
+    sim = SimBus(2)
+    protocol = Protocol2(transport=sim)
+    sim.add(SimServo(XL430_W250_T, 1, {"RETURN_DELAY_TIME": 0}))
+    protocol.timing.setReturnDelayTime(1, 0)
+    servo = XL430_W250_T("1", 1, protocol=protocol)
+    servo.unit = units.DEGREE
+    assert servo.setGoalPosition(1024, unit=units.RAW).ok
+    assert servo.getGoalPosition(unit=units.RAW).data == 1024
+    assert servo.getGoalPosition().data == 90
+    assert servo.decodeControlTableItem(GOAL, 1024, units.RAW) == 1024
+    assert servo.decodeControlTableItem(GOAL, 1024) == 90
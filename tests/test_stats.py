@@ -0,0 +1,53 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Error, Protocol2
+from dynamixel.sim import SimBus, SimServo
+
+POSITION = XL430_W250_T.CONTROL_TABLE.PRESENT_POSITION
+
+
+def bus() -> tuple:
+    sim = SimBus(2)
+    protocol = Protocol2(transport=sim)
+    for ID in (1, 2):
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+    return sim, protocol
+
+
+def test_errors_are_counted_per_servo():
+    sim, protocol = bus()
+    seen = []
+    stats = protocol.enableStats(seen.append)
+    assert protocol.read(1, POSITION.address, POSITION.length).ok
+    assert protocol.syncRead(POSITION.address, POSITION.length, [1, 2, 9]).err[9] == (
+        Error.ERR_RX_NO_RESPONSE
+    )
+    sim.crcErrors = 1
+    assert protocol.read(2, POSITION.address, POSITION.length).err == Error.ERR_RX_CRC_MISMATCH
+    data = stats.export()
+    servos = data["servos"]
+    assert (servos[1]["transactions"], servos[1]["timeouts"], servos[1]["crcErrors"]) == (2, 0, 0)
+    assert (servos[2]["transactions"], servos[2]["timeouts"], servos[2]["crcErrors"]) == (2, 0, 1)
+    assert (servos[9]["transactions"], servos[9]["timeouts"], servos[9]["crcErrors"]) == (1, 1, 0)
+    read = data["instructions"]["READ"]
+    assert (read["transactions"], read["crcErrors"]) == (2, 1)
+    assert data["instructions"]["SYNC_READ"]["timeouts"] == 1
+    # the sync read as a whole came back one status packet short
+    short = Error.ERR_RX_FAILED_TO_RX_ENTIRE_PACKET
+    assert [t.errors for t in seen] == [[], [short], [Error.ERR_RX_CRC_MISMATCH]]
+
+
+def test_reset_and_disable():
+    _, protocol = bus()
+    stats = protocol.enableStats()
+    protocol.ping(1)
+    stats.reset()
+    assert stats.export() == {"instructions": {}, "servos": {}}
+    protocol.disableStats()
+    protocol.ping(1)
+    assert stats.export() == {"instructions": {}, "servos": {}}
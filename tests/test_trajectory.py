@@ -0,0 +1,157 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import time
+
+import pytest
+
+from dynamixel.devices import XL430_W250_T
+from dynamixel.protocol import Protocol2
+from dynamixel.servo import units
+from dynamixel.sim import SimBus, SimServo
+from dynamixel.trajectory import Trajectory, TrajectoryPlayer
+
+
+class Sampled:
+    """A trajectory without waypoint times"""
+
+    duration = 1
+
+    @staticmethod
+    def sample(t: float) -> list:
+        return [90 * t, 90 - 90 * t]
+
+
+class Slow:
+    """A ramp whose fifth sample takes 33 ms to compute"""
+
+    duration = 0.2
+
+    def __init__(self):
+        self.calls = 0
+
+    def sample(self, t: float) -> list:
+        self.calls += 1
+        if self.calls == 5:
+            time.sleep(0.033)
+        return [1000 * t, 0]
+
+
+def servos(sim: SimBus = None, **values) -> list:
+    sim = sim or SimBus(2)
+    protocol = Protocol2(transport=sim)
+    out = []
+    for ID in (1, 2):
+        sim.add(SimServo(XL430_W250_T, ID, {"RETURN_DELAY_TIME": 0, **values}))
+        protocol.timing.setReturnDelayTime(ID, 0)
+        out.append(XL430_W250_T(str(ID), ID, protocol=protocol))
+    return out
+
+
+def goals(sim: SimBus) -> list:
+    return [sim.servos[ID].get("GOAL_POSITION") for ID in (1, 2)]
+
+
+def test_trajectory_interpolates_between_waypoints():
+    trajectory = Trajectory([[(0, 0), (1, 100)], [(0.5, 10), (1, 20), (2, 40)]])
+    assert trajectory.duration == 2
+    assert trajectory.times() == [0, 0.5, 1, 2]
+    assert trajectory.sample(0) == [0, 10]
+    assert trajectory.sample(0.75) == [75, 15]
+    assert trajectory.sample(1.5) == [100, 30]
+    # back in time
+    assert trajectory.sample(0.25) == [25, 10]
+
+
+def test_options_after_rate_are_keywords():
+    assert TrajectoryPlayer(servos(), Sampled(), 50, unit=units.DEGREE).count == 51
+    with pytest.raises(TypeError):
+        TrajectoryPlayer(servos(), Sampled(), 50, units.DEGREE)
+
+
+def test_profile_needs_times():
+    with pytest.raises(ValueError, match="times"):
+        TrajectoryPlayer(servos(), Sampled(), unit=units.DEGREE, profile=True)
+
+
+def test_profile_segments_fit_the_registers():
+    trajectory = Trajectory.fromWaypoints([(0, [0, 90]), (1, [90, 0]), (40, [0, 90])])
+    with pytest.raises(ValueError, match="PROFILE_VELOCITY 39000"):
+        TrajectoryPlayer(servos(), trajectory, unit=units.DEGREE, profile=True)
+    trajectory = Trajectory.fromWaypoints([(0, [0, 90]), (30, [90, 0])])
+    with pytest.raises(ValueError, match="PROFILE_ACCELERATION 45000"):
+        TrajectoryPlayer(servos(), trajectory, unit=units.DEGREE, profile=True, accel=1.5)
+    player = TrajectoryPlayer(servos(), trajectory, unit=units.DEGREE, profile=True)
+    assert player.count == 2
+
+
+def test_play_sends_every_sample_with_a_read():
+    sim = SimBus(2)
+    trajectory = Trajectory([[(0, 0), (0.1, 100)], [(0, 50)]])
+    player = TrajectoryPlayer(servos(sim, TORQUE_ENABLE=1), trajectory, 100, unit=units.RAW)
+    count = sim.instructions
+    player.play()
+    assert player.count == 11
+    assert player.stats.cycles == 11
+    assert player.stats.misses == 0
+    # a sync write and a sync read per sample
+    assert sim.instructions == count + 22
+    assert goals(sim) == [100, 50]
+    # each goal goes out ahead of the read in the same turn, the servos are already there
+    assert player.maxErrors == [0, 0]
+
+
+def test_steps_send_the_prebuilt_packets():
+    sim = SimBus(2)
+    trajectory = Trajectory([[(0, 0), (0.03, 30)], [(0, 5)]])
+    player = TrajectoryPlayer(servos(sim), trajectory, 100, unit=units.RAW, readEvery=0)
+    player.buildAhead(0)
+    packets = list(player._packets)
+    ct = XL430_W250_T.CONTROL_TABLE.GOAL_POSITION
+    expected = player.protocol.build("syncWrite", ct.address, ct.length, [20, 5], player.group.ids)
+    assert packets[2] == expected
+
+    def encode(*args):
+        raise AssertionError("step shouldn't encode")
+
+    player.group.encode = encode
+    sent = []
+    write = sim.write
+
+    def record(data):
+        sent.append(bytes(data))
+        return write(data)
+
+    sim.write = record
+    for k in range(player.count):
+        player.step(k)
+        assert goals(sim) == [10 * k, 5]
+    assert sent == packets
+
+
+def test_overruns_skip_samples():
+    sim = SimBus(2)
+    player = TrajectoryPlayer(servos(sim), Slow(), 100, unit=units.RAW)
+    player.play()
+    assert player.stats.misses == 2
+    assert player.stats.cycles == player.count - 2
+    # the last sample is always sent
+    assert goals(sim) == [200, 0]
+
+
+def test_tracking_errors():
+    # torque is off so the servos stay at 0 and 10
+    sim = SimBus(2)
+    trajectory = Trajectory([[(0, 0), (0.03, 30)], [(0, 0)]])
+    player = TrajectoryPlayer(servos(sim), trajectory, 100, unit=units.RAW)
+    sim.servos[2].set("PRESENT_POSITION", 10)
+    for k in range(player.count):
+        player.buildAhead(k)
+        player.step(k)
+    assert player.errors == [30, -10]
+    assert player.maxErrors == [30, 10]
+    assert player.rmsErrors() == pytest.approx([350**0.5, 10])
+    player.resetErrors()
+    assert player.rmsErrors() == [0, 0]
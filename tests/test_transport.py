@@ -0,0 +1,43 @@
+# SPDX-FileCopyrightText: 2017 Scott Shawcroft, written for Adafruit Industries
+# SPDX-FileCopyrightText: Copyright (c) 2025 Derek Daniels
+#
+# SPDX-License-Identifier: MIT
+
+import pytest
+
+from dynamixel import transport
+from dynamixel.protocol import Protocol2
+from dynamixel.transport import LoopbackTransport, SerialTransport
+
+# The ping of ID 1 and its status packet from the Protocol 2.0 e-Manual, an
+# XL430 (1060) with firmware 38
+PING = b"\xff\xff\xfd\x00\x01\x03\x00\x01\x19\x4e"
+STATUS = b"\xff\xff\xfd\x00\x01\x07\x00\x55\x00\x06\x04\x26\x65\x5d"
+
+
+def test_loopback_answers_through_the_protocol():
+    loopback = LoopbackTransport(lambda packet: STATUS if packet == PING else b"")
+    protocol = Protocol2(transport=loopback)
+    res = protocol.ping(1)
+    assert res.ok
+    assert bytes(loopback.tx) == PING
+    assert not loopback.direction.value
+    # nothing answers an unknown packet
+    assert not protocol.ping(2).ok
+    assert loopback.in_waiting == 0
+
+
+def test_loopback_reads_in_pieces():
+    loopback = LoopbackTransport(lambda packet: STATUS)
+    loopback.write(PING)
+    buf = bytearray(4)
+    assert loopback.readinto(buf) == 4
+    assert buf == STATUS[:4]
+    loopback.reset_input_buffer()
+    assert loopback.readinto(buf) is None
+
+
+def test_serial_needs_pyserial(monkeypatch):
+    monkeypatch.setattr(transport, "serial", None)
+    with pytest.raises(RuntimeError):
+        SerialTransport("/dev/ttyUSB0")